@@ -38,7 +38,9 @@ setup(
     install_requires=[
         'pyfrc',
         'robotpy-commands-v1',
-        'robotpy-rev-color'
+        'robotpy-rev-color',
+        'robotpy-cscore',
+        'numpy'
     ],  # Optional
     extras_require={  # Optional
         'test': ['black', 'pipenv', 'tox', 'tox-pipenv', 'coverage'],
@@ -0,0 +1,129 @@
+"""Camera streaming process, launched by the Camera subsystem with CameraServer.launch.
+
+Runs apart from the robot code so image capture and JPEG compression never
+hold up the robot loop. The robot sets "Camera Enabled" and "Camera FPS
+Limit" on the SmartDashboard table, and this process streams at the lower of
+that limit and what its own CPU budget allows. Without a USB camera, or with
+CAMERA_SIM set, it streams simulated frames instead.
+
+When vision is enabled, every frame is also captured into the shared frame
+buffer the vision process reads from.
+
+"""
+import os
+import time
+
+from cscore import CameraServer, UsbCamera, VideoSource
+from networktables import NetworkTables
+
+from util.camera_throttle import CpuBudget
+from util.config import CameraConfig, read_config
+
+# Set to stream simulated frames even if a camera is plugged in
+SIM_ENV = "CAMERA_SIM"
+# Seconds between checks of the dashboard values and the CPU budget
+CONTROL_PERIOD = 1.0
+ENABLED_KEY = "Camera Enabled"
+FPS_LIMIT_KEY = "Camera FPS Limit"
+
+
+def main():
+    config_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs")
+    robot_config = read_config(config_dir)
+    config = robot_config.camera
+    server = CameraServer.getInstance()
+    server.enableLogging()
+    dashboard = NetworkTables.getTable("SmartDashboard")
+    budget = CpuBudget(config.cpu_budget, config.fps, config.min_fps)
+    feed = _FrameFeed(robot_config.vision.enabled)
+    if os.environ.get(SIM_ENV) or not UsbCamera.enumerateUsbCameras():
+        _stream_simulated(server, dashboard, budget, config, feed)
+    else:
+        _stream_camera(server, dashboard, budget, config, feed)
+
+
+class _FrameFeed(object):
+    """The shared frame buffer of the vision process, attached to once the robot has created it."""
+    _enabled: bool = False
+    _frames = None
+
+    def __init__(self, enabled: bool):
+        self._enabled = enabled
+        self._frames = None
+
+    def get_frames(self):
+        """Return the frame buffer, or None if vision is disabled or the buffer does not exist yet."""
+        if self._enabled and self._frames is None:
+            # Imported here so streaming without vision never loads the buffer code
+            from util.frame_buffer import SharedFrameBuffer
+            try:
+                self._frames = SharedFrameBuffer.attach()
+            except FileNotFoundError:
+                pass
+        return self._frames
+
+
+def _target_fps(dashboard, budget: CpuBudget, config: CameraConfig) -> int:
+    return max(config.min_fps, min(int(dashboard.getNumber(FPS_LIMIT_KEY, config.fps)), budget.update()))
+
+
+def _stream_camera(server, dashboard, budget: CpuBudget, config: CameraConfig, feed: _FrameFeed):
+    camera = server.startAutomaticCapture()
+    camera.setResolution(config.width, config.height)
+    camera.setFPS(config.fps)
+    server.getServer().setCompression(config.compression)
+    sink = None
+    frames = None
+    fps = config.fps
+    enabled = True
+    next_control = 0.0
+    while True:
+        now = time.monotonic()
+        if now >= next_control:
+            next_control = now + CONTROL_PERIOD
+            if dashboard.getBoolean(ENABLED_KEY, False) != enabled:
+                enabled = not enabled
+                # A closed camera stops capturing, so it costs no CPU or bandwidth
+                camera.setConnectionStrategy(VideoSource.ConnectionStrategy.kAutoManage if enabled
+                                             else VideoSource.ConnectionStrategy.kForceClose)
+            target = _target_fps(dashboard, budget, config)
+            if target != fps:
+                fps = target
+                camera.setFPS(fps)
+            if frames is None:
+                frames = feed.get_frames()
+                if frames is not None:
+                    sink = server.getVideo()
+        if enabled and frames is not None:
+            # Blocks until the camera delivers the next frame, straight into the shared slot
+            if sink.grabFrame(frames.begin_write())[0]:
+                frames.commit(time.monotonic())
+        else:
+            time.sleep(CONTROL_PERIOD)
+
+
+def _stream_simulated(server, dashboard, budget: CpuBudget, config: CameraConfig, feed: _FrameFeed):
+    # Imported here so the real camera path never loads numpy for the frames
+    from util.simulated_frames import SimulatedFrameSource
+
+    source = server.putVideo("Simulated Camera", config.width, config.height)
+    server.getServer().setCompression(config.compression)
+    frames = SimulatedFrameSource(config.width, config.height)
+    shared = None
+    fps = config.fps
+    enabled = False
+    next_control = 0.0
+    while True:
+        now = time.monotonic()
+        if now >= next_control:
+            next_control = now + CONTROL_PERIOD
+            enabled = dashboard.getBoolean(ENABLED_KEY, False)
+            fps = _target_fps(dashboard, budget, config)
+            shared = feed.get_frames()
+        if enabled:
+            frame = frames.next_frame()
+            source.putFrame(frame)
+            if shared is not None:
+                shared.begin_write()[:] = frame
+                shared.commit(now)
+        time.sleep(1.0 / fps)
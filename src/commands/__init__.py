@@ -0,0 +1,17 @@
+from util.command_registry import command_registry
+
+# Commands that are not needed at startup, imported the first time one is built
+command_registry.register("DeadReckoningScore", "commands.autonomous:DeadReckoningScore")
+command_registry.register("MoveFromLine", "commands.autonomous:MoveFromLine")
+command_registry.register("DriveToWall", "commands.autonomous:DriveToWall")
+command_registry.register("TurnDegrees", "commands.turn_degrees:TurnDegrees")
+command_registry.register("TurnDegreesAbsolute", "commands.turn_degrees_absolute:TurnDegreesAbsolute")
+command_registry.register("TurnTime", "commands.turn_time:TurnTime")
+command_registry.register("FullWinchRetraction", "commands.full_winch_retraction:FullWinchRetraction")
+
+# Commands the [ButtonCommands] of joysticks.ini can bind to buttons
+command_registry.register("Vacuum", "commands.vacuum:Vacuum")
+command_registry.register("RaiseShooter", "commands.raise_shooter:RaiseShooter")
+command_registry.register("LowerShooter", "commands.lower_shooter:LowerShooter")
+command_registry.register("RotateControlPanel", "commands.rotate_control_panel:RotateControlPanel")
+command_registry.register("StopOnColor", "commands.stop_on_color:StopOnColor")
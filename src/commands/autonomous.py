@@ -1,102 +1,159 @@
-from configparser import ConfigParser
-
 from wpilib.command import CommandGroup
 from wpilib.command import WaitCommand
 
 from commands.drive_time import DriveTime
+from commands.profiled_drive import ProfiledDrive
 from commands.raise_shooter import RaiseShooter
+from util.config import AutonomousProgramConfig, config_service
+from util.motion_profile import profile_cache
 
 
 def use_drive_gyro(robot) -> bool:
     return robot.drivetrain.is_gyro_enabled()
 
 
-class MoveFromLine(CommandGroup):
-    _SECTION = "MoveFromLine"
-    _DRIVE_SPEED = "DRIVE_SPEED"
-    _DRIVE_TIME = "DRIVE_TIME"
+def build_drive(robot, config: AutonomousProgramConfig):
+    """Return a drive along the motion profile over DRIVE_DISTANCE, or a timed drive without one.
+
+    The profile is generated here, while the routine is built, and shared with every routine driving the same
+    distance within the same limits.
+    """
+    if config.drive_distance != 0.0:
+        return ProfiledDrive(robot, profile_cache.get(config.drive_distance, robot.drivetrain.get_profile_config()))
+    return DriveTime(robot, config.drive_time, config.drive_speed)
+
+
+def apply_drive(robot, command, config: AutonomousProgramConfig):
+    """Update a drive from build_drive() with a reloaded config.
+
+    A drive keeps its kind, switching between a profiled and a timed drive takes a restart.
+    """
+    if isinstance(command, ProfiledDrive):
+        if config.drive_distance != 0.0:
+            command.set_profile(profile_cache.get(config.drive_distance, robot.drivetrain.get_profile_config()))
+    else:
+        command.set_drive(config.drive_time, config.drive_speed)
+
 
+def check_drive(robot, command) -> str:
+    """Return why a drive from build_drive() would not move the robot, or an empty string when it is ready."""
+    if robot.drivetrain is None:
+        return "No drivetrain"
+    if isinstance(command, ProfiledDrive):
+        if command.get_profile().get_duration() <= 0.0:
+            return "Empty drive profile"
+    elif command.get_duration() <= 0.0 or command.get_speed() == 0.0:
+        return "Zero DRIVE_TIME or DRIVE_SPEED"
+    return ""
+
+
+class MoveFromLine(CommandGroup):
     _robot = None
 
     _drive_speed: float = None
     _drive_time: float = None
+    _config: AutonomousProgramConfig = None
+    _drive_command = None
 
-    def __init__(self, robot, config_path: str = "/home/lvuser/py/configs/autonomous.ini"):
+    def __init__(self, robot, config: AutonomousProgramConfig = None):
         """Constructor"""
         super().__init__()
         self._robot = robot
-        config = ConfigParser()
-        config.read(config_path)
-        self._load_config(config)
+        self._load_config(config if config is not None else config_service.get().autonomous.move_from_line)
         self._initialize_commands()
 
-    def _load_config(self, parser: ConfigParser):
-        self._drive_speed = parser.getfloat(self._SECTION, self._DRIVE_SPEED)
-        self._drive_time = parser.getfloat(self._SECTION, self._DRIVE_TIME)
+    def _load_config(self, config: AutonomousProgramConfig):
+        self._config = config
+        self._drive_speed = config.drive_speed
+        self._drive_time = config.drive_time
+
+    def apply_config(self, config: AutonomousProgramConfig):
+        """Take the values of a reloaded config, for the next time the program runs."""
+        self._load_config(config)
+        apply_drive(self._robot, self._drive_command, self._config)
+
+    def check(self) -> str:
+        """Return why the program is not ready to run, or an empty string when it is."""
+        return check_drive(self._robot, self._drive_command)
 
     def _initialize_commands(self):
-        command = DriveTime(self._robot, self._drive_time, self._drive_speed)
-        self.addSequential(command)
+        self._drive_command = build_drive(self._robot, self._config)
+        self.addSequential(self._drive_command)
 
 
 class DriveToWall(CommandGroup):
-    _SECTION = "DriveToWall"
-    _DRIVE_SPEED = "DRIVE_SPEED"
-    _DRIVE_TIME = "DRIVE_TIME"
-
     _robot = None
 
     _drive_speed: float = None
     _drive_time: float = None
+    _config: AutonomousProgramConfig = None
+    _drive_command = None
 
-    def __init__(self, robot, config_path: str = "/home/lvuser/py/configs/autonomous.ini"):
+    def __init__(self, robot, config: AutonomousProgramConfig = None):
         """Constructor"""
         super().__init__()
         self._robot = robot
-        config = ConfigParser()
-        config.read(config_path)
-        self._load_config(config)
+        self._load_config(config if config is not None else config_service.get().autonomous.drive_to_wall)
         self._initialize_commands()
 
-    def _load_config(self, parser: ConfigParser):
-        self._drive_speed = parser.getfloat(self._SECTION, self._DRIVE_SPEED)
-        self._drive_time = parser.getfloat(self._SECTION, self._DRIVE_TIME)
+    def _load_config(self, config: AutonomousProgramConfig):
+        self._config = config
+        self._drive_speed = config.drive_speed
+        self._drive_time = config.drive_time
+
+    def apply_config(self, config: AutonomousProgramConfig):
+        """Take the values of a reloaded config, for the next time the program runs."""
+        self._load_config(config)
+        apply_drive(self._robot, self._drive_command, self._config)
+
+    def check(self) -> str:
+        """Return why the program is not ready to run, or an empty string when it is."""
+        return check_drive(self._robot, self._drive_command)
 
     def _initialize_commands(self):
-        command = DriveTime(self._robot, self._drive_time, self._drive_speed)
-        self.addSequential(command)
+        self._drive_command = build_drive(self._robot, self._config)
+        self.addSequential(self._drive_command)
 
 
 class DeadReckoningScore(CommandGroup):
-    _SECTION = "DeadReckoningScore"
-    _DRIVE_SPEED = "DRIVE_SPEED"
-    _DRIVE_TIME = "DRIVE_TIME"
-    _WAIT_TIME = "WAIT_TIME"
-
     _robot = None
 
     _drive_speed: float = None
     _drive_time: float = None
     _wait_time: float = None
+    _config: AutonomousProgramConfig = None
+    _drive_command = None
+    _wait_command: WaitCommand = None
 
-    def __init__(self, robot, config_path: str = "/home/lvuser/py/configs/autonomous.ini"):
+    def __init__(self, robot, config: AutonomousProgramConfig = None):
         """Constructor"""
         super().__init__()
         self._robot = robot
-        config = ConfigParser()
-        config.read(config_path)
-        self._load_config(config)
+        self._load_config(config if config is not None else config_service.get().autonomous.dead_reckoning_score)
         self._initialize_commands()
 
-    def _load_config(self, parser: ConfigParser):
-        self._drive_speed = parser.getfloat(self._SECTION, self._DRIVE_SPEED)
-        self._drive_time = parser.getfloat(self._SECTION, self._DRIVE_TIME)
-        self._wait_time = parser.getfloat(self._SECTION, self._WAIT_TIME)
+    def _load_config(self, config: AutonomousProgramConfig):
+        self._config = config
+        self._drive_speed = config.drive_speed
+        self._drive_time = config.drive_time
+        self._wait_time = config.wait_time
+
+    def apply_config(self, config: AutonomousProgramConfig):
+        """Take the values of a reloaded config, for the next time the program runs."""
+        self._load_config(config)
+        apply_drive(self._robot, self._drive_command, self._config)
+        self._wait_command.setTimeout(self._wait_time)
+
+    def check(self) -> str:
+        """Return why the program is not ready to run, or an empty string when it is."""
+        if self._robot.shooter is None:
+            return "No shooter"
+        return check_drive(self._robot, self._drive_command)
 
     def _initialize_commands(self):
-        command = DriveTime(self._robot, self._drive_time, self._drive_speed)
-        self.addSequential(command)
-        command = WaitCommand(self._wait_time)
-        self.addSequential(command)
+        self._drive_command = build_drive(self._robot, self._config)
+        self.addSequential(self._drive_command)
+        self._wait_command = WaitCommand(self._wait_time)
+        self.addSequential(self._wait_command)
         command = RaiseShooter(self._robot)
         self.addSequential(command)
@@ -1,7 +1,8 @@
 from wpilib.command import Command
+from util.command_profiler import InstrumentedCommand
 
 
-class DoNothing(Command):
+class DoNothing(InstrumentedCommand, Command):
 
     def __init__(self, robot, name: str = 'DoNothing', timeout: float = 15.0):
         """Constructor"""
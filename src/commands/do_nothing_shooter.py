@@ -1,7 +1,8 @@
 from wpilib.command import Command
+from util.command_profiler import InstrumentedCommand
 
 
-class DoNothingShooter(Command):
+class DoNothingShooter(InstrumentedCommand, Command):
 
     def __init__(self, robot, name='DoNothingShooter', timeout=15):
         super().__init__(name, timeout)
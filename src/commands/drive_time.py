@@ -1,8 +1,9 @@
 from wpilib.command import Command
 from util.stopwatch import Stopwatch
+from util.command_profiler import InstrumentedCommand
 
 
-class DriveTime(Command):
+class DriveTime(InstrumentedCommand, Command):
     _stopwatch: Stopwatch = None
     _duration: float = None
     _speed: float = None
@@ -16,6 +17,17 @@ class DriveTime(Command):
         self._duration = duration
         self._speed = speed
 
+    def set_drive(self, duration: float, speed: float):
+        """Change how long and how fast to drive, taking effect the next time the command starts."""
+        self._duration = duration
+        self._speed = speed
+
+    def get_duration(self) -> float:
+        return self._duration
+
+    def get_speed(self) -> float:
+        return self._speed
+
     def initialize(self):
         """Called before the Command is run for the first time."""
         self._stopwatch.start()
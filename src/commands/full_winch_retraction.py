@@ -1,7 +1,8 @@
 from wpilib.command import Command
+from util.command_profiler import InstrumentedCommand
 
 
-class FullWinchRetraction(Command):
+class FullWinchRetraction(InstrumentedCommand, Command):
     def __init__(self, robot, name=None, speed: float = 0.0, timeout=15):
         """Constructor"""
         super().__init__(name, timeout)
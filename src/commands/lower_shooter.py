@@ -1,7 +1,8 @@
 from wpilib.command import Command
+from util.command_profiler import InstrumentedCommand
 
 
-class LowerShooter(Command):
+class LowerShooter(InstrumentedCommand, Command):
 
     def __init__(self, robot, name='LowerShooter', timeout=15):
         super().__init__(name, timeout)
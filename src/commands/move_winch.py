@@ -1,8 +1,9 @@
 from wpilib.command import Command
 from oi import UserController, JoystickAxis
+from util.command_profiler import InstrumentedCommand
 
 
-class MoveWinch(Command):
+class MoveWinch(InstrumentedCommand, Command):
     def __init__(self, robot, name=None, timeout=15):
         """Constructor"""
         super().__init__(name, timeout)
@@ -0,0 +1,54 @@
+from wpilib.command import Command
+from util.stopwatch import Stopwatch
+from util.command_profiler import InstrumentedCommand
+from util.motion_profile import MotionProfile, feedforward
+
+
+class ProfiledDrive(InstrumentedCommand, Command):
+    _stopwatch: Stopwatch = None
+    _profile: MotionProfile = None
+
+    def __init__(self, robot, profile: MotionProfile, name='ProfiledDrive', timeout=15):
+        """Constructor
+
+        Args:
+            profile: Precomputed profile to follow, e.g. from profile_cache.
+        """
+        super().__init__(name, timeout)
+        self.robot = robot
+        self.requires(robot.drivetrain)
+        self._stopwatch = Stopwatch()
+        self._profile = profile
+
+    def set_profile(self, profile: MotionProfile):
+        """Change the profile, taking effect the next time the command starts."""
+        self._profile = profile
+
+    def get_profile(self) -> MotionProfile:
+        return self._profile
+
+    def initialize(self):
+        """Called before the Command is run for the first time."""
+        self._stopwatch.start()
+        return Command.initialize(self)
+
+    def execute(self):
+        """Called repeatedly when this Command is scheduled to run"""
+        # One lookup of the precomputed sample for this time, the drive is open loop through the feedforward
+        _, velocity, acceleration = self._profile.sample(self._stopwatch.elapsed_time_in_secs())
+        output = feedforward(self.robot.drivetrain.get_profile_config(), velocity, acceleration)
+        self.robot.drivetrain.arcade_drive(output, 0.0, False)
+        return Command.execute(self)
+
+    def isFinished(self):
+        """Returns true when the Command no longer needs to be run"""
+        return self._stopwatch.elapsed_time_in_secs() >= self._profile.get_duration()
+
+    def end(self):
+        """Called once after isFinished returns true"""
+        self._stopwatch.stop()
+        self.robot.drivetrain.arcade_drive(0.0, 0.0)
+
+    def interrupted(self):
+        """Called when another command which requires one or more of the same subsystems is scheduled to run"""
+        self.end()
@@ -0,0 +1,54 @@
+from wpilib.command import Command
+
+from util.color_lut import PanelColor, WEDGES_PER_REVOLUTION
+from util.command_profiler import InstrumentedCommand
+
+
+class RotateControlPanel(InstrumentedCommand, Command):
+    """Spins the control panel a number of revolutions, counting the wedges passing the color sensor."""
+    _speed: float = None
+    _target_wedges: int = 0
+    _wedges: int = 0
+    _last_color: PanelColor = PanelColor.UNKNOWN
+
+    def __init__(self, robot, revolutions: float, speed: float = 1.0, name=None, timeout=15):
+        """Constructor"""
+        super().__init__(name, timeout)
+        self.robot = robot
+        self.requires(robot.control_panel)
+        self._speed = speed
+        self._target_wedges = round(revolutions * WEDGES_PER_REVOLUTION)
+
+    def initialize(self):
+        """Called before the Command is run for the first time."""
+        self._wedges = 0
+        self._last_color = PanelColor.UNKNOWN
+        return Command.initialize(self)
+
+    def execute(self):
+        """Called repeatedly when this Command is scheduled to run"""
+        color = self.robot.control_panel.read_color()
+        # Readings between two wedges are UNKNOWN, only a different known color is a new wedge
+        if color is not PanelColor.UNKNOWN and color is not self._last_color:
+            if self._last_color is not PanelColor.UNKNOWN:
+                self._wedges += 1
+            self._last_color = color
+        if self._wedges >= self._target_wedges:
+            # Stop on the reading that finished the count, not a scheduler pass later
+            self.robot.control_panel.stop()
+        else:
+            self.robot.control_panel.spin(self._speed)
+        return Command.execute(self)
+
+    def isFinished(self):
+        """Returns true when the Command no longer needs to be run"""
+        return self._wedges >= self._target_wedges or not self.robot.control_panel.has_color_sensor() or \
+            self.isTimedOut()
+
+    def end(self):
+        """Called once after isFinished returns true"""
+        self.robot.control_panel.stop()
+
+    def interrupted(self):
+        """Called when another command which requires one or more of the same subsystems is scheduled to run"""
+        self.end()
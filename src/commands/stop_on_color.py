@@ -0,0 +1,73 @@
+from wpilib.command import Command
+
+from util.color_lut import PanelColor, next_color, sensor_color
+from util.command_profiler import InstrumentedCommand
+
+
+class StopOnColor(InstrumentedCommand, Command):
+    """Spins the control panel until the field sensor sees the target color.
+
+    The target is the game specific message unless a color is given. The
+    panel slows down once the wedge before the target is under the sensor,
+    and the motor is stopped on the same reading that finds the target.
+
+    """
+    _speed: float = None
+    _color: PanelColor = None
+    _target: PanelColor = PanelColor.UNKNOWN
+    _last_color: PanelColor = PanelColor.UNKNOWN
+    _direction: int = 0
+    _done: bool = False
+
+    def __init__(self, robot, speed: float = 1.0, color: PanelColor = None, name=None, timeout=15):
+        """Constructor"""
+        super().__init__(name, timeout)
+        self.robot = robot
+        self.requires(robot.control_panel)
+        self._speed = speed
+        self._color = color
+
+    def initialize(self):
+        """Called before the Command is run for the first time."""
+        field_color = self._color
+        if field_color is None:
+            field_color = PanelColor.from_game_message(self.robot.oi.get_game_message())
+        self._target = sensor_color(field_color)
+        self._last_color = PanelColor.UNKNOWN
+        self._direction = 0
+        # Nothing to do without a target color or a sensor to find it with
+        self._done = self._target is PanelColor.UNKNOWN or not self.robot.control_panel.has_color_sensor()
+        return Command.initialize(self)
+
+    def execute(self):
+        """Called repeatedly when this Command is scheduled to run"""
+        if self._done:
+            return Command.execute(self)
+        color = self.robot.control_panel.read_color()
+        if color is self._target:
+            self.robot.control_panel.stop()
+            self._done = True
+            return Command.execute(self)
+        if color is not PanelColor.UNKNOWN and color is not self._last_color:
+            # The order the wedges pass in tells which way the panel turns
+            if self._last_color is not PanelColor.UNKNOWN:
+                self._direction = 1 if next_color(self._last_color, 1) is color else -1
+            self._last_color = color
+        # Also between two wedges, the last known one tells what comes next
+        if self._direction and next_color(self._last_color, self._direction) is self._target:
+            self.robot.control_panel.approach(1.0 if self._speed >= 0 else -1.0)
+        else:
+            self.robot.control_panel.spin(self._speed)
+        return Command.execute(self)
+
+    def isFinished(self):
+        """Returns true when the Command no longer needs to be run"""
+        return self._done or self.isTimedOut()
+
+    def end(self):
+        """Called once after isFinished returns true"""
+        self.robot.control_panel.stop()
+
+    def interrupted(self):
+        """Called when another command which requires one or more of the same subsystems is scheduled to run"""
+        self.end()
@@ -1,18 +1,21 @@
 from wpilib.command import Command
 from oi import JoystickAxis, UserController, JoystickButtons
+from util.command_profiler import InstrumentedCommand
+from util.response_curve import CurveSet
 
 
-class TankDrive(Command):
+class TankDrive(InstrumentedCommand, Command):
     _dpad_scaling: float
-    _stick_scaling: float
 
-    def __init__(self, robot, name=None, modifier_scaling: float = 0.5, dpad_scaling: float = 0.4, timeout=15):
+    def __init__(self, robot, name=None, dpad_scaling: float = 0.4, timeout=15):
         """Constructor"""
         super().__init__(name, timeout)
         self.robot = robot
         self.requires(robot.drivetrain)
         self._dpad_scaling = dpad_scaling
-        self._stick_scaling = modifier_scaling
+
+    def set_scaling(self, dpad_scaling: float):
+        self._dpad_scaling = dpad_scaling
 
     def initialize(self):
         """Called before the Command is run for the first time."""
@@ -25,12 +28,11 @@ class TankDrive(Command):
         if dpad_y != 0.0:
             self.robot.drivetrain.arcade_drive(self._dpad_scaling * dpad_y, 0.0)
         else:
-            left_track: float = self.robot.oi.get_axis(UserController.DRIVER, JoystickAxis.LEFTY)
-            right_track: float = self.robot.oi.get_axis(UserController.DRIVER, JoystickAxis.RIGHTY)
-            if modifier:
-                self.robot.drivetrain.tank_drive(self._stick_scaling * left_track, self._stick_scaling * right_track)
-            else:
-                self.robot.drivetrain.tank_drive(left_track, right_track)
+            # Holding the modifier switches the sticks to their precision response curves
+            curve_set = CurveSet.MODIFIER if modifier else CurveSet.NORMAL
+            left_track: float = self.robot.oi.get_axis(UserController.DRIVER, JoystickAxis.LEFTY, curve_set)
+            right_track: float = self.robot.oi.get_axis(UserController.DRIVER, JoystickAxis.RIGHTY, curve_set)
+            self.robot.drivetrain.tank_drive(left_track, right_track)
         return Command.execute(self)
 
     def isFinished(self):
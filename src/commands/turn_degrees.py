@@ -1,15 +1,20 @@
 from wpilib.command import Command
-import math
+from util.command_profiler import InstrumentedCommand
 
 
-class TurnDegrees(Command):
+class TurnDegrees(InstrumentedCommand, Command):
     _speed: float = None
     _degree_threshold: float = None
     _degrees_change: float = None
     _target_degrees: float = None
 
     def __init__(self, robot, degrees_change: float, speed: float, threshold: float, name=None, timeout=15):
-        """Constructor"""
+        """Constructor
+
+        Args:
+            speed: Largest turn output.
+            threshold: Degrees from the target the turn may settle at.
+        """
         super().__init__(name, timeout)
         self.robot = robot
         self.requires(robot.drivetrain)
@@ -20,31 +25,25 @@ class TurnDegrees(Command):
     def initialize(self):
         """Called before the Command is run for the first time."""
         self._target_degrees = self.robot.drivetrain.get_gyro_angle() + self._degrees_change
+        self.robot.drivetrain.start_heading_hold(self._target_degrees, self._speed, self._degree_threshold)
         return Command.initialize(self)
 
     def execute(self):
         """Called repeatedly when this Command is scheduled to run"""
-        degrees_left = self._target_degrees - self.robot.drivetrain.get_gyro_angle()
-        turn_speed = self._speed * TurnDegrees._determine_direction(degrees_left)
-        self.robot.drivetrain.arcade_drive(0.0, turn_speed, False)
+        # The control loop steps the turn at its own rate when it runs, this only steps it otherwise
+        self.robot.drivetrain.update_heading_hold()
         return Command.execute(self)
 
     def isFinished(self):
         """Returns true when the Command no longer needs to be run"""
-        current = self.robot.drivetrain.get_gyro_angle()
-        # If abs(target - current) < threshold then return true
-        return math.fabs(self._target_degrees - current) <= self._degree_threshold or self.isTimedOut()
+        # Done once the heading settled within the threshold
+        return self.robot.drivetrain.is_heading_settled() or self.isTimedOut()
 
     def end(self):
         """Called once after isFinished returns true"""
+        self.robot.drivetrain.stop_heading_hold()
         self.robot.drivetrain.arcade_drive(0.0, 0.0)
 
     def interrupted(self):
         """Called when another command which requires one or more of the same subsystems is scheduled to run"""
         self.end()
-
-    @staticmethod
-    def _determine_direction(degrees_left: float) -> float:
-        """Based on the degrees left, determines the direction of the degrees to turn
-        """
-        return 1.0 if degrees_left >= 0 else -1.0
@@ -1,8 +1,9 @@
 from wpilib.command import Command
 from util.stopwatch import Stopwatch
+from util.command_profiler import InstrumentedCommand
 
 
-class TurnTime(Command):
+class TurnTime(InstrumentedCommand, Command):
     _stopwatch: Stopwatch = None
     _duration: float = None
     _speed: float = None
@@ -1,7 +1,8 @@
 from wpilib.command import Command
+from util.command_profiler import InstrumentedCommand
 
 
-class Vacuum(Command):
+class Vacuum(InstrumentedCommand, Command):
     _speed: float = None
 
     def __init__(self, robot, speed: float, name='Vacuum', timeout=15):
@@ -1,21 +1,27 @@
-import configparser
 from enum import Enum
-from typing import List
+from typing import Dict, Tuple
 
 from wpilib import DriverStation
 from wpilib import Joystick
 from wpilib import SendableChooser
 from wpilib import SmartDashboard
 from wpilib.command import CommandGroup
-from wpilib.command import JoystickButton
 
-from commands.autonomous import DeadReckoningScore, MoveFromLine
-from commands.raise_shooter import RaiseShooter
-from commands.vacuum import Vacuum
+from util.button_manager import ButtonManager
+from util.command_registry import command_registry
+from util import input_snapshot
+from util.config import AutonomousConfig, ControllerConfig, JoysticksConfig, config_service
+from util.input_snapshot import InputSnapshot
+from util.match_logger import match_log
+from util.response_curve import CurveSet, ResponseCurve
 
 
 class JoystickAxis:
-    """Enumerates joystick axis."""
+    """Enumerates joystick axis.
+
+    These name the axes; the joystick axis each one reads is bound per OI
+    instance from joysticks.ini.
+    """
     LEFTX = 0
     LEFTY = 1
     RIGHTX = 4
@@ -25,7 +31,11 @@ class JoystickAxis:
 
 
 class JoystickButtons:
-    """Enumerates joystick buttons."""
+    """Enumerates joystick buttons.
+
+    These name the buttons; the joystick button each one reads is bound per
+    OI instance from joysticks.ini.
+    """
     X = 1
     A = 2
     B = 3
@@ -44,16 +54,17 @@ class UserController(Enum):
     SCORING = 1
 
 
+# Snapshot slot of every JoystickAxis
+_AXIS_SLOTS = {JoystickAxis.LEFTX: input_snapshot.LEFT_X, JoystickAxis.LEFTY: input_snapshot.LEFT_Y,
+               JoystickAxis.RIGHTX: input_snapshot.RIGHT_X, JoystickAxis.RIGHTY: input_snapshot.RIGHT_Y,
+               JoystickAxis.DPADX: input_snapshot.DPAD_X, JoystickAxis.DPADY: input_snapshot.DPAD_Y}
+
+
 class OI:
     """
     This class is the glue that binds the controls on the physical operator
     interface to the commands and command groups that allow control of the robot.
     """
-    AXIS_BINDING_SECTION = "AxisBindings"
-    BUTTON_BINDING_SECTION = "ButtonBindings"
-    JOY_CONFIG_SECTION = "JoyConfig"
-    DEAD_ZONE_KEY = "DEAD_ZONE"
-    PORT_KEY = "PORT"
     LEFT_X_KEY = "LEFTX"
     LEFT_Y_KEY = "LEFTY"
     RIGHT_X_KEY = "RIGHTX"
@@ -70,69 +81,98 @@ class OI:
     RIGHT_TRIGGER_KEY = "RIGHTTRIGGER"
     BACK_KEY = "BACK"
     START_KEY = "START"
-
-    _config: configparser.ConfigParser = None
-    _controllers: List[UserController] = []
-    _dead_zones: List[float] = []
+    # (chooser name, registered command name, AutonomousConfig field) of every autonomous routine, default first
+    AUTONOMOUS_PROGRAMS = [("Score Low", "DeadReckoningScore", "dead_reckoning_score"),
+                           ("Move From Line", "MoveFromLine", "move_from_line"),
+                           ("Drive To Wall", "DriveToWall", "drive_to_wall")]
+    _config: JoysticksConfig = None
+    # Everything below is owned by one instance and sized once, so any number of OIs can live in one process
+    _controllers: Tuple[Joystick, ...] = ()
+    # Response curves of every controller, curve set and stick axis, e.g. _curves[0][CurveSet.NORMAL.value][1]
+    _curves: Tuple[Tuple[Tuple[ResponseCurve, ...], ...], ...] = ()
+    _snapshot: InputSnapshot = None
+    # Joystick axis of every stick slot, and joystick button of every JoystickButtons value, e.g. _buttons[A]
+    _axis_channels: Tuple[int, ...] = ()
+    _button_channels: Tuple[int, ...] = ()
+    _button_manager: ButtonManager = None
     _auto_program_chooser = None
+    _auto_programs: Dict[str, CommandGroup] = None
     _starting_chooser = None
 
-    def __init__(self, robot, configfile='/home/lvuser/py/configs/joysticks.ini'):
+    def __init__(self, robot, config: JoysticksConfig = None):
         self.robot = robot
-        self._config = configparser.ConfigParser()
-        self._config.read(configfile)
+        self._config = config if config is not None else config_service.get().joysticks
         self._init_joystick_binding()
-
-        for i in range(2):
-            self._controllers.append(self._init_joystick(i))
-            self._dead_zones.append(self._init_dead_zone(i))
+        self._snapshot = InputSnapshot(len(UserController))
+        self._button_manager = ButtonManager(len(UserController))
+        self._controllers = tuple(self._init_joystick(user.value) for user in UserController)
+        self._curves = tuple(OI._init_curves(self._config.controllers[user.value]) for user in UserController)
 
         self._create_smartdashboard_buttons()
 
     def _init_joystick(self, driver: int) -> Joystick:
-        config_section = OI.JOY_CONFIG_SECTION + str(driver)
-        return Joystick(self._config.getint(config_section, OI.PORT_KEY))
+        return Joystick(self._config.controllers[driver].port)
 
-    def _init_dead_zone(self, driver: int) -> float:
-        config_section = OI.JOY_CONFIG_SECTION + str(driver)
-        return self._config.getfloat(config_section, OI.DEAD_ZONE_KEY)
+    @staticmethod
+    def _init_curves(controller: ControllerConfig) -> Tuple[Tuple[ResponseCurve, ...], ...]:
+        """Compile the response curves of a controller into lookup tables, indexed by curve set and axis slot."""
+        return (tuple(ResponseCurve(curve) for curve in controller.curves),
+                tuple(ResponseCurve(curve) for curve in controller.modifier_curves))
 
     def _init_joystick_binding(self):
-        JoystickAxis.LEFTX = self._config.getint(OI.AXIS_BINDING_SECTION, OI.LEFT_X_KEY)
-        JoystickAxis.LEFTY = self._config.getint(OI.AXIS_BINDING_SECTION, OI.LEFT_Y_KEY)
-        JoystickAxis.RIGHTX = self._config.getint(OI.AXIS_BINDING_SECTION, OI.RIGHT_X_KEY)
-        JoystickAxis.RIGHTY = self._config.getint(OI.AXIS_BINDING_SECTION, OI.RIGHT_Y_KEY)
-        JoystickAxis.DPADX = self._config.getint(OI.AXIS_BINDING_SECTION, OI.DPAD_X_KEY)
-        JoystickAxis.DPADY = self._config.getint(OI.AXIS_BINDING_SECTION, OI.DPAD_Y_KEY)
-        JoystickButtons.X = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.X_KEY)
-        JoystickButtons.A = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.A_KEY)
-        JoystickButtons.B = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.B_KEY)
-        JoystickButtons.Y = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.Y_KEY)
-        JoystickButtons.LEFTBUMPER = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.LEFT_BUMPER_KEY)
-        JoystickButtons.RIGHTBUMPER = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.RIGHT_BUMPER_KEY)
-        JoystickButtons.LEFTTRIGGER = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.LEFT_TRIGGER_KEY)
-        JoystickButtons.RIGHTTRIGGER = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.RIGHT_TRIGGER_KEY)
-        JoystickButtons.BACK = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.BACK_KEY)
-        JoystickButtons.START = self._config.getint(OI.BUTTON_BINDING_SECTION, OI.START_KEY)
+        # The D-pad axes come from the POV hat, so only the sticks read a joystick axis
+        axes = self._config.axes
+        self._axis_channels = (axes[OI.LEFT_X_KEY], axes[OI.LEFT_Y_KEY], axes[OI.RIGHT_X_KEY], axes[OI.RIGHT_Y_KEY])
+        buttons = self._config.buttons
+        self._button_channels = (0, buttons[OI.X_KEY], buttons[OI.A_KEY], buttons[OI.B_KEY], buttons[OI.Y_KEY],
+                                 buttons[OI.LEFT_BUMPER_KEY], buttons[OI.RIGHT_BUMPER_KEY],
+                                 buttons[OI.LEFT_TRIGGER_KEY], buttons[OI.RIGHT_TRIGGER_KEY], buttons[OI.BACK_KEY],
+                                 buttons[OI.START_KEY])
 
     def _create_smartdashboard_buttons(self):
+        # The chooser only holds registered command names, a routine is imported and built when first selected
+        self._auto_programs = {}
         self._auto_program_chooser = SendableChooser()
-        self._auto_program_chooser.setDefaultOption("Score Low", DeadReckoningScore(self.robot))
-        self._auto_program_chooser.addOption("Move From Line", MoveFromLine(self.robot))
+        for i, (name, program, _) in enumerate(OI.AUTONOMOUS_PROGRAMS):
+            if i == 0:
+                self._auto_program_chooser.setDefaultOption(name, program)
+            else:
+                self._auto_program_chooser.addOption(name, program)
         SmartDashboard.putData("Autonomous", self._auto_program_chooser)
 
+    def apply_config(self, config: JoysticksConfig, autonomous: AutonomousConfig):
+        """Take the response curves and autonomous values of a reloaded config.
+
+        Ports, bindings and button commands keep their values until the robot code restarts.
+        """
+        self._config = config
+        self._curves = tuple(OI._init_curves(controller) for controller in config.controllers)
+        for _, program, field in OI.AUTONOMOUS_PROGRAMS:
+            if program in self._auto_programs:
+                self._auto_programs[program].apply_config(getattr(autonomous, field))
+
     def setup_button_bindings(self):
-        # Spaceballs!
-        suck_button = JoystickButton(self._controllers[UserController.SCORING.value], JoystickButtons.RIGHTBUMPER)
-        suck_button.whileHeld(Vacuum(self.robot, 1.0))
-        blow_button = JoystickButton(self._controllers[UserController.SCORING.value], JoystickButtons.LEFTBUMPER)
-        blow_button.whileHeld(Vacuum(self.robot, -1.0))
-        # Shooting
-        shoot_button = JoystickButton(self._controllers[UserController.SCORING.value], JoystickButtons.A)
-        shoot_button.whileHeld(RaiseShooter(self.robot))
+        """Build the commands of the [ButtonCommands] in joysticks.ini and bind them to their button edges.
+
+        Raises:
+            KeyError: A binding names a command that was never registered.
+        """
+        for binding in self._config.button_commands:
+            command = command_registry.create(binding.command, self.robot, *binding.args)
+            self._button_manager.bind(binding.controller, self._config.buttons[binding.button], binding.event,
+                                      command)
 
     def get_auto_choice(self) -> CommandGroup:
-        return self._auto_program_chooser.getSelected()
+        """Return the selected autonomous routine, building it if it was never selected before."""
+        program = self._auto_program_chooser.getSelected()
+        if program is None:
+            # Nothing selected yet, e.g. before the dashboard connected
+            program = OI.AUTONOMOUS_PROGRAMS[0][1]
+        command = self._auto_programs.get(program)
+        if command is None:
+            command = command_registry.create(program, self.robot)
+            self._auto_programs[program] = command
+        return command
 
     def get_position(self) -> int:
         return self._starting_chooser.getSelected()
@@ -141,39 +181,55 @@ class OI:
     def get_game_message() -> str:
         return DriverStation.getInstance().getGameSpecificMessage()
 
-    def get_axis(self, user: UserController, axis: JoystickAxis) -> float:
-        """Read axis value for specified controller/axis.
+    def update(self):
+        """Sample every axis, POV and button of both controllers, once at the top of each robot loop."""
+        driver_station = DriverStation.getInstance()
+        leftx, lefty, rightx, righty = self._axis_channels
+        for user in UserController:
+            controller = self._controllers[user.value]
+            self._snapshot.set_controller(user.value,
+                                          controller.getRawAxis(leftx),
+                                          controller.getRawAxis(lefty),
+                                          controller.getRawAxis(rightx),
+                                          controller.getRawAxis(righty),
+                                          controller.getPOV(),
+                                          driver_station.getStickButtons(controller.getPort()))
+        self._snapshot.next_loop()
+        self._button_manager.update(self._snapshot)
+
+    def get_snapshot(self) -> InputSnapshot:
+        return self._snapshot
+
+    def get_axis(self, user: UserController, axis: JoystickAxis, curve_set: CurveSet = CurveSet.NORMAL) -> float:
+        """Read axis value for specified controller/axis, as sampled by the last update().
 
         Args:
             user: Controller ID to read from
             axis: Axis ID to read from.
+            curve_set: Response curves the stick axes are shaped with.
 
         Return:
             Current position for the specified axis. (Range [-1.0, 1.0])
         """
-        controller = self._controllers[user.value]
-        value: float
-        if axis == JoystickAxis.DPADX:
-            value = controller.getPOV()
-            if value == 90:
-                value = 1.0
-            elif value == 270:
-                value = -1.0
-            else:
-                value = 0.0
-        elif axis == JoystickAxis.DPADY:
-            value = controller.getPOV()
-            if value == 0:
-                value = -1.0
-            elif value == 180:
-                value = 1.0
-            else:
-                value = 0.0
-        else:
-            value = controller.getRawAxis(axis)
-            if abs(value) < self._dead_zones[user.value]:
-                value = 0.0
+        slot = _AXIS_SLOTS[axis]
+        value = self._snapshot.get_axis(user.value, slot)
+        if slot < input_snapshot.DPAD_X:
+            value = self._curves[user.value][curve_set.value][slot].apply(value)
         return value
 
     def get_button_state(self, user: UserController, button: JoystickButtons) -> bool:
-        return self._controllers[user.value].getRawButton(button)
+        return self._snapshot.is_pressed(user.value, self._button_channels[button])
+
+    def log_inputs(self):
+        """Record every axis, before its response curve, and the button bitmask of both controllers in the match log."""
+        snapshot = self._snapshot
+        for user in UserController:
+            controller = user.value
+            match_log.set_axes(controller,
+                               snapshot.get_axis(controller, input_snapshot.LEFT_X),
+                               snapshot.get_axis(controller, input_snapshot.LEFT_Y),
+                               snapshot.get_axis(controller, input_snapshot.RIGHT_X),
+                               snapshot.get_axis(controller, input_snapshot.RIGHT_Y),
+                               snapshot.get_axis(controller, input_snapshot.DPAD_X),
+                               snapshot.get_axis(controller, input_snapshot.DPAD_Y))
+            match_log.set_buttons(controller, snapshot.get_buttons(controller))
@@ -1,7 +1,23 @@
+import os
+
 from pyfrc.physics import drivetrains
 
+from subsystems.drivetrain import Drivetrain
+from util.config import DrivetrainConfig, JoysticksConfig, read_ini
+from util.input_replay import InputReplay
+
 
 class PhysicsEngine(object):
+    # Set to the path of a match log to replay its teleop driver inputs
+    INPUT_REPLAY_ENV = "INPUT_REPLAY"
+    JOYSTICK_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs", "joysticks.ini")
+    SUBSYSTEMS_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs", "subsystems.ini")
+
+    input_replay = None
+    _replay_start = None
+    # PWM channels of the drivetrain motors
+    _left_channel: int = 0
+    _right_channel: int = 1
 
     def __init__(self, physics_controller):
         """
@@ -11,7 +27,32 @@ class PhysicsEngine(object):
         
         self.physics_controller = physics_controller
         
-        self.physics_controller.add_analog_gyro_channel(1)
+        # Turned by the simulated drivetrain, and sampled by Drivetrain in place of the ADXRS450
+        self.physics_controller.add_analog_gyro_channel(Drivetrain.SIM_GYRO_CHANNEL)
+        drivetrain = DrivetrainConfig.from_parser(read_ini(PhysicsEngine.SUBSYSTEMS_CONFIG))
+        self._left_channel = drivetrain.left_motor.channel
+        self._right_channel = drivetrain.right_motor.channel
+
+        replay_path = os.environ.get(PhysicsEngine.INPUT_REPLAY_ENV)
+        if replay_path:
+            self.input_replay = PhysicsEngine._load_input_replay(replay_path)
+
+    @staticmethod
+    def _load_input_replay(path: str) -> InputReplay:
+        config = JoysticksConfig.from_parser(read_ini(PhysicsEngine.JOYSTICK_CONFIG))
+        ports = [controller.port for controller in config.controllers]
+        axis_bindings = [config.axes[key] for key in ["LEFTX", "LEFTY", "RIGHTX", "RIGHTY"]]
+        return InputReplay(path, ports, axis_bindings)
+
+    def _update_input_replay(self, hal_data, now):
+        """Replay the recorded inputs from the moment teleop is enabled."""
+        control = hal_data['control']
+        teleop = control['enabled'] and not control['autonomous'] and not control['test']
+        if self._replay_start is None:
+            if not teleop:
+                return
+            self._replay_start = now
+        self.input_replay.apply(hal_data, now - self._replay_start)
             
     def update_sim(self, hal_data, now, tm_diff):
         """
@@ -42,9 +83,12 @@ class PhysicsEngine(object):
         },...]
         """
 
+        if self.input_replay:
+            self._update_input_replay(hal_data, now)
+
         # Simulate the drivetrain
-        l_motor = hal_data['pwm'][5]['value']
-        r_motor = hal_data['pwm'][4]['value']
+        l_motor = hal_data['pwm'][self._left_channel]['value']
+        r_motor = hal_data['pwm'][self._right_channel]['value']
         
         speed, rotation = drivetrains.two_motor_drivetrain(l_motor, r_motor)
         self.physics_controller.drive(speed, rotation, tm_diff)
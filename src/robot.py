@@ -1,63 +1,273 @@
-import wpilib
-from wpilib import SmartDashboard
-from wpilib import command
+from util.startup_profiler import startup_profiler
 
-from oi import OI
-from subsystems.climbing import Climbing
-from subsystems.drivetrain import Drivetrain
-from subsystems.shooter import Shooter
-from subsystems.vacuum import Vacuum
+# Imports are timed in groups, each group only pays for the modules the previous ones did not load
+with startup_profiler.section("import wpilib"):
+    import wpilib
+    from wpilib import SmartDashboard
+    from wpilib import command
+
+with startup_profiler.section("import oi and commands"):
+    from oi import OI
+
+with startup_profiler.section("import subsystems"):
+    from subsystems.camera import Camera
+    from subsystems.climbing import Climbing
+    from subsystems.control_panel import ControlPanel
+    from subsystems.drivetrain import Drivetrain
+    from subsystems.shooter import Shooter
+    from subsystems.vacuum import Vacuum
+    from subsystems.vision import Vision
+
+with startup_profiler.section("import util"):
+    from util.command_profiler import profiler
+    from util.config import CACHE_FILE, CONFIG_DIR, config_service
+    from util.config_watcher import config_watcher
+    from util.loop_timer import LoopPhase, LoopTimer
+    from util.match_logger import match_log
+    from util.output_latency import auto_start_latency
+    from util.rate_executor import CONTROL_GROUP, MAIN_GROUP, control_executor
+    from util.telemetry import telemetry
 
 
 class MyRobot(wpilib.IterativeRobot):
+    LOOP_TIMING_FILE = "/home/lvuser/loop_timing.txt"
+    COMMAND_PROFILE_FILE = "/home/lvuser/command_profile.txt"
+    MATCH_LOG_FILE = "/home/lvuser/match.log"
+    STARTUP_PROFILE_FILE = "/home/lvuser/startup_profile.txt"
+    RATE_JITTER_FILE = "/home/lvuser/rate_jitter.txt"
+    # Update loop timing every 25 loops (twice a second at 50 Hz)
+    LOOP_TIMING_PUBLISH_INTERVAL = 25
+    LOOP_TIMING_PUBLISH_RATE = 2.0
+    LOOP_PHASE_KEYS = {phase: "Loop Time p95 " + phase.name.title().replace("_", " ") for phase in LoopPhase}
+    JITTER_KEYS = {name: "Jitter p95 " + name.title() for name in (CONTROL_GROUP, MAIN_GROUP)}
+    GAME_MESSAGE_PUBLISH_RATE = 5.0
+    CONFIG_ERROR_PUBLISH_RATE = 1.0
+    AUTO_ARMED_PUBLISH_RATE = 1.0
+    AUTO_START_LATENCY_PUBLISH_RATE = 1.0
+    STARTUP_TIME_PUBLISH_RATE = 1.0
+
     oi = None
     drivetrain = None
     climbing = None
     shooter = None
+    control_panel = None
     vacuum = None
+    camera = None
+    vision = None
     autonomous_command = None
+    _armed_command = None
+    loop_timer: LoopTimer = None
+    _loops_since_publish: int = 0
 
     def autonomousInit(self):
-        # Schedule the autonomous command
+        auto_start_latency.start()
+        self._start_command_profiling("autonomous")
+        match_log.set_mode("autonomous")
+        self.camera.set_mode("autonomous")
+        # Schedule the autonomous command armed while disabled
+        if self._armed_command is None:
+            self._arm_autonomous()
+        # Heading zero is wherever the robot sits when autonomous starts, teleop keeps that frame
         self.drivetrain.reset_gyro_angle()
-        self.autonomous_command = self.oi.get_auto_choice()
+        self.autonomous_command = self._armed_command
         self.autonomous_command.start()
 
     def testInit(self):
-        pass
+        self._start_command_profiling("test")
+        match_log.set_mode("test")
+        self.camera.set_mode("test")
 
     def teleopInit(self):
+        auto_start_latency.cancel()
+        self._start_command_profiling("teleop")
+        match_log.set_mode("teleop")
+        self.camera.set_mode("teleop")
         if self.autonomous_command:
             self.autonomous_command.cancel()
 
     def disabledInit(self):
-        pass
+        # An autonomous that never drove must not leave the first teleop output to be measured
+        auto_start_latency.cancel()
+        self.loop_timer.dump(MyRobot.LOOP_TIMING_FILE)
+        self.loop_timer.reset()
+        control_executor.dump(MyRobot.RATE_JITTER_FILE)
+        control_executor.reset()
+        profiler.dump(MyRobot.COMMAND_PROFILE_FILE)
+        profiler.set_mode("disabled")
+        match_log.set_mode("disabled")
+        self.camera.set_mode("disabled")
 
     def robotInit(self):
         """
         This function is called upon program startup and
         should be used for any initialization code.
         """
-        self.oi = OI(self)
-        self.drivetrain = Drivetrain(self)
-        self.climbing = Climbing(self)
-        self.vacuum = Vacuum(self)
-        self.shooter = Shooter(self)
-        self.oi.setup_button_bindings()
-        wpilib.CameraServer.launch()
+        self.loop_timer = LoopTimer()
+        SmartDashboard.putBoolean("Profile Commands", profiler.enabled)
+        self._init_smartdashboard()
+        with startup_profiler.section("open match log"):
+            match_log.open(MyRobot.MATCH_LOG_FILE)
+        # Read every config file once, before anything needs a value from them
+        with startup_profiler.section("load config"):
+            config_service.load(cache_path=CACHE_FILE)
+        with startup_profiler.section("OI"):
+            self.oi = OI(self)
+        with startup_profiler.section("Drivetrain"):
+            self.drivetrain = Drivetrain(self)
+        with startup_profiler.section("Climbing"):
+            self.climbing = Climbing(self)
+        with startup_profiler.section("Vacuum"):
+            self.vacuum = Vacuum(self)
+        with startup_profiler.section("Shooter"):
+            self.shooter = Shooter(self)
+        with startup_profiler.section("ControlPanel"):
+            self.control_panel = ControlPanel(self)
+        with startup_profiler.section("button bindings"):
+            self.oi.setup_button_bindings()
+        with startup_profiler.section("control loop"):
+            self._start_control_loop()
+        config_watcher.start(CONFIG_DIR, CACHE_FILE)
+        # Vision first, the camera process feeds it frames through the shared memory it creates
+        with startup_profiler.section("Vision"):
+            self.vision = Vision(self)
+        with startup_profiler.section("Camera"):
+            self.camera = Camera(self)
+        telemetry.set("Startup Time", startup_profiler.get_total_ms())
+        startup_profiler.dump(MyRobot.STARTUP_PROFILE_FILE)
 
     def autonomousPeriodic(self):
         """This function is called periodically during autonomous."""
+        self.loop_timer.start()
+        control_executor.tick(MAIN_GROUP)
+        self.oi.update()
+        self.loop_timer.mark(LoopPhase.INPUTS)
         command.Scheduler.getInstance().run()
+        self.loop_timer.mark(LoopPhase.SCHEDULER)
+        telemetry.set("Auto Start Latency", auto_start_latency.get_latency_ms())
+        self.camera.update(self.loop_timer.overruns())
+        self.vision.update()
+        self._update_smartdashboard()
+        self._log_loop()
 
     def teleopPeriodic(self):
         """This function is called periodically during operator control."""
-        SmartDashboard.putString("Color Target", str(self.oi.get_game_message()))
+        self.loop_timer.start()
+        control_executor.tick(MAIN_GROUP)
+        self.oi.update()
+        self.loop_timer.mark(LoopPhase.INPUTS)
+        telemetry.set("Color Target", str(self.oi.get_game_message()))
+        self.loop_timer.mark(LoopPhase.GAME_MESSAGE)
         command.Scheduler.getInstance().run()
+        self.loop_timer.mark(LoopPhase.SCHEDULER)
+        self.camera.update(self.loop_timer.overruns())
+        self.vision.update()
+        self._update_smartdashboard()
+        self._log_loop()
 
     def testPeriodic(self):
         """This function is called periodically during test mode."""
-        pass
+        self.oi.update()
+        telemetry.flush()
+
+    def disabledPeriodic(self):
+        """This function is called periodically while disabled."""
+        self._apply_reloaded_config()
+        self._arm_autonomous()
+        self.vision.update()
+        telemetry.set("Config Error", config_watcher.get_error() or "")
+        telemetry.flush()
+
+    def _arm_autonomous(self):
+        """Prepare everything autonomousInit needs, so it only has to start the command.
+
+        The selected routine is built the first time it is selected, then
+        checked every loop: whether it is ready, or why not, is shown as
+        Auto Armed and Auto Error while there is still time to fix it.
+        """
+        self._armed_command = self.oi.get_auto_choice()
+        error = self._armed_command.check()
+        telemetry.set("Auto Armed", not error)
+        telemetry.set("Auto Error", error)
+
+    def _start_control_loop(self):
+        """Run the latency-sensitive loops on their own notifier, at CONTROL_RATE instead of the 50 Hz robot loop.
+
+        Only heading hold and the winch limit stop run there: they read and
+        write devices directly and hand their results to the robot loop
+        through values swapped whole, never through the scheduler.
+        """
+        control_executor.clear()
+        control_executor.add_task(CONTROL_GROUP, self.drivetrain.step_heading_hold)
+        control_executor.add_task(CONTROL_GROUP, self.climbing.stop_at_limit)
+        control_executor.start(wpilib.Notifier)
+
+    def _apply_reloaded_config(self):
+        """Swap in the config the watcher parsed since the last loop, if any.
+
+        Only done while disabled, so nothing changes under a running command.
+        """
+        config = config_watcher.take()
+        if config is None:
+            return
+        config_service.set(config)
+        self.drivetrain.apply_config(config.drivetrain)
+        self.climbing.apply_config(config.climbing)
+        self.vacuum.apply_config(config.vacuum)
+        self.control_panel.apply_config(config.control_panel)
+        self.oi.apply_config(config.joysticks, config.autonomous)
+
+    def _log_loop(self):
+        """Stop the loop timer and record this loop in the match log."""
+        if not match_log.is_open():
+            self.loop_timer.stop()
+            return
+        self.oi.log_inputs()
+        self.loop_timer.mark(LoopPhase.LOGGING)
+        self.loop_timer.stop()
+        match_log.commit(wpilib.Timer.getFPGATimestamp(), self.loop_timer.last_ms())
+
+    @staticmethod
+    def _start_command_profiling(mode: str):
+        profiler.enabled = SmartDashboard.getBoolean("Profile Commands", False)
+        profiler.set_mode(mode)
+
+    @staticmethod
+    def _init_smartdashboard():
+        telemetry.register("Color Target", MyRobot.GAME_MESSAGE_PUBLISH_RATE, "")
+        telemetry.register("Config Error", MyRobot.CONFIG_ERROR_PUBLISH_RATE, "")
+        telemetry.register("Auto Armed", MyRobot.AUTO_ARMED_PUBLISH_RATE, False)
+        telemetry.register("Auto Error", MyRobot.AUTO_ARMED_PUBLISH_RATE, "")
+        telemetry.register("Auto Start Latency", MyRobot.AUTO_START_LATENCY_PUBLISH_RATE, 0.0)
+        telemetry.register("Startup Time", MyRobot.STARTUP_TIME_PUBLISH_RATE, 0.0)
+        for key in ["Loop Time p50", "Loop Time p95", "Loop Time p99", "Loop Time Max", "Loop Overruns"]:
+            telemetry.register(key, MyRobot.LOOP_TIMING_PUBLISH_RATE, 0.0)
+        for key in MyRobot.LOOP_PHASE_KEYS.values():
+            telemetry.register(key, MyRobot.LOOP_TIMING_PUBLISH_RATE, 0.0)
+        for key in MyRobot.JITTER_KEYS.values():
+            telemetry.register(key, MyRobot.LOOP_TIMING_PUBLISH_RATE, 0.0)
+
+    def _update_smartdashboard(self):
+        """Publish all dashboard values set during this loop in one batch."""
+        self._update_smartdashboard_loop_timing()
+        telemetry.flush()
+        self.loop_timer.mark(LoopPhase.DASHBOARD)
+
+    def _update_smartdashboard_loop_timing(self):
+        self._loops_since_publish += 1
+        if self._loops_since_publish < MyRobot.LOOP_TIMING_PUBLISH_INTERVAL:
+            return
+        self._loops_since_publish = 0
+        # The last completed window, the totals since disabled only go to LOOP_TIMING_FILE
+        loop = self.loop_timer.window()
+        telemetry.set("Loop Time p50", loop.percentile(0.50))
+        telemetry.set("Loop Time p95", loop.percentile(0.95))
+        telemetry.set("Loop Time p99", loop.percentile(0.99))
+        telemetry.set("Loop Time Max", loop.max())
+        telemetry.set("Loop Overruns", self.loop_timer.overruns())
+        for phase, key in MyRobot.LOOP_PHASE_KEYS.items():
+            telemetry.set(key, self.loop_timer.window_phase(phase).percentile(0.95))
+        for name, key in MyRobot.JITTER_KEYS.items():
+            telemetry.set(key, control_executor.get_group(name).get_jitter().percentile(0.95))
 
 
 if __name__ == "__main__":
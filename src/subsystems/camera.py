@@ -0,0 +1,41 @@
+import wpilib
+from wpilib.command import Subsystem
+
+from util.camera_throttle import FpsThrottle
+from util.config import CameraConfig, config_service
+from util.telemetry import telemetry
+
+
+class Camera(Subsystem):
+    # Streaming runs in its own process, see camera_server.py
+    SERVER_ENTRY = "camera_server.py:main"
+    # Dashboard keys the camera process reads its settings from
+    ENABLED_KEY = "Camera Enabled"
+    FPS_LIMIT_KEY = "Camera FPS Limit"
+    PUBLISH_RATE = 2.0
+
+    _robot = None
+    _config: CameraConfig = None
+    _throttle: FpsThrottle = None
+
+    def __init__(self, robot, name: str = 'Camera', config: CameraConfig = None):
+        self._robot = robot
+        self._config = config if config is not None else config_service.get().camera
+        self._throttle = FpsThrottle(self._config.fps, self._config.min_fps)
+        telemetry.register(Camera.ENABLED_KEY, Camera.PUBLISH_RATE, False)
+        telemetry.register(Camera.FPS_LIMIT_KEY, Camera.PUBLISH_RATE, float(self._config.fps))
+        if self._config.enabled:
+            wpilib.CameraServer.launch(Camera.SERVER_ENTRY)
+        super().__init__(name)
+
+    def set_mode(self, mode: str):
+        """Stream only in the match modes listed in the config."""
+        telemetry.set(Camera.ENABLED_KEY, self._config.enabled and mode in self._config.modes)
+
+    def update(self, overruns: int):
+        """Lower the frame rate while the robot loop overruns, raise it again once it keeps up.
+
+        Args:
+            overruns: Overruns counted by the loop timer so far.
+        """
+        telemetry.set(Camera.FPS_LIMIT_KEY, float(self._throttle.update(overruns)))
@@ -1,47 +1,48 @@
-import configparser
-
 from wpilib import DigitalInput
 from wpilib import PWMTalonSRX
-from wpilib import SmartDashboard
 from wpilib.command import Subsystem
 
 from commands.move_winch import MoveWinch
+from util.config import ClimbingConfig, config_service
+from util.match_logger import match_log
+from util.telemetry import telemetry
 
 
 class Climbing(Subsystem):
-    # Config file section names
-    GENERAL_SECTION = "ClimbingGeneral"
-    LIMIT_SWITCH_SECTION = "ClimbingLimitSwitch"
-    ENABLED_KEY = "ENABLED"
-    INVERTED_KEY = "INVERTED"
-    CHANNEL_KEY = "CHANNEL"
-    MAX_SPEED_KEY = "MAX_SPEED"
+    # Dashboard publish rate and smallest speed change worth republishing
+    PUBLISH_RATE = 10.0
+    SPEED_EPSILON = 0.005
 
     _max_speed = 0
 
     _robot = None
-    _config = None
+    _config: ClimbingConfig = None
     _motor = None
 
     _limit_switch = None
     _limit_switch_inverted = False
 
-    def __init__(self, robot, name: str = 'Winch', configfile='/home/lvuser/py/configs/subsystems.ini'):
+    def __init__(self, robot, name: str = 'Winch', config: ClimbingConfig = None):
         self._robot = robot
-        self._config = configparser.ConfigParser()
-        self._config.read(configfile)
+        self._config = config if config is not None else config_service.get().climbing
         self._init_components()
+        self._init_smartdashboard()
         self._update_smartdashboard_sensors()
         super().__init__(name)
 
     def _init_components(self):
-        self._max_speed = self._config.getfloat(Climbing.GENERAL_SECTION, Climbing.MAX_SPEED_KEY)
-        if self._config.getboolean(Climbing.GENERAL_SECTION, Climbing.ENABLED_KEY):
-            self._motor = PWMTalonSRX(self._config.getint(Climbing.GENERAL_SECTION, Climbing.CHANNEL_KEY))
-            self._motor.setInverted(self._config.getboolean(Climbing.GENERAL_SECTION, Climbing.INVERTED_KEY))
-        if self._config.getboolean(Climbing.LIMIT_SWITCH_SECTION, Climbing.ENABLED_KEY):
-            self._limit_switch = DigitalInput(self._config.getint(Climbing.LIMIT_SWITCH_SECTION, Climbing.CHANNEL_KEY))
-            self._limit_switch_inverted = self._config.getboolean(Climbing.LIMIT_SWITCH_SECTION, Climbing.INVERTED_KEY)
+        self._max_speed = self._config.max_speed
+        if self._config.motor.enabled:
+            self._motor = PWMTalonSRX(self._config.motor.channel)
+            self._motor.setInverted(self._config.motor.inverted)
+        if self._config.limit_switch.enabled:
+            self._limit_switch = DigitalInput(self._config.limit_switch.channel)
+            self._limit_switch_inverted = self._config.limit_switch.inverted
+
+    def apply_config(self, config: ClimbingConfig):
+        """Take the speed of a reloaded config, devices keep their channels until restart."""
+        self._config = config
+        self._max_speed = config.max_speed
 
     def initDefaultCommand(self):
         self.setDefaultCommand(MoveWinch(self._robot, 'MoveWinch'))
@@ -55,11 +56,17 @@ class Climbing(Subsystem):
         else:
             return False
 
+    def _init_smartdashboard(self):
+        telemetry.register("Winch Speed", Climbing.PUBLISH_RATE, 0.0, Climbing.SPEED_EPSILON)
+        if self._limit_switch is not None:
+            telemetry.register("Winch Retracted", Climbing.PUBLISH_RATE, False)
+            telemetry.register("Winch Limit Switch State", Climbing.PUBLISH_RATE, False)
+
     def _update_smartdashboard_sensors(self, speed: float = 0.0):
-        SmartDashboard.putNumber("Winch Speed", speed)
+        telemetry.set("Winch Speed", speed)
         if self._limit_switch is not None:
-            SmartDashboard.putBoolean("Winch Retracted", self.is_retracted())
-            SmartDashboard.putBoolean("Winch Limit Switch State", self._limit_value())
+            telemetry.set("Winch Retracted", self.is_retracted())
+            telemetry.set("Winch Limit Switch State", self._limit_value())
 
     def move_winch(self, speed: float):
         adjusted_speed = 0.0
@@ -71,4 +78,13 @@ class Climbing(Subsystem):
             else:
                 adjusted_speed = 0.0
             self._motor.set(adjusted_speed)
+        match_log.set_winch(adjusted_speed, self.is_retracted())
         self._update_smartdashboard_sensors(adjusted_speed)
+
+    def stop_at_limit(self):
+        """Stop a retracting winch as soon as the limit switch closes, a task of the control loop.
+
+        move_winch() only checks the switch once per robot loop, this catches it within a control loop period.
+        """
+        if self._motor is not None and self._motor.get() > 0.0 and self.is_retracted():
+            self._motor.set(0.0)
@@ -0,0 +1,87 @@
+from wpilib import I2C
+from wpilib import PWMVictorSPX
+from wpilib.command import Subsystem
+from rev.color import ColorSensorV3
+
+from util.color_lut import ColorLookup, PanelColor
+from util.config import ControlPanelConfig, config_service
+from util.telemetry import telemetry
+
+
+class ControlPanel(Subsystem):
+    # Dashboard publish rate and smallest speed change worth republishing
+    PUBLISH_RATE = 10.0
+    SPEED_EPSILON = 0.005
+
+    _max_speed: float = 0.0
+    _approach_speed: float = 0.0
+
+    _robot = None
+    _config: ControlPanelConfig = None
+    _motor = None
+    _color_sensor = None
+    _lookup: ColorLookup = None
+    _color: PanelColor = PanelColor.UNKNOWN
+
+    def __init__(self, robot, name: str = 'ControlPanel', config: ControlPanelConfig = None):
+        self._robot = robot
+        self._config = config if config is not None else config_service.get().control_panel
+        self._init_components()
+        telemetry.register("Control Panel Speed", ControlPanel.PUBLISH_RATE, 0.0, ControlPanel.SPEED_EPSILON)
+        telemetry.register("Control Panel Color", ControlPanel.PUBLISH_RATE, PanelColor.UNKNOWN.name)
+        super().__init__(name)
+
+    def _init_components(self):
+        self._max_speed = self._config.max_speed
+        self._approach_speed = self._config.approach_speed
+        if self._config.motor.enabled:
+            self._motor = PWMVictorSPX(self._config.motor.channel)
+            self._motor.setInverted(self._config.motor.inverted)
+        if self._config.color_sensor:
+            self._color_sensor = ColorSensorV3(I2C.Port.kOnboard)
+            # The fastest measurement rate, so a new wedge shows up at most 25 ms late
+            self._color_sensor.configureColorSensor(ColorSensorV3.ColorResolution.k13bit,
+                                                    ColorSensorV3.ColorMeasurementRate.k25ms)
+            self._lookup = ColorLookup({PanelColor.BLUE: self._config.blue,
+                                        PanelColor.GREEN: self._config.green,
+                                        PanelColor.RED: self._config.red,
+                                        PanelColor.YELLOW: self._config.yellow}, self._config.max_distance)
+
+    def apply_config(self, config: ControlPanelConfig):
+        """Take the speeds of a reloaded config, devices and colors keep their values until restart."""
+        self._config = config
+        self._max_speed = config.max_speed
+        self._approach_speed = config.approach_speed
+
+    def has_color_sensor(self) -> bool:
+        return self._color_sensor is not None
+
+    def read_color(self) -> PanelColor:
+        """Read the sensor and return the color under it, UNKNOWN between wedges or without a sensor."""
+        if self._color_sensor is not None:
+            color = self._color_sensor.getColor()
+            self._color = self._lookup.classify(color.red, color.green, color.blue)
+            telemetry.set("Control Panel Color", self._color.name)
+        return self._color
+
+    def get_color(self) -> PanelColor:
+        """Return the color of the last read_color(), without reading the sensor."""
+        return self._color
+
+    def spin(self, speed: float):
+        adjusted_speed = 0.0
+        if self._motor:
+            adjusted_speed = speed * self._max_speed
+            self._motor.set(adjusted_speed)
+        telemetry.set("Control Panel Speed", adjusted_speed)
+
+    def approach(self, direction: float):
+        """Spin slowly, to stop on a wedge without overshooting it."""
+        adjusted_speed = 0.0
+        if self._motor:
+            adjusted_speed = direction * self._approach_speed
+            self._motor.set(adjusted_speed)
+        telemetry.set("Control Panel Speed", adjusted_speed)
+
+    def stop(self):
+        self.spin(0.0)
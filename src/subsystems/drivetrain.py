@@ -1,70 +1,179 @@
-import configparser
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from wpilib.command import Subsystem
 from wpilib.drive import DifferentialDrive
 from wpilib import PWMVictorSPX
 from wpilib import ADXRS450_Gyro
-from wpilib import SmartDashboard
+from wpilib import AnalogGyro
+from wpilib import Notifier
+from wpilib import RobotBase
 from commands.tank_drive import TankDrive
+from util.config import DrivetrainConfig, HeadingConfig, ProfileConfig, config_service
+from util.gyro_history import GyroHistory, GyroSampler
+from util.heading_controller import HeadingController
+from util.heading_hold import HeadingHold
+from util.match_logger import match_log
+from util.output_latency import auto_start_latency
+from util.rate_executor import CONTROL_GROUP, control_executor
+from util.sensor_cache import CachedSensor, SensorCache
+from util.telemetry import telemetry
+from util.vision_results import vision_results
 
 
 class Drivetrain(Subsystem):
-    # Config file section names
-    GENERAL_SECTION = "DrivetrainGeneral"
-    LEFT_MOTOR_SECTION = "DrivetrainLeftMotor"
-    RIGHT_MOTOR_SECTION = "DrivetrainRightMotor"
-    GYRO_SECTION = "DrivetrainGyro"
-    ENABLED_KEY = "ENABLED"
-    INVERTED_KEY = "INVERTED"
-    # ARCADE_DRIVE_ROTATION_INVERTED_KEY = "ARCADE_DRIVE_ROTATION_INVERTED"
-    TYPE_KEY = "TYPE"
-    CHANNEL_KEY = "CHANNEL"
-    REVERSED_KEY = "REVERSED"
-    MAX_SPEED_KEY = "MAX_SPEED"
-    MODIFIER_SCALING_KEY = "MODIFIER_SCALING"
-    DPAD_SCALING_KEY = "DPAD_SCALING"
+    # Dashboard publish rates and smallest change worth republishing
+    SPEED_PUBLISH_RATE = 10.0
+    SPEED_EPSILON = 0.005
+    GYRO_ANGLE_PUBLISH_RATE = 50.0
+    GYRO_ANGLE_EPSILON = 0.1
+    # The gyro is sampled in the background, into a history of the last third of a second
+    GYRO_SAMPLE_RATE = 200.0
+    GYRO_HISTORY = 64
+    # Analog gyro channel the physics model turns in the simulator
+    SIM_GYRO_CHANNEL = 1
 
     _max_speed: float = 0
     # Default arcade drive rotation modifier to -1 for DifferentialDrive
     _arcade_rotation_modifier: float = -1
 
     _robot = None
-    _config: configparser.ConfigParser = None
+    _config: DrivetrainConfig = None
 
     _left_motor = None
     _right_motor = None
     _robot_drive = None
 
-    _modifier_scaling: Optional[float] = None
     _dpad_scaling: Optional[float] = None
 
-    _gyro: Optional[ADXRS450_Gyro] = None
+    # ADXRS450_Gyro, or in the simulator the AnalogGyro driven by the physics model
+    _gyro = None
     _gyro_angle: float = 0.0
+    _gyro_history: Optional[GyroHistory] = None
+    _gyro_notifier: Optional[Notifier] = None
+    # Raw gyro angle at the last reset, the gyro itself is never reset so its history stays continuous
+    _gyro_offset: float = 0.0
+    # Sensors are read once per scheduler tick, however many commands ask
+    _sensors: SensorCache = None
+    _gyro_sensor: Optional[CachedSensor] = None
+    # Turns to a heading, stepped by the control loop of the robot when it runs one
+    _heading_hold: HeadingHold = None
 
-    def __init__(self, robot, name: str = 'Drivetrain', configfile='/home/lvuser/py/configs/subsystems.ini'):
+    def __init__(self, robot, name: str = 'Drivetrain', config: DrivetrainConfig = None):
         self._robot = robot
-        self._config = configparser.ConfigParser()
-        self._config.read(configfile)
+        self._config = config if config is not None else config_service.get().drivetrain
         self._init_components()
+        Drivetrain._init_smartdashboard()
         self._update_smartdashboard_sensors(self._gyro_angle)
         Drivetrain._update_smartdashboard_tank_drive(0.0, 0.0)
         Drivetrain._update_smartdashboard_arcade_drive(0.0, 0.0)
         super().__init__(name)
 
     def initDefaultCommand(self):
-        self.setDefaultCommand(TankDrive(self._robot, 'TankDrive', modifier_scaling=self._modifier_scaling,
-                                         dpad_scaling=self._dpad_scaling))
+        self.setDefaultCommand(TankDrive(self._robot, 'TankDrive', dpad_scaling=self._dpad_scaling))
+
+    def apply_config(self, config: DrivetrainConfig):
+        """Take the speed, scaling and heading values of a reloaded config, turns started later use the new gains.
+
+        Motors and the gyro keep their channels until the robot code restarts.
+        """
+        self._config = config
+        self._max_speed = config.max_speed
+        self._dpad_scaling = config.dpad_scaling
+        default_command = self.getDefaultCommand()
+        if isinstance(default_command, TankDrive):
+            default_command.set_scaling(config.dpad_scaling)
+
+    def periodic(self):
+        """Start a new sensor tick, called by the scheduler before it runs the commands.
+
+        While the heading hold drives, this also logs and publishes its output, which the control loop does not.
+        """
+        self._sensors.next_tick()
+        if self._heading_hold.is_active():
+            turn = self._modify_turn_angle(self._heading_hold.get_output())
+            self._log_drive(0.0, turn)
+            Drivetrain._update_smartdashboard_arcade_drive(0.0, turn)
+            self.get_gyro_angle()
+            self._update_smartdashboard_sensors(self._gyro_angle)
 
     def get_gyro_angle(self) -> float:
-        if self._gyro:
-            self._gyro_angle = self._gyro.getAngle()
+        """Return the gyro angle of this tick, the gyro is read by the first call of the tick."""
+        if self._gyro_sensor is not None and not self._gyro_sensor.is_fresh():
+            self._gyro_angle = self._gyro_sensor.get()
+            match_log.set_gyro_angle(self._gyro_angle)
         return self._gyro_angle
 
+    def get_gyro_timestamp(self) -> float:
+        """Return the time.monotonic() the gyro angle was read at."""
+        return self._gyro_sensor.get_timestamp() if self._gyro_sensor is not None else 0.0
+
+    def get_sensor_reads(self) -> int:
+        return self._sensors.get_reads()
+
+    def get_heading_config(self) -> HeadingConfig:
+        return self._config.heading
+
+    def get_profile_config(self) -> ProfileConfig:
+        return self._config.profile
+
+    def start_heading_hold(self, target: float, max_output: float, tolerance: float):
+        """Start turning to a heading, with a fresh controller using the heading config.
+
+        Args:
+            target: Gyro heading in degrees.
+            max_output: Largest turn output, in [0, 1].
+            tolerance: Degrees from the target the turn may settle at.
+        """
+        self._heading_hold.start(target, HeadingController(self._config.heading, max_output, tolerance))
+
+    def update_heading_hold(self):
+        """Step the heading loop from the robot loop, unless the control loop already steps it faster."""
+        if not control_executor.is_running(CONTROL_GROUP):
+            self.step_heading_hold()
+
+    def step_heading_hold(self):
+        """Run one loop of the heading hold, a task of the control loop."""
+        self._heading_hold.step()
+
+    def stop_heading_hold(self):
+        self._heading_hold.stop()
+
+    def is_heading_settled(self) -> bool:
+        return self._heading_hold.is_settled()
+
+    def get_gyro_rate(self) -> float:
+        """Return the turn rate in degrees per second, over the last few background samples."""
+        return self._gyro_history.get_rate() if self._gyro_history is not None else 0.0
+
+    def get_gyro_history(self, samples: int) -> List[Tuple[float, float]]:
+        """Return up to samples of the newest (time.monotonic(), angle) gyro samples, oldest first."""
+        if self._gyro_history is None:
+            return []
+        return [(timestamp, angle - self._gyro_offset) for timestamp, angle in self._gyro_history.get_history(samples)]
+
+    def get_gyro_angle_at(self, timestamp: float) -> float:
+        """Return the gyro angle at a recent time.monotonic(), e.g. when a camera frame was captured."""
+        if self._gyro_history is None:
+            return self._gyro_angle
+        return self._gyro_history.get_angle_at(timestamp) - self._gyro_offset
+
+    def get_target_heading(self) -> Optional[float]:
+        """Return the gyro heading of the vision target, or None without a recent target.
+
+        The target angle is added to the heading the robot had when its frame
+        was captured, not the current one, so turning while the frame was
+        processed does not throw the heading off.
+        """
+        target = vision_results.get_target()
+        if target is None:
+            return None
+        return self.get_gyro_angle_at(target.timestamp) + target.angle
+
     def reset_gyro_angle(self) -> float:
         if self._gyro:
-            self._gyro.reset()
-            self._gyro_angle = self._gyro.getAngle()
+            self._gyro_offset = self._gyro_history.get_angle()
+            self._gyro_sensor.invalidate()
+            self._gyro_angle = self._gyro_sensor.get()
         self._update_smartdashboard_sensors(self._gyro_angle)
         return self._gyro_angle
 
@@ -78,6 +187,7 @@ class Drivetrain(Subsystem):
         left = left_speed * self._max_speed
         right = right_speed * self._max_speed
         self._robot_drive.tankDrive(left, right, False)
+        self._log_drive(0.0, 0.0)
         Drivetrain._update_smartdashboard_tank_drive(left_speed, right_speed)
         self.get_gyro_angle()
         self._update_smartdashboard_sensors(self._gyro_angle)
@@ -86,49 +196,92 @@ class Drivetrain(Subsystem):
         determined_turn_angle = self._modify_turn_angle(turn_angle)
         if self._robot_drive:
             self._robot_drive.arcadeDrive(linear_distance, determined_turn_angle, squared_inputs)
+        self._log_drive(linear_distance, determined_turn_angle)
         Drivetrain._update_smartdashboard_arcade_drive(linear_distance, determined_turn_angle)
         self.get_gyro_angle()
         self._update_smartdashboard_sensors(self._gyro_angle)
 
+    def _read_heading(self) -> Tuple[float, float]:
+        """Return the newest heading and turn rate, straight from the gyro history for the control loop."""
+        if self._gyro_history is None:
+            return self._gyro_angle, 0.0
+        return self._gyro_history.get_angle() - self._gyro_offset, self._gyro_history.get_rate()
+
+    def _drive_heading(self, turn_output: float):
+        """Drive the turn output of the heading hold, the robot loop logs and publishes it."""
+        if self._robot_drive:
+            self._robot_drive.arcadeDrive(0.0, self._modify_turn_angle(turn_output), False)
+
+    def _log_drive(self, linear: float, turn: float):
+        """Log the motor outputs, plus the arcade inputs when driving in arcade mode.
+
+        The first output that moves the robot also stops the autonomous start latency measurement.
+        """
+        if self._robot_drive:
+            left = self._left_motor.get()
+            right = self._right_motor.get()
+            if left != 0.0 or right != 0.0:
+                auto_start_latency.record()
+            match_log.set_drive(left, right, linear, turn)
+
     def _modify_turn_angle(self, turn_angle: float) -> float:
         """Method to support switch from pyfrc RobotDrive to pyfrc DifferentialDrive
         see: https://robotpy.readthedocs.io/projects/wpilib/en/latest/wpilib.drive/DifferentialDrive.html#wpilib.drive.differentialdrive.DifferentialDrive
         """
         return self._arcade_rotation_modifier * turn_angle
 
+    @staticmethod
+    def _init_smartdashboard():
+        for key in ["Drivetrain Left Speed", "Drivetrain Right Speed", "Drivetrain Linear Speed",
+                    "Drivetrain Turn Speed"]:
+            telemetry.register(key, Drivetrain.SPEED_PUBLISH_RATE, 0.0, Drivetrain.SPEED_EPSILON)
+        telemetry.register("Gyro Angle", Drivetrain.GYRO_ANGLE_PUBLISH_RATE, 0.0, Drivetrain.GYRO_ANGLE_EPSILON)
+
     @staticmethod
     def _update_smartdashboard_tank_drive(left: float, right: float):
-        SmartDashboard.putNumber("Drivetrain Left Speed", left)
-        SmartDashboard.putNumber("Drivetrain Right Speed", right)
+        telemetry.set("Drivetrain Left Speed", left)
+        telemetry.set("Drivetrain Right Speed", right)
 
     @staticmethod
     def _update_smartdashboard_arcade_drive(linear: float, turn: float):
-        SmartDashboard.putNumber("Drivetrain Linear Speed", linear)
-        SmartDashboard.putNumber("Drivetrain Turn Speed", turn)
+        telemetry.set("Drivetrain Linear Speed", linear)
+        telemetry.set("Drivetrain Turn Speed", turn)
 
     @staticmethod
     def _update_smartdashboard_sensors(gyro_angle: float):
-        SmartDashboard.putNumber("Gyro Angle", gyro_angle)
+        telemetry.set("Gyro Angle", gyro_angle)
 
     def _init_components(self):
-        self._max_speed = self._config.getfloat(Drivetrain.GENERAL_SECTION, Drivetrain.MAX_SPEED_KEY)
-        self._modifier_scaling = self._config.getfloat(Drivetrain.GENERAL_SECTION, Drivetrain.MODIFIER_SCALING_KEY)
-        self._dpad_scaling = self._config.getfloat(Drivetrain.GENERAL_SECTION, Drivetrain.DPAD_SCALING_KEY)
+        self._max_speed = self._config.max_speed
+        self._dpad_scaling = self._config.dpad_scaling
 
-        if self._config.getboolean(Drivetrain.GYRO_SECTION, Drivetrain.ENABLED_KEY):
-            self._gyro = ADXRS450_Gyro(self._config.getint(Drivetrain.GYRO_SECTION, Drivetrain.CHANNEL_KEY))
+        self._sensors = SensorCache()
+        self._heading_hold = HeadingHold(self._read_heading, self._drive_heading)
+        if self._config.gyro.enabled:
+            self._init_gyro()
 
-        if self._config.getboolean(Drivetrain.LEFT_MOTOR_SECTION, Drivetrain.ENABLED_KEY):
-            self._left_motor = PWMVictorSPX(self._config.getint(Drivetrain.LEFT_MOTOR_SECTION, Drivetrain.CHANNEL_KEY))
-            self._left_motor.setInverted(self._config.getboolean(Drivetrain.LEFT_MOTOR_SECTION,
-                                                                 Drivetrain.INVERTED_KEY))
+        if self._config.left_motor.enabled:
+            self._left_motor = PWMVictorSPX(self._config.left_motor.channel)
+            self._left_motor.setInverted(self._config.left_motor.inverted)
 
-        if self._config.getboolean(Drivetrain.RIGHT_MOTOR_SECTION, Drivetrain.ENABLED_KEY):
-            self._right_motor = PWMVictorSPX(self._config.getint(Drivetrain.RIGHT_MOTOR_SECTION,
-                                                                 Drivetrain.CHANNEL_KEY))
-            self._right_motor.setInverted(self._config.getboolean(Drivetrain.RIGHT_MOTOR_SECTION,
-                                                                  Drivetrain.INVERTED_KEY))
+        if self._config.right_motor.enabled:
+            self._right_motor = PWMVictorSPX(self._config.right_motor.channel)
+            self._right_motor.setInverted(self._config.right_motor.inverted)
 
         if self._left_motor and self._right_motor:
             self._robot_drive = DifferentialDrive(self._left_motor, self._right_motor)
             self._robot_drive.setSafetyEnabled(False)
+
+    def _init_gyro(self):
+        if RobotBase.isSimulation():
+            self._gyro = AnalogGyro(Drivetrain.SIM_GYRO_CHANNEL)
+        else:
+            self._gyro = ADXRS450_Gyro(self._config.gyro.channel)
+        self._gyro_history = GyroHistory(Drivetrain.GYRO_HISTORY)
+        sampler = GyroSampler(self._gyro.getAngle, self._gyro_history)
+        # A first sample now, so the angle is valid before the notifier first runs
+        sampler.sample()
+        self._gyro_notifier = Notifier(sampler.sample)
+        self._gyro_notifier.startPeriodic(1.0 / Drivetrain.GYRO_SAMPLE_RATE)
+        # The loop reads the newest sample, once per tick
+        self._gyro_sensor = self._sensors.add(lambda: self._gyro_history.get_angle() - self._gyro_offset)
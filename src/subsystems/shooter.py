@@ -1,36 +1,34 @@
-import configparser
-
-from wpilib import SmartDashboard
 from wpilib import Solenoid
 from wpilib.command import Subsystem
 
 from commands.lower_shooter import LowerShooter
+from util.config import ShooterConfig, config_service
+from util.match_logger import match_log
+from util.telemetry import telemetry
 
 
 class Shooter(Subsystem):
-    GENERAL_SECTION = "ShooterGeneral"
-
-    ENABLED_KEY = "ENABLED"
-    SOLENOID_CHANNEL_KEY = "SOLENOID_CHANNEL"
-    SOLENOID_INVERTED_KEY = "SOLENOID_INVERTED"
+    # Dashboard publish rate
+    PUBLISH_RATE = 10.0
 
     _robot = None
+    _config: ShooterConfig = None
     _solenoid: Solenoid = None
     _solenoid_inverted: bool = False
     _enabled: bool = False
 
-    def __init__(self, robot, name='Shooter', configfile='/home/lvuser/py/configs/subsystems.ini'):
+    def __init__(self, robot, name='Shooter', config: ShooterConfig = None):
         self._robot = robot
-        self._config = configparser.ConfigParser()
-        self._config.read(configfile)
-        self._enabled = self._config.getboolean(Shooter.GENERAL_SECTION, Shooter.ENABLED_KEY)
+        self._config = config if config is not None else config_service.get().shooter
+        self._enabled = self._config.solenoid.enabled
         self._init_components()
+        telemetry.register("Shooter Solenoid", Shooter.PUBLISH_RATE, False)
         super().__init__(name)
 
     def _init_components(self):
         if self._enabled:
-            self._solenoid_inverted = self._config.getboolean(Shooter.GENERAL_SECTION, Shooter.SOLENOID_INVERTED_KEY)
-            self._solenoid = Solenoid(self._config.getint(Shooter.GENERAL_SECTION, Shooter.SOLENOID_CHANNEL_KEY))
+            self._solenoid_inverted = self._config.solenoid.inverted
+            self._solenoid = Solenoid(self._config.solenoid.channel)
 
     def initDefaultCommand(self):
         self.setDefaultCommand(LowerShooter(self._robot))
@@ -39,8 +37,9 @@ class Shooter(Subsystem):
         if not self._enabled:
             return
         self._solenoid.set(state ^ self._solenoid_inverted)
+        match_log.set_shooter(state)
         Shooter.update_smartdashboard(self._solenoid.get())
 
     @staticmethod
     def update_smartdashboard(solenoid: bool):
-        SmartDashboard.putBoolean("Shooter Solenoid", solenoid)
+        telemetry.set("Shooter Solenoid", solenoid)
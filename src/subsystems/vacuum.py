@@ -1,39 +1,40 @@
-import configparser
-
 from wpilib import PWMVictorSPX
-from wpilib import SmartDashboard
 from wpilib.command import Subsystem
 
 from commands.do_nothing_vacuum import DoNothingVacuum
+from util.config import VacuumConfig, config_service
+from util.match_logger import match_log
+from util.telemetry import telemetry
 
 
 class Vacuum(Subsystem):
-    # Config file section names
-    GENERAL_SECTION = "VacuumGeneral"
-    ENABLED_KEY = "ENABLED"
-    INVERTED_KEY = "INVERTED"
-    CHANNEL_KEY = "CHANNEL"
-    MAX_SPEED_KEY = "MAX_SPEED"
+    # Dashboard publish rate and smallest speed change worth republishing
+    PUBLISH_RATE = 5.0
+    SPEED_EPSILON = 0.005
 
     _max_speed = 0
 
     _robot = None
-    _config = None
+    _config: VacuumConfig = None
     _motor = None
 
-    def __init__(self, robot, name: str = 'Vacuum', configfile='/home/lvuser/py/configs/subsystems.ini'):
+    def __init__(self, robot, name: str = 'Vacuum', config: VacuumConfig = None):
         self._robot = robot
-        self._config = configparser.ConfigParser()
-        self._config.read(configfile)
+        self._config = config if config is not None else config_service.get().vacuum
         self._init_components()
-        Vacuum._update_smartdashboard(0.0)
+        telemetry.register("Vacuum Speed", Vacuum.PUBLISH_RATE, 0.0, Vacuum.SPEED_EPSILON)
         super().__init__(name)
 
     def _init_components(self):
-        self._max_speed = self._config.getfloat(Vacuum.GENERAL_SECTION, Vacuum.MAX_SPEED_KEY)
-        if self._config.getboolean(Vacuum.GENERAL_SECTION, Vacuum.ENABLED_KEY):
-            self._motor = PWMVictorSPX(self._config.getint(Vacuum.GENERAL_SECTION, Vacuum.CHANNEL_KEY))
-            self._motor.setInverted(self._config.getboolean(Vacuum.GENERAL_SECTION, Vacuum.INVERTED_KEY))
+        self._max_speed = self._config.max_speed
+        if self._config.motor.enabled:
+            self._motor = PWMVictorSPX(self._config.motor.channel)
+            self._motor.setInverted(self._config.motor.inverted)
+
+    def apply_config(self, config: VacuumConfig):
+        """Take the speed of a reloaded config, the motor keeps its channel until restart."""
+        self._config = config
+        self._max_speed = config.max_speed
 
     def initDefaultCommand(self):
         self.setDefaultCommand(DoNothingVacuum(self._robot))
@@ -43,8 +44,9 @@ class Vacuum(Subsystem):
         if self._motor:
             adjusted_speed = speed * self._max_speed
             self._motor.set(adjusted_speed)
+        match_log.set_vacuum(adjusted_speed)
         Vacuum._update_smartdashboard(adjusted_speed)
 
     @staticmethod
     def _update_smartdashboard(speed: float = 0.0):
-        SmartDashboard.putNumber("Vacuum Speed", speed)
+        telemetry.set("Vacuum Speed", speed)
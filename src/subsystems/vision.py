@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import time
+
+from wpilib.command import Subsystem
+
+from util.config import CameraConfig, VisionConfig, config_service
+from util.telemetry import telemetry
+from util.vision_results import vision_results
+
+
+class Vision(Subsystem):
+    # Image processing runs in its own process, see vision_worker.py
+    WORKER = "vision_worker.py"
+    PUBLISH_RATE = 10.0
+    ANGLE_EPSILON = 0.1
+    DISTANCE_EPSILON = 0.01
+
+    _robot = None
+    _config: VisionConfig = None
+    _camera_config: CameraConfig = None
+    _frames = None
+    _worker: subprocess.Popen = None
+
+    def __init__(self, robot, name: str = 'Vision', config: VisionConfig = None, camera_config: CameraConfig = None):
+        self._robot = robot
+        self._config = config if config is not None else config_service.get().vision
+        self._camera_config = camera_config if camera_config is not None else config_service.get().camera
+        Vision._init_smartdashboard()
+        if self._config.enabled and self._camera_config.enabled:
+            self._start_worker()
+        super().__init__(name)
+
+    def _start_worker(self):
+        # Imported here so numpy is only loaded when vision is enabled
+        from util.frame_buffer import SharedFrameBuffer
+
+        # Both blocks exist before the camera and vision processes look for them
+        self._frames = SharedFrameBuffer.create(self._camera_config.width, self._camera_config.height)
+        vision_results.create(max_age=self._config.max_age)
+        robot_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self._worker = subprocess.Popen([sys.executable, os.path.join(robot_dir, Vision.WORKER)], cwd=robot_dir)
+
+    def is_running(self) -> bool:
+        return self._worker is not None and self._worker.poll() is None
+
+    def update(self):
+        """Publish the latest result to the dashboard."""
+        result = vision_results.read()
+        telemetry.set("Vision Target Found", result.found)
+        telemetry.set("Vision Target Angle", result.angle)
+        telemetry.set("Vision Target Distance", result.distance)
+        if result.sequence:
+            telemetry.set("Vision Latency", (time.monotonic() - result.timestamp) * 1000.0)
+
+    @staticmethod
+    def _init_smartdashboard():
+        telemetry.register("Vision Target Found", Vision.PUBLISH_RATE, False)
+        telemetry.register("Vision Target Angle", Vision.PUBLISH_RATE, 0.0, Vision.ANGLE_EPSILON)
+        telemetry.register("Vision Target Distance", Vision.PUBLISH_RATE, 0.0, Vision.DISTANCE_EPSILON)
+        telemetry.register("Vision Latency", Vision.PUBLISH_RATE, 0.0, Vision.ANGLE_EPSILON)
@@ -0,0 +1,73 @@
+from typing import Callable, Dict, List
+
+from util.input_snapshot import InputSnapshot
+
+
+class ButtonManager(object):
+    """Starts and cancels commands on button edges, from the bitmasks of the input snapshot.
+
+    Each loop the button bitmask of every controller is compared with the
+    previous one: the changed bits split into pressed and released edges
+    with two bitwise operations, and only the buttons that changed are looked
+    up in the dispatch tables. A loop where no bound button changed costs one
+    bitmask read per controller however many commands are bound.
+
+    """
+    PRESSED = "pressed"
+    RELEASED = "released"
+    HELD = "held"
+
+    # Per controller, the buttons with a binding and their state in the previous loop
+    _bound: List[int] = None
+    _previous: List[int] = None
+    # Per controller, the actions run by the edge of a button bit, e.g. _on_pressed[1][0b10]
+    _on_pressed: List[Dict[int, List[Callable[[], None]]]] = None
+    _on_released: List[Dict[int, List[Callable[[], None]]]] = None
+
+    def __init__(self, controllers: int = 2):
+        self._bound = [0] * controllers
+        self._previous = [0] * controllers
+        self._on_pressed = [{} for _ in range(controllers)]
+        self._on_released = [{} for _ in range(controllers)]
+
+    def bind(self, controller: int, button: int, event: str, command):
+        """Bind a command to a button edge.
+
+        Args:
+            controller: Controller index.
+            button: Joystick button number, from 1.
+            event: PRESSED or RELEASED to start the command on that edge, HELD to start it when pressed and cancel
+                it when released.
+            command: Command to start.
+        """
+        bit = 1 << (button - 1)
+        if event == ButtonManager.PRESSED or event == ButtonManager.HELD:
+            self._on_pressed[controller].setdefault(bit, []).append(command.start)
+        if event == ButtonManager.RELEASED:
+            self._on_released[controller].setdefault(bit, []).append(command.start)
+        elif event == ButtonManager.HELD:
+            self._on_released[controller].setdefault(bit, []).append(command.cancel)
+        self._bound[controller] |= bit
+
+    def update(self, snapshot: InputSnapshot):
+        """Run the actions bound to every button edge since the previous update."""
+        for controller, bound in enumerate(self._bound):
+            buttons = snapshot.get_buttons(controller) & bound
+            changed = buttons ^ self._previous[controller]
+            if changed:
+                self._previous[controller] = buttons
+                ButtonManager._dispatch(self._on_released[controller], changed & ~buttons)
+                ButtonManager._dispatch(self._on_pressed[controller], changed & buttons)
+
+    def get_held(self, controller: int) -> int:
+        """Return the bitmask of the bound buttons held at the last update."""
+        return self._previous[controller]
+
+    @staticmethod
+    def _dispatch(table: Dict[int, List[Callable[[], None]]], edges: int):
+        while edges:
+            # Lowest set bit
+            bit = edges & -edges
+            for action in table.get(bit, ()):
+                action()
+            edges ^= bit
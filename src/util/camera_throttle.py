@@ -0,0 +1,146 @@
+import time
+from typing import Callable, Optional
+
+
+class FpsThrottle(object):
+    """Picks the camera frame rate from the robot loop overruns.
+
+    The overrun counter is checked once per window of robot loops. Any
+    window with a new overrun halves the frame rate, down to min_fps, and
+    after recover_windows windows in a row without one the frame rate goes
+    back up by one frame per second each window, up to max_fps.
+
+    """
+    _max_fps: int = 0
+    _min_fps: int = 0
+    _window_loops: int = 50
+    _recover_windows: int = 5
+    _fps: int = 0
+    _loops: int = 0
+    _clean_windows: int = 0
+    _window_overruns: int = 0
+    _last_overruns: int = 0
+
+    def __init__(self, max_fps: int, min_fps: int, window_loops: int = 50, recover_windows: int = 5):
+        """Create a throttle running at max_fps.
+
+        Args:
+            max_fps: Frame rate with no overruns.
+            min_fps: Lowest frame rate the throttle goes down to.
+            window_loops: Robot loops per overrun check.
+            recover_windows: Windows without overruns before the frame rate goes back up.
+        """
+        self._max_fps = max_fps
+        self._min_fps = min(min_fps, max_fps)
+        self._window_loops = window_loops
+        self._recover_windows = recover_windows
+        self._fps = max_fps
+        self._loops = 0
+        self._clean_windows = 0
+        self._window_overruns = 0
+        self._last_overruns = 0
+
+    def update(self, overruns: int) -> int:
+        """Count one robot loop.
+
+        Args:
+            overruns: Overruns counted by the loop timer so far, the counter
+                may be reset in between calls.
+
+        Return:
+            The frame rate to stream at.
+        """
+        if overruns < self._last_overruns:
+            self._last_overruns = 0
+        self._window_overruns += overruns - self._last_overruns
+        self._last_overruns = overruns
+        self._loops += 1
+        if self._loops >= self._window_loops:
+            if self._window_overruns:
+                self.reduce()
+            else:
+                self.recover()
+            self._loops = 0
+            self._window_overruns = 0
+        return self._fps
+
+    def reduce(self):
+        self._clean_windows = 0
+        self._fps = max(self._min_fps, self._fps // 2)
+
+    def recover(self):
+        self._clean_windows += 1
+        if self._clean_windows >= self._recover_windows:
+            self._fps = min(self._max_fps, self._fps + 1)
+
+    def get_fps(self) -> int:
+        return self._fps
+
+
+class CpuBudget(object):
+    """Keeps the frame rate of the camera process within a share of one CPU core.
+
+    Each sample compares the CPU time the process used with the wall time
+    since the last sample. Over budget, the frame rate is cut in proportion
+    to the overshoot; well under budget, it goes back up by one frame per
+    second per sample.
+
+    """
+    # Usage below this share of the budget lets the frame rate go back up
+    RECOVER_SHARE = 0.8
+
+    _budget: float = 0.25
+    _max_fps: int = 0
+    _min_fps: int = 0
+    _clock: Callable[[], float] = None
+    _cpu_clock: Callable[[], float] = None
+    _fps: int = 0
+    _usage: float = 0.0
+    _last_time: Optional[float] = None
+    _last_cpu: float = 0.0
+
+    def __init__(self, budget: float, max_fps: int, min_fps: int, clock: Callable[[], float] = time.monotonic,
+                 cpu_clock: Callable[[], float] = time.process_time):
+        """Create a budget starting at max_fps.
+
+        Args:
+            budget: Share of one CPU core the process may use, 0 to 1.
+            max_fps: Highest frame rate.
+            min_fps: Lowest frame rate, kept even over budget.
+            clock: Function returning the wall time in seconds.
+            cpu_clock: Function returning the CPU time of the process in seconds.
+        """
+        self._budget = budget
+        self._max_fps = max_fps
+        self._min_fps = min(min_fps, max_fps)
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self._fps = max_fps
+        self._usage = 0.0
+        self._last_time = None
+        self._last_cpu = 0.0
+
+    def update(self) -> int:
+        """Take a CPU usage sample.
+
+        Return:
+            The frame rate the budget allows.
+        """
+        now = self._clock()
+        cpu = self._cpu_clock()
+        if self._last_time is not None and now > self._last_time:
+            self._usage = (cpu - self._last_cpu) / (now - self._last_time)
+            if self._usage > self._budget:
+                self._fps = max(self._min_fps, int(self._fps * self._budget / self._usage))
+            elif self._usage < self._budget * CpuBudget.RECOVER_SHARE:
+                self._fps = min(self._max_fps, self._fps + 1)
+        self._last_time = now
+        self._last_cpu = cpu
+        return self._fps
+
+    def get_usage(self) -> float:
+        """Return the share of one CPU core used between the last two samples."""
+        return self._usage
+
+    def get_fps(self) -> int:
+        return self._fps
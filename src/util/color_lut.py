@@ -0,0 +1,100 @@
+from enum import Enum
+from typing import Mapping, Tuple
+
+
+class PanelColor(Enum):
+    """Enumerates the control panel colors, UNKNOWN for anything else."""
+    UNKNOWN = 0
+    BLUE = 1
+    GREEN = 2
+    RED = 3
+    YELLOW = 4
+
+    @staticmethod
+    def from_game_message(message: str) -> 'PanelColor':
+        """Return the color of the game specific message, UNKNOWN when there is none yet."""
+        return _GAME_MESSAGE_COLORS.get(message[:1], PanelColor.UNKNOWN)
+
+
+_GAME_MESSAGE_COLORS = {"B": PanelColor.BLUE, "G": PanelColor.GREEN, "R": PanelColor.RED, "Y": PanelColor.YELLOW}
+
+# Colors of the wedges in order around the control panel, which has every color twice
+WHEEL_ORDER = (PanelColor.RED, PanelColor.GREEN, PanelColor.BLUE, PanelColor.YELLOW)
+WEDGES_PER_REVOLUTION = 2 * len(WHEEL_ORDER)
+
+
+def next_color(color: PanelColor, direction: int) -> PanelColor:
+    """Return the color that follows a known color when the panel turns in a direction (1 or -1)."""
+    return WHEEL_ORDER[(WHEEL_ORDER.index(color) + direction) % len(WHEEL_ORDER)]
+
+
+def sensor_color(field_color: PanelColor) -> PanelColor:
+    """Return the color under the robot sensor when the field sensor sees field_color.
+
+    The field sensor sits a quarter turn, two wedges, away from the robot's.
+    """
+    if field_color is PanelColor.UNKNOWN:
+        return field_color
+    return next_color(field_color, 2)
+
+
+class ColorLookup(object):
+    """Classifies sensor colors with a precomputed RGB lookup cube.
+
+    Every normalized channel is quantized to 2 ** bits levels, and the cube
+    holds, for every cell, the reference color nearest to the cell center
+    within max_distance, or UNKNOWN. A classification is three
+    multiplications and one index, without any distance math. The cube is
+    filled one reference at a time, only over the cells that can be within
+    max_distance of it, so building it stays cheap.
+
+    """
+    _bits: int = 5
+    _levels: int = 32
+    _max_index: int = 31
+    _table: bytearray = None
+    _colors: Tuple[PanelColor, ...] = ()
+
+    def __init__(self, references: Mapping[PanelColor, Tuple[float, float, float]], max_distance: float,
+                 bits: int = 5):
+        """Build the lookup cube.
+
+        Args:
+            references: Normalized (red, green, blue) the sensor reads on each color.
+            max_distance: Furthest a reading may be from a reference and still match it.
+            bits: Quantization bits per channel.
+        """
+        self._bits = bits
+        self._levels = 1 << bits
+        self._max_index = self._levels - 1
+        self._colors = tuple(PanelColor)
+        self._table = bytearray(self._levels ** 3)
+        nearest = [max_distance * max_distance] * len(self._table)
+        for color, reference in references.items():
+            self._fill(color.value, reference, max_distance, nearest)
+
+    def _fill(self, value: int, reference: Tuple[float, float, float], max_distance: float, nearest: list):
+        levels = self._levels
+        ranges = [range(max(0, int((channel - max_distance) * levels)),
+                        min(levels, int((channel + max_distance) * levels) + 1)) for channel in reference]
+        red, green, blue = reference
+        for r in ranges[0]:
+            dr = (r + 0.5) / levels - red
+            for g in ranges[1]:
+                dg = (g + 0.5) / levels - green
+                row = (r << (2 * self._bits)) | (g << self._bits)
+                for b in ranges[2]:
+                    db = (b + 0.5) / levels - blue
+                    distance = dr * dr + dg * dg + db * db
+                    if distance < nearest[row | b]:
+                        nearest[row | b] = distance
+                        self._table[row | b] = value
+
+    def classify(self, red: float, green: float, blue: float) -> PanelColor:
+        """Return the reference color nearest to a normalized sensor reading, or UNKNOWN."""
+        levels = self._levels
+        top = self._max_index
+        r = min(int(red * levels), top)
+        g = min(int(green * levels), top)
+        b = min(int(blue * levels), top)
+        return self._colors[self._table[(r << (2 * self._bits)) | (g << self._bits) | b]]
@@ -0,0 +1,165 @@
+import functools
+import time
+from enum import Enum
+from typing import Dict, List
+
+
+class CommandMethod(Enum):
+    """Enumerates the command methods that are timed."""
+    INITIALIZE = 0
+    EXECUTE = 1
+    IS_FINISHED = 2
+    END = 3
+
+
+class CommandProfiler(object):
+    """Aggregates time spent in command methods per match mode and command name.
+
+    Each (mode, command name) pair owns a fixed list of count, total and max
+    per CommandMethod, so memory only grows with the number of distinct
+    command names and never with the number of calls.
+
+    """
+    # Offsets of the values kept for each CommandMethod
+    _COUNT = 0
+    _TOTAL = 1
+    _MAX = 2
+    _FIELDS = 3
+
+    enabled: bool = False
+    _mode: str = None
+    _stats: Dict[str, Dict[str, List[float]]] = None
+
+    def __init__(self, enabled: bool = False, mode: str = "disabled"):
+        self.enabled = enabled
+        self._mode = mode
+        self._stats = {}
+
+    def reset(self):
+        """Clear all recorded timings."""
+        self._stats = {}
+
+    def set_mode(self, mode: str):
+        """Attribute subsequent timings to the given match mode."""
+        self._mode = mode
+
+    def get_mode(self) -> str:
+        return self._mode
+
+    def record(self, name: str, method: CommandMethod, duration: float):
+        """Add a single call of a command method.
+
+        Args:
+            name: Command name the time is attributed to.
+            method: Command method that was called.
+            duration: Call duration in seconds.
+        """
+        mode_stats = self._stats.get(self._mode)
+        if mode_stats is None:
+            mode_stats = self._stats[self._mode] = {}
+        stats = mode_stats.get(name)
+        if stats is None:
+            stats = mode_stats[name] = [0.0] * (len(CommandMethod) * CommandProfiler._FIELDS)
+        offset = method.value * CommandProfiler._FIELDS
+        stats[offset + CommandProfiler._COUNT] += 1
+        stats[offset + CommandProfiler._TOTAL] += duration
+        if duration > stats[offset + CommandProfiler._MAX]:
+            stats[offset + CommandProfiler._MAX] = duration
+
+    def get_count(self, mode: str, name: str, method: CommandMethod) -> int:
+        return int(self._get_stat(mode, name, method, CommandProfiler._COUNT))
+
+    def get_total_ms(self, mode: str, name: str, method: CommandMethod) -> float:
+        return self._get_stat(mode, name, method, CommandProfiler._TOTAL) * 1000.0
+
+    def get_max_ms(self, mode: str, name: str, method: CommandMethod) -> float:
+        return self._get_stat(mode, name, method, CommandProfiler._MAX) * 1000.0
+
+    def get_modes(self) -> List[str]:
+        return list(self._stats.keys())
+
+    def get_names(self, mode: str) -> List[str]:
+        return list(self._stats.get(mode, {}).keys())
+
+    def get_mode_total_ms(self, mode: str, name: str) -> float:
+        """Return the time spent in all timed methods of a command during a mode."""
+        return sum(self.get_total_ms(mode, name, method) for method in CommandMethod)
+
+    def report(self) -> str:
+        """Return a human readable summary, grouped by mode, costliest command first."""
+        lines = []
+        for mode in self.get_modes():
+            lines.append("[%s]" % mode)
+            names = sorted(self.get_names(mode), key=lambda n: self.get_mode_total_ms(mode, n), reverse=True)
+            for name in names:
+                parts = ["%s: total=%.3f" % (name, self.get_mode_total_ms(mode, name))]
+                for method in CommandMethod:
+                    count = self.get_count(mode, name, method)
+                    if count:
+                        parts.append("%s(count=%d mean=%.3f max=%.3f)" % (
+                            method.name.lower(), count, self.get_total_ms(mode, name, method) / count,
+                            self.get_max_ms(mode, name, method)))
+                lines.append(" ".join(parts))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> bool:
+        """Write the report to a file.
+
+        Return:
+            True if the report was written, False if there was nothing to
+            write or the file could not be written.
+        """
+        if not self._stats:
+            return False
+        try:
+            with open(path, "w") as report_file:
+                report_file.write(self.report())
+        except OSError:
+            return False
+        return True
+
+    def _get_stat(self, mode: str, name: str, method: CommandMethod, field: int) -> float:
+        stats = self._stats.get(mode, {}).get(name)
+        if stats is None:
+            return 0.0
+        return stats[method.value * CommandProfiler._FIELDS + field]
+
+
+# Shared by every InstrumentedCommand
+profiler = CommandProfiler()
+
+
+def _instrument(function, method: CommandMethod):
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if not profiler.enabled:
+            return function(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            profiler.record(self.getName(), method, time.perf_counter() - start)
+    return wrapper
+
+
+class InstrumentedCommand(object):
+    """Opt-in timing of a command's initialize, execute, isFinished and end.
+
+    List this mixin before Command in the bases of a command. The methods the
+    command defines are wrapped when the class is created, and only report
+    to the shared profiler while profiler.enabled is True.
+
+    """
+    _INSTRUMENTED_METHODS = {
+        "initialize": CommandMethod.INITIALIZE,
+        "execute": CommandMethod.EXECUTE,
+        "isFinished": CommandMethod.IS_FINISHED,
+        "end": CommandMethod.END,
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for attribute, method in InstrumentedCommand._INSTRUMENTED_METHODS.items():
+            function = cls.__dict__.get(attribute)
+            if function is not None:
+                setattr(cls, attribute, _instrument(function, method))
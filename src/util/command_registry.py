@@ -0,0 +1,55 @@
+import importlib
+from typing import Dict, List
+
+
+class CommandRegistry(object):
+    """Maps command names to where they are defined, importing them on first use.
+
+    Rarely used commands are registered by module path instead of being
+    imported, so their modules (and everything those import) stay off the
+    robot's startup path until a command is actually built.
+
+    """
+    _paths: Dict[str, str] = None
+    _classes: Dict[str, type] = None
+
+    def __init__(self):
+        self._paths = {}
+        self._classes = {}
+
+    def register(self, name: str, path: str):
+        """Register a command.
+
+        Args:
+            name: Name the command is created by.
+            path: "module:attribute" of the command class.
+        """
+        self._paths[name] = path
+        self._classes.pop(name, None)
+
+    def get_names(self) -> List[str]:
+        return list(self._paths.keys())
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._classes
+
+    def get(self, name: str) -> type:
+        """Return the command class, importing its module the first time.
+
+        Raises:
+            KeyError: The name was never registered.
+        """
+        command_class = self._classes.get(name)
+        if command_class is None:
+            module_name, _, attribute = self._paths[name].partition(":")
+            command_class = getattr(importlib.import_module(module_name), attribute)
+            self._classes[name] = command_class
+        return command_class
+
+    def create(self, name: str, *args, **kwargs):
+        """Build a new instance of a registered command."""
+        return self.get(name)(*args, **kwargs)
+
+
+# Shared by the OI and anything else building commands by name
+command_registry = CommandRegistry()
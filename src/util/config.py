@@ -0,0 +1,779 @@
+import configparser
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Callable, List, Mapping, Optional, Tuple
+
+from util.match_logger import MODES
+
+# Directory the robot is deployed to
+CONFIG_DIR = "/home/lvuser/py/configs"
+SUBSYSTEMS_FILE = "subsystems.ini"
+JOYSTICKS_FILE = "joysticks.ini"
+AUTONOMOUS_FILE = "autonomous.ini"
+CONFIG_FILES = (SUBSYSTEMS_FILE, JOYSTICKS_FILE, AUTONOMOUS_FILE)
+
+# Parsed config cache, outside the deploy directory so it survives a deploy.
+# Bump CACHE_VERSION whenever the config classes change shape.
+CACHE_FILE = "/home/lvuser/config.cache"
+CACHE_MAGIC = b"T94C"
+CACHE_VERSION = 8
+
+# Config file key names
+ENABLED_KEY = "ENABLED"
+INVERTED_KEY = "INVERTED"
+CHANNEL_KEY = "CHANNEL"
+MAX_SPEED_KEY = "MAX_SPEED"
+
+
+class ConfigError(ValueError):
+    """Raised when a config file is missing, incomplete or holds an invalid value."""
+
+
+def read_ini(path: str) -> configparser.ConfigParser:
+    """Parse a config file, failing instead of silently ignoring a missing file."""
+    parser = configparser.ConfigParser()
+    if not parser.read(path):
+        raise ConfigError("Cannot read config file %s" % path)
+    return parser
+
+
+def parse_ini(text: str) -> configparser.ConfigParser:
+    """Parse an in-memory config, mostly so tests do not need config files."""
+    parser = configparser.ConfigParser()
+    parser.read_string(text)
+    return parser
+
+
+def _get(parser: configparser.ConfigParser, section: str, key: str, getter: Callable,
+         valid: Callable = None, fallback=None):
+    """Read and convert one value, reporting the offending section and key on failure.
+
+    Args:
+        parser: Parsed config file.
+        section: Section holding the value.
+        key: Name of the value.
+        getter: ConfigParser method converting the value, e.g. ConfigParser.getfloat.
+        valid: Optional check the converted value has to pass.
+        fallback: Value of a missing key, which is required when None.
+    """
+    try:
+        if fallback is not None and not parser.has_option(section, key):
+            return fallback
+        value = getter(parser, section, key)
+    except (configparser.Error, ValueError) as e:
+        raise ConfigError("[%s] %s: %s" % (section, key, e)) from e
+    if valid is not None and not valid(value):
+        raise ConfigError("[%s] %s: invalid value %r" % (section, key, value))
+    return value
+
+
+def _is_speed(value: float) -> bool:
+    return -1.0 <= value <= 1.0
+
+
+def _is_scale(value: float) -> bool:
+    return 0.0 <= value <= 1.0
+
+
+def _is_channel(value: int) -> bool:
+    return value >= 0
+
+
+def _is_time(value: float) -> bool:
+    return value >= 0.0
+
+
+@dataclass(frozen=True)
+class DeviceConfig(object):
+    """A motor, sensor or switch that may be disabled, plugged into a channel."""
+    enabled: bool = False
+    channel: int = 0
+    inverted: bool = False
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser, section: str, channel_key: str = CHANNEL_KEY,
+                    inverted_key: str = INVERTED_KEY) -> 'DeviceConfig':
+        # Only enabled devices need a channel
+        if not _get(parser, section, ENABLED_KEY, configparser.ConfigParser.getboolean):
+            return DeviceConfig()
+        return DeviceConfig(True,
+                            _get(parser, section, channel_key, configparser.ConfigParser.getint, _is_channel),
+                            _get(parser, section, inverted_key, configparser.ConfigParser.getboolean,
+                                 fallback=False))
+
+
+@dataclass(frozen=True)
+class HeadingConfig(object):
+    """Gains and limits of the heading controller turning the drivetrain in place."""
+    SECTION = "DrivetrainHeading"
+    KP_KEY = "KP"
+    KI_KEY = "KI"
+    KD_KEY = "KD"
+    KF_KEY = "KF"
+    I_ZONE_KEY = "I_ZONE"
+    MAX_INTEGRAL_KEY = "MAX_INTEGRAL"
+    SETTLE_RATE_KEY = "SETTLE_RATE"
+    SETTLE_TIME_KEY = "SETTLE_TIME"
+
+    # Turn output per degree of error, per degree second of accumulated error and per degree per second of turn rate
+    kp: float = 0.04
+    ki: float = 0.0
+    kd: float = 0.004
+    # Output added in the direction of the error, enough to overcome the drivetrain's static friction
+    kf: float = 0.08
+    # Error in degrees within which the error is integrated, and the largest output the integral may add
+    i_zone: float = 10.0
+    max_integral: float = 0.2
+    # The turn is done once within tolerance and turning slower than SETTLE_RATE degrees per second for SETTLE_TIME
+    settle_rate: float = 10.0
+    settle_time: float = 0.1
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'HeadingConfig':
+        """Read the [DrivetrainHeading] section, every key missing from it keeps its default."""
+        section = HeadingConfig.SECTION
+        defaults = HeadingConfig()
+        return HeadingConfig(*(
+            _get(parser, section, key, configparser.ConfigParser.getfloat, lambda value: value >= 0.0,
+                 fallback=getattr(defaults, name))
+            for key, name in [(HeadingConfig.KP_KEY, "kp"), (HeadingConfig.KI_KEY, "ki"),
+                              (HeadingConfig.KD_KEY, "kd"), (HeadingConfig.KF_KEY, "kf"),
+                              (HeadingConfig.I_ZONE_KEY, "i_zone"), (HeadingConfig.MAX_INTEGRAL_KEY, "max_integral"),
+                              (HeadingConfig.SETTLE_RATE_KEY, "settle_rate"),
+                              (HeadingConfig.SETTLE_TIME_KEY, "settle_time")]))
+
+
+@dataclass(frozen=True)
+class ProfileConfig(object):
+    """Limits of the motion profiles autonomous drives follow, and the feedforward turning them into outputs."""
+    SECTION = "DrivetrainProfile"
+    MAX_VELOCITY_KEY = "MAX_VELOCITY"
+    MAX_ACCELERATION_KEY = "MAX_ACCELERATION"
+    MAX_JERK_KEY = "MAX_JERK"
+    KS_KEY = "KS"
+    KV_KEY = "KV"
+    KA_KEY = "KA"
+
+    # Metres per second, per second squared and per second cubed, a MAX_JERK of 0 drives trapezoid profiles
+    max_velocity: float = 2.0
+    max_acceleration: float = 2.0
+    max_jerk: float = 10.0
+    # Output overcoming static friction, and output per metre per second and per metre per second squared
+    ks: float = 0.05
+    kv: float = 0.3
+    ka: float = 0.05
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'ProfileConfig':
+        """Read the [DrivetrainProfile] section, every key missing from it keeps its default."""
+        section = ProfileConfig.SECTION
+        defaults = ProfileConfig()
+        return ProfileConfig(*(
+            _get(parser, section, key, configparser.ConfigParser.getfloat, valid, fallback=getattr(defaults, name))
+            for key, name, valid in [(ProfileConfig.MAX_VELOCITY_KEY, "max_velocity", lambda value: value > 0.0),
+                                     (ProfileConfig.MAX_ACCELERATION_KEY, "max_acceleration",
+                                      lambda value: value > 0.0),
+                                     (ProfileConfig.MAX_JERK_KEY, "max_jerk", lambda value: value >= 0.0),
+                                     (ProfileConfig.KS_KEY, "ks", lambda value: value >= 0.0),
+                                     (ProfileConfig.KV_KEY, "kv", lambda value: value >= 0.0),
+                                     (ProfileConfig.KA_KEY, "ka", lambda value: value >= 0.0)]))
+
+
+@dataclass(frozen=True)
+class DrivetrainConfig(object):
+    GENERAL_SECTION = "DrivetrainGeneral"
+    LEFT_MOTOR_SECTION = "DrivetrainLeftMotor"
+    RIGHT_MOTOR_SECTION = "DrivetrainRightMotor"
+    GYRO_SECTION = "DrivetrainGyro"
+    DPAD_SCALING_KEY = "DPAD_SCALING"
+
+    max_speed: float = 0.0
+    dpad_scaling: float = 1.0
+    left_motor: DeviceConfig = DeviceConfig()
+    right_motor: DeviceConfig = DeviceConfig()
+    gyro: DeviceConfig = DeviceConfig()
+    heading: HeadingConfig = HeadingConfig()
+    profile: ProfileConfig = ProfileConfig()
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'DrivetrainConfig':
+        general = DrivetrainConfig.GENERAL_SECTION
+        return DrivetrainConfig(
+            _get(parser, general, MAX_SPEED_KEY, configparser.ConfigParser.getfloat, _is_scale),
+            _get(parser, general, DrivetrainConfig.DPAD_SCALING_KEY, configparser.ConfigParser.getfloat, _is_scale),
+            DeviceConfig.from_parser(parser, DrivetrainConfig.LEFT_MOTOR_SECTION),
+            DeviceConfig.from_parser(parser, DrivetrainConfig.RIGHT_MOTOR_SECTION),
+            DeviceConfig.from_parser(parser, DrivetrainConfig.GYRO_SECTION),
+            HeadingConfig.from_parser(parser),
+            ProfileConfig.from_parser(parser))
+
+
+@dataclass(frozen=True)
+class ClimbingConfig(object):
+    GENERAL_SECTION = "ClimbingGeneral"
+    LIMIT_SWITCH_SECTION = "ClimbingLimitSwitch"
+
+    max_speed: float = 0.0
+    motor: DeviceConfig = DeviceConfig()
+    limit_switch: DeviceConfig = DeviceConfig()
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'ClimbingConfig':
+        return ClimbingConfig(
+            _get(parser, ClimbingConfig.GENERAL_SECTION, MAX_SPEED_KEY, configparser.ConfigParser.getfloat,
+                 _is_scale),
+            DeviceConfig.from_parser(parser, ClimbingConfig.GENERAL_SECTION),
+            DeviceConfig.from_parser(parser, ClimbingConfig.LIMIT_SWITCH_SECTION))
+
+
+@dataclass(frozen=True)
+class VacuumConfig(object):
+    GENERAL_SECTION = "VacuumGeneral"
+
+    max_speed: float = 0.0
+    motor: DeviceConfig = DeviceConfig()
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'VacuumConfig':
+        return VacuumConfig(
+            _get(parser, VacuumConfig.GENERAL_SECTION, MAX_SPEED_KEY, configparser.ConfigParser.getfloat, _is_scale),
+            DeviceConfig.from_parser(parser, VacuumConfig.GENERAL_SECTION))
+
+
+@dataclass(frozen=True)
+class ShooterConfig(object):
+    GENERAL_SECTION = "ShooterGeneral"
+    SOLENOID_CHANNEL_KEY = "SOLENOID_CHANNEL"
+    SOLENOID_INVERTED_KEY = "SOLENOID_INVERTED"
+
+    solenoid: DeviceConfig = DeviceConfig()
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'ShooterConfig':
+        return ShooterConfig(DeviceConfig.from_parser(parser, ShooterConfig.GENERAL_SECTION,
+                                                      ShooterConfig.SOLENOID_CHANNEL_KEY,
+                                                      ShooterConfig.SOLENOID_INVERTED_KEY))
+
+
+@dataclass(frozen=True)
+class ControlPanelConfig(object):
+    GENERAL_SECTION = "ControlPanelGeneral"
+    MOTOR_SECTION = "ControlPanelMotor"
+    COLOR_SENSOR_SECTION = "ControlPanelColorSensor"
+    APPROACH_SPEED_KEY = "APPROACH_SPEED"
+    MAX_DISTANCE_KEY = "MAX_DISTANCE"
+    BLUE_KEY = "BLUE"
+    GREEN_KEY = "GREEN"
+    RED_KEY = "RED"
+    YELLOW_KEY = "YELLOW"
+
+    max_speed: float = 0.0
+    # Speed once the wedge before the target color is under the sensor
+    approach_speed: float = 0.0
+    motor: DeviceConfig = DeviceConfig()
+    color_sensor: bool = False
+    # Furthest a normalized reading may be from a reference color and still match it
+    max_distance: float = 0.1
+    # Normalized (red, green, blue) the sensor reads on each color
+    blue: Tuple[float, ...] = (0.143, 0.427, 0.429)
+    green: Tuple[float, ...] = (0.197, 0.561, 0.240)
+    red: Tuple[float, ...] = (0.561, 0.232, 0.114)
+    yellow: Tuple[float, ...] = (0.361, 0.524, 0.113)
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'ControlPanelConfig':
+        general = ControlPanelConfig.GENERAL_SECTION
+        sensor = ControlPanelConfig.COLOR_SENSOR_SECTION
+        config = ControlPanelConfig(
+            _get(parser, general, MAX_SPEED_KEY, configparser.ConfigParser.getfloat, _is_scale),
+            _get(parser, general, ControlPanelConfig.APPROACH_SPEED_KEY, configparser.ConfigParser.getfloat,
+                 _is_scale),
+            DeviceConfig.from_parser(parser, ControlPanelConfig.MOTOR_SECTION))
+        # Only a present sensor needs its reference colors
+        if not _get(parser, sensor, ENABLED_KEY, configparser.ConfigParser.getboolean):
+            return config
+        return replace(
+            config,
+            color_sensor=True,
+            max_distance=_get(parser, sensor, ControlPanelConfig.MAX_DISTANCE_KEY,
+                              configparser.ConfigParser.getfloat, lambda value: 0.0 < value <= 1.0),
+            blue=_get(parser, sensor, ControlPanelConfig.BLUE_KEY, _get_floats, _is_normalized_color),
+            green=_get(parser, sensor, ControlPanelConfig.GREEN_KEY, _get_floats, _is_normalized_color),
+            red=_get(parser, sensor, ControlPanelConfig.RED_KEY, _get_floats, _is_normalized_color),
+            yellow=_get(parser, sensor, ControlPanelConfig.YELLOW_KEY, _get_floats, _is_normalized_color))
+
+
+def _get_floats(parser: configparser.ConfigParser, section: str, key: str) -> Tuple[float, ...]:
+    return tuple(float(value) for value in parser.get(section, key).split(","))
+
+
+def _is_normalized_color(value: Tuple[float, ...]) -> bool:
+    return len(value) == 3 and all(0.0 <= channel <= 1.0 for channel in value)
+
+
+@dataclass(frozen=True)
+class CameraConfig(object):
+    SECTION = "Camera"
+    WIDTH_KEY = "WIDTH"
+    HEIGHT_KEY = "HEIGHT"
+    FPS_KEY = "FPS"
+    MIN_FPS_KEY = "MIN_FPS"
+    COMPRESSION_KEY = "COMPRESSION"
+    CPU_BUDGET_KEY = "CPU_BUDGET"
+    MODES_KEY = "MODES"
+
+    enabled: bool = False
+    width: int = 320
+    height: int = 240
+    fps: int = 15
+    min_fps: int = 5
+    # JPEG quality streamed to the dashboard, 0-100
+    compression: int = 30
+    # Fraction of one CPU core the camera process may use
+    cpu_budget: float = 0.25
+    # Match modes the camera streams in
+    modes: Tuple[str, ...] = ("autonomous", "teleop")
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'CameraConfig':
+        section = CameraConfig.SECTION
+        if not _get(parser, section, ENABLED_KEY, configparser.ConfigParser.getboolean):
+            return CameraConfig()
+        fps = _get(parser, section, CameraConfig.FPS_KEY, configparser.ConfigParser.getint, lambda value: value > 0)
+        return CameraConfig(
+            True,
+            _get(parser, section, CameraConfig.WIDTH_KEY, configparser.ConfigParser.getint, lambda value: value > 0),
+            _get(parser, section, CameraConfig.HEIGHT_KEY, configparser.ConfigParser.getint, lambda value: value > 0),
+            fps,
+            _get(parser, section, CameraConfig.MIN_FPS_KEY, configparser.ConfigParser.getint,
+                 lambda value: 0 < value <= fps),
+            _get(parser, section, CameraConfig.COMPRESSION_KEY, configparser.ConfigParser.getint,
+                 lambda value: 0 <= value <= 100),
+            _get(parser, section, CameraConfig.CPU_BUDGET_KEY, configparser.ConfigParser.getfloat,
+                 lambda value: 0.0 < value <= 1.0),
+            _get(parser, section, CameraConfig.MODES_KEY, _get_modes,
+                 lambda value: all(mode in MODES for mode in value)))
+
+
+def _get_modes(parser: configparser.ConfigParser, section: str, key: str) -> Tuple[str, ...]:
+    return tuple(mode.strip().lower() for mode in parser.get(section, key).split(",") if mode.strip())
+
+
+@dataclass(frozen=True)
+class VisionConfig(object):
+    SECTION = "Vision"
+    FIELD_OF_VIEW_KEY = "FIELD_OF_VIEW"
+    TARGET_HEIGHT_KEY = "TARGET_HEIGHT"
+    MIN_AREA_KEY = "MIN_AREA"
+    LOWER_KEY = "LOWER"
+    UPPER_KEY = "UPPER"
+    MAX_AGE_KEY = "MAX_AGE"
+
+    enabled: bool = False
+    # Horizontal field of view of the camera in degrees
+    field_of_view: float = 60.0
+    # Height of the target in meters, for the distance estimate
+    target_height: float = 0.43
+    # Fewest pixels counted as a target
+    min_area: int = 40
+    # Inclusive (blue, green, red) bounds of target pixels
+    lower: Tuple[int, ...] = (0, 180, 0)
+    upper: Tuple[int, ...] = (120, 255, 120)
+    # Seconds a result is used for after its frame was captured
+    max_age: float = 0.5
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'VisionConfig':
+        section = VisionConfig.SECTION
+        if not _get(parser, section, ENABLED_KEY, configparser.ConfigParser.getboolean):
+            return VisionConfig()
+        return VisionConfig(
+            True,
+            _get(parser, section, VisionConfig.FIELD_OF_VIEW_KEY, configparser.ConfigParser.getfloat,
+                 lambda value: 0.0 < value < 180.0),
+            _get(parser, section, VisionConfig.TARGET_HEIGHT_KEY, configparser.ConfigParser.getfloat,
+                 lambda value: value > 0.0),
+            _get(parser, section, VisionConfig.MIN_AREA_KEY, configparser.ConfigParser.getint,
+                 lambda value: value > 0),
+            _get(parser, section, VisionConfig.LOWER_KEY, _get_color, _is_color),
+            _get(parser, section, VisionConfig.UPPER_KEY, _get_color, _is_color),
+            _get(parser, section, VisionConfig.MAX_AGE_KEY, configparser.ConfigParser.getfloat, _is_time))
+
+
+def _get_color(parser: configparser.ConfigParser, section: str, key: str) -> Tuple[int, ...]:
+    return tuple(int(channel) for channel in parser.get(section, key).split(","))
+
+
+def _is_color(value: Tuple[int, ...]) -> bool:
+    return len(value) == 3 and all(0 <= channel <= 255 for channel in value)
+
+
+@dataclass(frozen=True)
+class CurveConfig(object):
+    """Response curve of one stick axis, from stick position to output."""
+    SECTION = "Curve"
+    SHAPE_KEY = "SHAPE"
+    DEAD_BAND_KEY = "DEAD_BAND"
+    EXPO_KEY = "EXPO"
+    SCALE_KEY = "SCALE"
+    POINTS_KEY = "POINTS"
+    SHAPES = ("linear", "expo", "cubic", "points")
+
+    shape: str = "linear"
+    # Stick positions closer to zero read as zero, the rest of the travel is stretched over the full range
+    dead_band: float = 0.0
+    # Share of the cubic term of an expo curve, 0 is linear and 1 is cubic
+    expo: float = 0.0
+    # Output at full stick
+    scale: float = 1.0
+    # (input, output) points of a points curve, past the dead band, from (0, y) to (1, y)
+    points: Tuple[Tuple[float, float], ...] = ()
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser, name: str) -> 'CurveConfig':
+        section = CurveConfig.SECTION + name
+        shape = _get(parser, section, CurveConfig.SHAPE_KEY, _get_lower, lambda value: value in CurveConfig.SHAPES)
+        return CurveConfig(
+            shape,
+            _get(parser, section, CurveConfig.DEAD_BAND_KEY, configparser.ConfigParser.getfloat,
+                 lambda value: 0.0 <= value < 1.0, fallback=0.0),
+            _get(parser, section, CurveConfig.EXPO_KEY, configparser.ConfigParser.getfloat, _is_scale,
+                 fallback=0.0),
+            _get(parser, section, CurveConfig.SCALE_KEY, configparser.ConfigParser.getfloat, _is_scale,
+                 fallback=1.0),
+            _get(parser, section, CurveConfig.POINTS_KEY, _get_points, _is_curve_points) if shape == "points"
+            else ())
+
+
+def _get_lower(parser: configparser.ConfigParser, section: str, key: str) -> str:
+    return parser.get(section, key).strip().lower()
+
+
+def _get_points(parser: configparser.ConfigParser, section: str, key: str) -> Tuple[Tuple[float, float], ...]:
+    return tuple((float(x), float(y)) for x, y in (point.split() for point in parser.get(section, key).split(",")))
+
+
+def _is_curve_points(value: Tuple[Tuple[float, float], ...]) -> bool:
+    inputs = [x for x, _ in value]
+    return len(value) >= 2 and inputs[0] == 0.0 and inputs[-1] == 1.0 and \
+        all(a < b for a, b in zip(inputs, inputs[1:])) and all(0.0 <= y <= 1.0 for _, y in value)
+
+
+@dataclass(frozen=True)
+class ControllerConfig(object):
+    port: int = 0
+    dead_zone: float = 0.0
+    # Curves of the LEFTX, LEFTY, RIGHTX and RIGHTY axes, and the ones used while the modifier is held
+    curves: Tuple[CurveConfig, ...] = ()
+    modifier_curves: Tuple[CurveConfig, ...] = ()
+
+
+@dataclass(frozen=True)
+class ButtonCommandConfig(object):
+    """A command started, or cancelled, by a button edge."""
+    EVENTS = ("pressed", "released", "held")
+
+    # UserController value and JoysticksConfig.BUTTONS key of the button
+    controller: int = 0
+    button: str = ""
+    # pressed and released start the command on that edge, held starts it when pressed and cancels it when released
+    event: str = "pressed"
+    # Registered command name, built with the robot followed by args
+    command: str = ""
+    args: Tuple[float, ...] = ()
+
+
+def _get_button_command(parser: configparser.ConfigParser, section: str, key: str) -> Tuple:
+    event, command, *args = parser.get(section, key).split()
+    return event.lower(), command, tuple(float(arg) for arg in args)
+
+
+def _is_button_command(value: Tuple) -> bool:
+    event, command, _ = value
+    return event in ButtonCommandConfig.EVENTS and command.isidentifier()
+
+
+@dataclass(frozen=True)
+class JoysticksConfig(object):
+    AXIS_BINDING_SECTION = "AxisBindings"
+    BUTTON_BINDING_SECTION = "ButtonBindings"
+    JOY_CONFIG_SECTION = "JoyConfig"
+    JOY_CURVES_SECTION = "JoyCurves"
+    JOY_MODIFIER_CURVES_SECTION = "JoyModifierCurves"
+    BUTTON_COMMANDS_SECTION = "ButtonCommands"
+    # Controller name of the button command keys, e.g. SCORING_A, in UserController order
+    CONTROLLER_NAMES = ("DRIVER", "SCORING")
+    # Axes shaped by response curves
+    CURVE_AXES = ("LEFTX", "LEFTY", "RIGHTX", "RIGHTY")
+    PORT_KEY = "PORT"
+    DEAD_ZONE_KEY = "DEAD_ZONE"
+    AXES = ("LEFTX", "LEFTY", "RIGHTX", "RIGHTY", "DPADX", "DPADY")
+    BUTTONS = ("X", "A", "B", "Y", "LEFTBUMPER", "RIGHTBUMPER", "LEFTTRIGGER", "RIGHTTRIGGER", "BACK", "START")
+    CONTROLLERS = 2
+
+    # Axis and button numbers by config key, e.g. axes["LEFTY"]
+    axes: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    buttons: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    controllers: Tuple[ControllerConfig, ...] = ()
+    button_commands: Tuple[ButtonCommandConfig, ...] = ()
+
+    def __post_init__(self):
+        # Accept plain dicts, but never hand out a mutable binding table
+        object.__setattr__(self, "axes", MappingProxyType(dict(self.axes)))
+        object.__setattr__(self, "buttons", MappingProxyType(dict(self.buttons)))
+
+    def __reduce__(self):
+        # A mappingproxy cannot be pickled, so the cache stores the plain dicts
+        return JoysticksConfig, (dict(self.axes), dict(self.buttons), self.controllers, self.button_commands)
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'JoysticksConfig':
+        axes = {key: _get(parser, JoysticksConfig.AXIS_BINDING_SECTION, key, configparser.ConfigParser.getint,
+                          _is_channel) for key in JoysticksConfig.AXES}
+        buttons = {key: _get(parser, JoysticksConfig.BUTTON_BINDING_SECTION, key, configparser.ConfigParser.getint,
+                             _is_channel) for key in JoysticksConfig.BUTTONS}
+        controllers = []
+        for i in range(JoysticksConfig.CONTROLLERS):
+            section = JoysticksConfig.JOY_CONFIG_SECTION + str(i)
+            dead_zone = _get(parser, section, JoysticksConfig.DEAD_ZONE_KEY, configparser.ConfigParser.getfloat,
+                             lambda value: 0.0 <= value < 1.0)
+            # Axes without a curve keep a linear response past the dead zone
+            curves = JoysticksConfig._curves_from_parser(parser, JoysticksConfig.JOY_CURVES_SECTION + str(i),
+                                                         (CurveConfig(dead_band=dead_zone),) * 4)
+            modifier_curves = JoysticksConfig._curves_from_parser(
+                parser, JoysticksConfig.JOY_MODIFIER_CURVES_SECTION + str(i), curves)
+            controllers.append(ControllerConfig(
+                _get(parser, section, JoysticksConfig.PORT_KEY, configparser.ConfigParser.getint, _is_channel),
+                dead_zone, curves, modifier_curves))
+        return JoysticksConfig(axes, buttons, tuple(controllers), JoysticksConfig._button_commands_from_parser(parser))
+
+    @staticmethod
+    def _button_commands_from_parser(parser: configparser.ConfigParser) -> Tuple[ButtonCommandConfig, ...]:
+        """Read the "<CONTROLLER>_<BUTTON>: <event> <command> [args]" bindings, in file order."""
+        section = JoysticksConfig.BUTTON_COMMANDS_SECTION
+        if not parser.has_section(section):
+            return ()
+        commands = []
+        for key in parser.options(section):
+            controller, _, button = key.upper().partition("_")
+            if controller not in JoysticksConfig.CONTROLLER_NAMES or button not in JoysticksConfig.BUTTONS:
+                raise ConfigError("[%s] %s: unknown controller or button" % (section, key))
+            event, command, args = _get(parser, section, key, _get_button_command, _is_button_command)
+            commands.append(ButtonCommandConfig(JoysticksConfig.CONTROLLER_NAMES.index(controller), button, event,
+                                                command, args))
+        return tuple(commands)
+
+    @staticmethod
+    def _curves_from_parser(parser: configparser.ConfigParser, section: str,
+                            defaults: Tuple[CurveConfig, ...]) -> Tuple[CurveConfig, ...]:
+        """Read the curve named for every stick axis in a section, an axis not named keeps its default."""
+        curves = list(defaults)
+        for i, axis in enumerate(JoysticksConfig.CURVE_AXES):
+            if parser.has_option(section, axis):
+                curves[i] = CurveConfig.from_parser(parser, parser.get(section, axis).strip())
+        return tuple(curves)
+
+
+@dataclass(frozen=True)
+class AutonomousProgramConfig(object):
+    DRIVE_SPEED_KEY = "DRIVE_SPEED"
+    DRIVE_TIME_KEY = "DRIVE_TIME"
+    WAIT_TIME_KEY = "WAIT_TIME"
+    DRIVE_DISTANCE_KEY = "DRIVE_DISTANCE"
+
+    drive_speed: float = 0.0
+    drive_time: float = 0.0
+    wait_time: float = 0.0
+    # Metres to drive along a motion profile, 0 to drive at DRIVE_SPEED for DRIVE_TIME instead
+    drive_distance: float = 0.0
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser, section: str) -> 'AutonomousProgramConfig':
+        return AutonomousProgramConfig(
+            _get(parser, section, AutonomousProgramConfig.DRIVE_SPEED_KEY, configparser.ConfigParser.getfloat,
+                 _is_speed),
+            _get(parser, section, AutonomousProgramConfig.DRIVE_TIME_KEY, configparser.ConfigParser.getfloat,
+                 _is_time),
+            _get(parser, section, AutonomousProgramConfig.WAIT_TIME_KEY, configparser.ConfigParser.getfloat,
+                 _is_time, fallback=0.0),
+            _get(parser, section, AutonomousProgramConfig.DRIVE_DISTANCE_KEY, configparser.ConfigParser.getfloat,
+                 fallback=0.0))
+
+
+@dataclass(frozen=True)
+class AutonomousConfig(object):
+    MOVE_FROM_LINE_SECTION = "MoveFromLine"
+    DRIVE_TO_WALL_SECTION = "DriveToWall"
+    DEAD_RECKONING_SCORE_SECTION = "DeadReckoningScore"
+
+    move_from_line: AutonomousProgramConfig = AutonomousProgramConfig()
+    drive_to_wall: AutonomousProgramConfig = AutonomousProgramConfig()
+    dead_reckoning_score: AutonomousProgramConfig = AutonomousProgramConfig()
+
+    @staticmethod
+    def from_parser(parser: configparser.ConfigParser) -> 'AutonomousConfig':
+        return AutonomousConfig(
+            AutonomousProgramConfig.from_parser(parser, AutonomousConfig.MOVE_FROM_LINE_SECTION),
+            AutonomousProgramConfig.from_parser(parser, AutonomousConfig.DRIVE_TO_WALL_SECTION),
+            AutonomousProgramConfig.from_parser(parser, AutonomousConfig.DEAD_RECKONING_SCORE_SECTION))
+
+
+@dataclass(frozen=True)
+class RobotConfig(object):
+    """Everything read from the config files, converted and validated."""
+    drivetrain: DrivetrainConfig = DrivetrainConfig()
+    climbing: ClimbingConfig = ClimbingConfig()
+    vacuum: VacuumConfig = VacuumConfig()
+    shooter: ShooterConfig = ShooterConfig()
+    control_panel: ControlPanelConfig = ControlPanelConfig()
+    camera: CameraConfig = CameraConfig()
+    vision: VisionConfig = VisionConfig()
+    joysticks: JoysticksConfig = JoysticksConfig()
+    autonomous: AutonomousConfig = AutonomousConfig()
+
+
+def _read_sources(config_dir: str) -> List[Tuple[str, bytes]]:
+    """Read the raw contents of every config file, in CONFIG_FILES order."""
+    sources = []
+    for name in CONFIG_FILES:
+        path = os.path.join(config_dir, name)
+        try:
+            with open(path, "rb") as config_file:
+                sources.append((path, config_file.read()))
+        except OSError as e:
+            raise ConfigError("Cannot read config file %s" % path) from e
+    return sources
+
+
+def _parse_source(path: str, data: bytes, from_parser: Callable):
+    try:
+        return from_parser(parse_ini(data.decode("utf-8")))
+    except (configparser.Error, UnicodeDecodeError, ConfigError) as e:
+        raise ConfigError("%s: %s" % (path, e)) from e
+
+
+def _subsystems_from_parser(parser: configparser.ConfigParser) -> tuple:
+    return (DrivetrainConfig.from_parser(parser), ClimbingConfig.from_parser(parser),
+            VacuumConfig.from_parser(parser), ShooterConfig.from_parser(parser),
+            ControlPanelConfig.from_parser(parser), CameraConfig.from_parser(parser), VisionConfig.from_parser(parser))
+
+
+def _parse_sources(sources: List[Tuple[str, bytes]]) -> RobotConfig:
+    (subsystems_path, subsystems), (joysticks_path, joysticks), (autonomous_path, autonomous) = sources
+    drivetrain, climbing, vacuum, shooter, control_panel, camera, vision = _parse_source(
+        subsystems_path, subsystems, _subsystems_from_parser)
+    return RobotConfig(drivetrain, climbing, vacuum, shooter, control_panel, camera, vision,
+                       _parse_source(joysticks_path, joysticks, JoysticksConfig.from_parser),
+                       _parse_source(autonomous_path, autonomous, AutonomousConfig.from_parser))
+
+
+def read_config(config_dir: str = CONFIG_DIR) -> RobotConfig:
+    """Parse and validate all config files in a directory.
+
+    Raises:
+        ConfigError: A file is missing, or a value is missing or invalid.
+    """
+    return _parse_sources(_read_sources(config_dir))
+
+
+def _hash_sources(sources: List[Tuple[str, bytes]]) -> bytes:
+    digest = hashlib.sha1(CACHE_MAGIC + bytes([CACHE_VERSION]))
+    for _, data in sources:
+        digest.update(len(data).to_bytes(4, "little"))
+        digest.update(data)
+    return digest.digest()
+
+
+def _load_cache(cache_path: str, key: bytes) -> Optional[RobotConfig]:
+    """Return the cached config if it was parsed from files with the given hash."""
+    try:
+        with open(cache_path, "rb") as cache_file:
+            data = cache_file.read()
+    except OSError:
+        return None
+    prefix = CACHE_MAGIC + key
+    if not data.startswith(prefix):
+        return None
+    try:
+        config = pickle.loads(data[len(prefix):])
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError, ValueError):
+        return None
+    return config if isinstance(config, RobotConfig) else None
+
+
+def _write_cache(cache_path: str, key: bytes, config: RobotConfig) -> bool:
+    temp_path = cache_path + ".tmp"
+    try:
+        with open(temp_path, "wb") as cache_file:
+            cache_file.write(CACHE_MAGIC + key + pickle.dumps(config, pickle.HIGHEST_PROTOCOL))
+        # Replace atomically, so a reboot while writing never leaves a torn cache
+        os.replace(temp_path, cache_path)
+    except OSError:
+        return False
+    return True
+
+
+def read_config_cached(config_dir: str = CONFIG_DIR, cache_path: str = CACHE_FILE) -> RobotConfig:
+    """Like read_config, but reuse the last parse while the files are unchanged.
+
+    The config files are still read on every call, but only hashed; they are
+    parsed and validated again, and the cache rewritten, when their contents
+    differ from the ones the cache was built from. A missing, stale or
+    unreadable cache just falls back to parsing.
+
+    Args:
+        config_dir: Directory holding the config files.
+        cache_path: File holding the last parsed config.
+
+    Raises:
+        ConfigError: A file is missing, or a value is missing or invalid.
+    """
+    sources = _read_sources(config_dir)
+    key = _hash_sources(sources)
+    config = _load_cache(cache_path, key)
+    if config is None:
+        config = _parse_sources(sources)
+        _write_cache(cache_path, key, config)
+    return config
+
+
+class ConfigService(object):
+    """Holds the one config snapshot shared by the OI, subsystems and commands.
+
+    The robot loads it once in robotInit; everything else only calls get().
+    Tests replace the snapshot with set(), so nothing touches the filesystem.
+
+    """
+    _config: Optional[RobotConfig] = None
+
+    def __init__(self):
+        self._config = None
+
+    def load(self, config_dir: str = CONFIG_DIR, cache_path: Optional[str] = None) -> RobotConfig:
+        """Read the config files and make them the current snapshot.
+
+        Args:
+            config_dir: Directory holding the config files.
+            cache_path: Parsed config cache to use, or None to always parse.
+        """
+        if cache_path is None:
+            self._config = read_config(config_dir)
+        else:
+            self._config = read_config_cached(config_dir, cache_path)
+        return self._config
+
+    def set(self, config: RobotConfig):
+        self._config = config
+
+    def get(self) -> RobotConfig:
+        """Return the current snapshot, loading the deployed config files on first use."""
+        if self._config is None:
+            self.load()
+        return self._config
+
+
+# Shared by the robot, OI, subsystems and commands
+config_service = ConfigService()
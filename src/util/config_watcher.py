@@ -0,0 +1,116 @@
+import os
+import threading
+from typing import Optional, Tuple
+
+from util.config import CONFIG_DIR, CONFIG_FILES, ConfigError, RobotConfig, read_config, read_config_cached
+
+
+class ConfigWatcher(object):
+    """Watches the config files and parses them again when they change.
+
+    A background thread polls the modification time and size of the config
+    files and, when one of them changes, parses and validates all of them.
+    A valid config is published with a single reference assignment followed
+    by a generation bump, so the robot loop picks it up with take() without
+    locks, file I/O or parsing. A file that fails validation is reported by
+    get_error() and the last valid config stays in use.
+
+    """
+    _config_dir: str = CONFIG_DIR
+    _cache_path: Optional[str] = None
+    _poll_period: float = 1.0
+    _stamps: Tuple = ()
+    _pending: Optional[RobotConfig] = None
+    _generation: int = 0
+    _taken: int = 0
+    _error: Optional[str] = None
+    _thread: Optional[threading.Thread] = None
+    _stop_event: Optional[threading.Event] = None
+
+    def __init__(self):
+        self._stamps = ()
+        self._pending = None
+        self._generation = 0
+        self._taken = 0
+        self._error = None
+        self._thread = None
+        self._stop_event = None
+
+    def start(self, config_dir: str = CONFIG_DIR, cache_path: Optional[str] = None, poll_period: float = 1.0):
+        """Start watching, treating the files as they are now as already loaded.
+
+        Args:
+            config_dir: Directory holding the config files.
+            cache_path: Parsed config cache to refresh with each new config, or None.
+            poll_period: Seconds between checks of the files.
+        """
+        self.stop()
+        self._config_dir = config_dir
+        self._cache_path = cache_path
+        self._poll_period = poll_period
+        self._stamps = self._read_stamps()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._watch_loop, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> bool:
+        """Check the files once, and parse them if they changed.
+
+        Return:
+            True if a new config was published.
+        """
+        stamps = self._read_stamps()
+        if stamps == self._stamps:
+            return False
+        self._stamps = stamps
+        try:
+            if self._cache_path is None:
+                config = read_config(self._config_dir)
+            else:
+                config = read_config_cached(self._config_dir, self._cache_path)
+        except ConfigError as e:
+            self._error = str(e)
+            return False
+        self._error = None
+        self._pending = config
+        self._generation += 1
+        return True
+
+    def take(self) -> Optional[RobotConfig]:
+        """Return the newest config not taken yet, or None if there is none.
+
+        Safe to call from the robot loop while the watcher thread runs.
+        """
+        generation = self._generation
+        if generation == self._taken:
+            return None
+        self._taken = generation
+        return self._pending
+
+    def get_error(self) -> Optional[str]:
+        """Return why the last change was rejected, or None if it was valid."""
+        return self._error
+
+    def _read_stamps(self) -> Tuple:
+        stamps = []
+        for name in CONFIG_FILES:
+            try:
+                stat = os.stat(os.path.join(self._config_dir, name))
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _watch_loop(self):
+        while not self._stop_event.wait(self._poll_period):
+            self.poll()
+
+
+# Shared by the robot
+config_watcher = ConfigWatcher()
@@ -0,0 +1,83 @@
+from typing import Dict
+
+from wpilib import SmartDashboard
+
+# Marks a key that has never been published
+_UNSET = object()
+
+
+class DashboardPublisher(object):
+    """SmartDashboard publisher that skips writes of unchanged values.
+
+    The last value published for each key is cached, and a new value is only
+    pushed when it differs. Numbers must move by more than the key's epsilon
+    from the last published value, so the dashboard is never off by more than
+    that epsilon.
+
+    """
+    _sink = None
+    _default_epsilon: float = 0.0
+    _last: Dict[str, object] = None
+    _epsilons: Dict[str, float] = None
+
+    def __init__(self, sink=SmartDashboard, default_epsilon: float = 0.0):
+        """Create a DashboardPublisher.
+
+        Args:
+            sink: Object providing putNumber, putBoolean and putString.
+            default_epsilon: Change needed to republish numbers without their own epsilon.
+
+        """
+        self._sink = sink
+        self._default_epsilon = default_epsilon
+        self._last = {}
+        self._epsilons = {}
+
+    def set_epsilon(self, key: str, epsilon: float):
+        """Set how far a number must move from its last published value to be republished."""
+        self._epsilons[key] = epsilon
+
+    def reset(self):
+        """Forget all published values so every key is pushed on its next put."""
+        self._last.clear()
+
+    def put_number(self, key: str, value: float) -> bool:
+        """Publish a number if it changed by more than the key's epsilon.
+
+        Return:
+            True if the value was pushed to the dashboard.
+        """
+        last = self._last.get(key, _UNSET)
+        if last is not _UNSET and abs(value - last) <= self._epsilons.get(key, self._default_epsilon):
+            return False
+        self._last[key] = value
+        self._sink.putNumber(key, value)
+        return True
+
+    def put_boolean(self, key: str, value: bool) -> bool:
+        """Publish a boolean if it changed.
+
+        Return:
+            True if the value was pushed to the dashboard.
+        """
+        if self._last.get(key, _UNSET) == value:
+            return False
+        self._last[key] = value
+        self._sink.putBoolean(key, value)
+        return True
+
+    def put_string(self, key: str, value: str) -> bool:
+        """Publish a string if it changed.
+
+        Return:
+            True if the value was pushed to the dashboard.
+        """
+        if self._last.get(key, _UNSET) == value:
+            return False
+        self._last[key] = value
+        self._sink.putString(key, value)
+        return True
+
+
+# Shared by the robot and all subsystems
+publisher = DashboardPublisher()
@@ -0,0 +1,136 @@
+import struct
+from typing import List, Optional, Tuple
+
+import numpy
+
+from util.vision_results import FRAMES_NAME, attach_shared_memory, create_shared_memory
+
+
+class SharedFrameBuffer(object):
+    """Hands camera frames from one process to another through shared memory without copying them.
+
+    The block holds a few frame slots used in turn. The writer captures
+    straight into the slot returned by begin_write() and publishes it with
+    commit(); the reader gets a numpy view of the latest published slot from
+    read_latest() and works on it in place. Every slot has a sequence lock,
+    odd while the slot is written, so once done with a frame the reader
+    calls is_intact() to find out whether the writer came back around to
+    that slot in the meantime.
+
+    """
+    # (width, height, slots, published frames, latest slot)
+    HEADER_FORMAT = "<IIIII"
+    # (lock, timestamp) of every slot
+    SLOT_FORMAT = "<Id"
+    # Frames start on a cache line
+    DATA_OFFSET = 64
+    DEFAULT_SLOTS = 3
+
+    _memory = None
+    _owner: bool = False
+    _width: int = 0
+    _height: int = 0
+    _slots: int = 0
+    _frames: List[numpy.ndarray] = None
+    _write_slot: int = 0
+    _read_count: int = 0
+    _read_slot: int = 0
+    _read_lock: int = 0
+
+    def __init__(self, memory, width: int, height: int, slots: int, owner: bool):
+        """Wrap a shared memory block, use create() or attach() instead."""
+        self._memory = memory
+        self._owner = owner
+        self._width = width
+        self._height = height
+        self._slots = slots
+        frame_size = width * height * 3
+        self._frames = [numpy.ndarray((height, width, 3), numpy.uint8, memory.buf,
+                                      SharedFrameBuffer.DATA_OFFSET + slot * frame_size) for slot in range(slots)]
+        self._write_slot = 0
+        self._read_count = 0
+
+    @staticmethod
+    def create(width: int, height: int, name: str = FRAMES_NAME,
+               slots: int = DEFAULT_SLOTS) -> 'SharedFrameBuffer':
+        """Create the shared block for frames of the given size."""
+        if struct.calcsize(SharedFrameBuffer.HEADER_FORMAT) + \
+                slots * struct.calcsize(SharedFrameBuffer.SLOT_FORMAT) > SharedFrameBuffer.DATA_OFFSET:
+            raise ValueError("Too many slots: %d" % slots)
+        memory = create_shared_memory(name, SharedFrameBuffer.DATA_OFFSET + slots * width * height * 3)
+        memory.buf[:SharedFrameBuffer.DATA_OFFSET] = bytes(SharedFrameBuffer.DATA_OFFSET)
+        struct.pack_into(SharedFrameBuffer.HEADER_FORMAT, memory.buf, 0, width, height, slots, 0, 0)
+        return SharedFrameBuffer(memory, width, height, slots, True)
+
+    @staticmethod
+    def attach(name: str = FRAMES_NAME) -> 'SharedFrameBuffer':
+        """Attach to a block created by another process, taking the frame size from it.
+
+        Raises:
+            FileNotFoundError: The block does not exist yet.
+        """
+        memory = attach_shared_memory(name)
+        width, height, slots, _, _ = struct.unpack_from(SharedFrameBuffer.HEADER_FORMAT, memory.buf)
+        return SharedFrameBuffer(memory, width, height, slots, False)
+
+    def close(self):
+        """Detach from the block, removing it if this side created it.
+
+        No view returned by begin_write() or read_latest() may be in use any more.
+        """
+        if self._memory is not None:
+            self._frames = None
+            self._memory.close()
+            if self._owner:
+                self._memory.unlink()
+            self._memory = None
+
+    def get_size(self) -> Tuple[int, int]:
+        """Return (width, height) of the frames."""
+        return self._width, self._height
+
+    def begin_write(self) -> numpy.ndarray:
+        """Claim the next slot and return it, for the writer to fill with a BGR frame."""
+        count, latest = struct.unpack_from("<II", self._memory.buf, 12)
+        self._write_slot = (latest + 1) % self._slots if count else 0
+        offset = self._slot_offset(self._write_slot)
+        struct.pack_into("<I", self._memory.buf, offset, struct.unpack_from("<I", self._memory.buf, offset)[0] + 1)
+        return self._frames[self._write_slot]
+
+    def commit(self, timestamp: float):
+        """Publish the slot claimed by begin_write() as the latest frame.
+
+        Args:
+            timestamp: time.monotonic() when the frame was captured.
+        """
+        buf = self._memory.buf
+        offset = self._slot_offset(self._write_slot)
+        lock = struct.unpack_from("<I", buf, offset)[0]
+        struct.pack_into(SharedFrameBuffer.SLOT_FORMAT, buf, offset, lock + 1, timestamp)
+        count = struct.unpack_from("<I", buf, 12)[0]
+        struct.pack_into("<II", buf, 12, count + 1, self._write_slot)
+
+    def read_latest(self) -> Optional[Tuple[int, float, numpy.ndarray]]:
+        """Return (sequence, timestamp, frame) of the latest frame, or None if there is no new one.
+
+        The frame is a view of the shared slot, only valid while is_intact() holds.
+        """
+        buf = self._memory.buf
+        count, latest = struct.unpack_from("<II", buf, 12)
+        if count == self._read_count:
+            return None
+        lock, timestamp = struct.unpack_from(SharedFrameBuffer.SLOT_FORMAT, buf, self._slot_offset(latest))
+        if lock % 2:
+            return None
+        self._read_count = count
+        self._read_slot = latest
+        self._read_lock = lock
+        return count, timestamp, self._frames[latest]
+
+    def is_intact(self) -> bool:
+        """Return whether the frame last returned by read_latest() has not been overwritten since."""
+        return struct.unpack_from("<I", self._memory.buf, self._slot_offset(self._read_slot))[0] == self._read_lock
+
+    @staticmethod
+    def _slot_offset(slot: int) -> int:
+        return struct.calcsize(SharedFrameBuffer.HEADER_FORMAT) + slot * struct.calcsize(SharedFrameBuffer.SLOT_FORMAT)
@@ -0,0 +1,110 @@
+import time
+from array import array
+from typing import Callable, List, Tuple
+
+
+class GyroHistory(object):
+    """The last few gyro samples, in a preallocated ring buffer written by one sampling thread.
+
+    The writer fills a slot and only then advances the sample count, so a
+    reader never sees a half written sample without taking a lock: it reads
+    the count, then the slots below it, and retries in the unlikely case the
+    writer lapped the whole ring meanwhile.
+
+    """
+    CAPACITY = 64
+    READ_ATTEMPTS = 3
+
+    _capacity: int = CAPACITY
+    _times: array = None
+    _angles: array = None
+    # Samples written so far, the newest is in slot (_count - 1) % _capacity
+    _count: int = 0
+
+    def __init__(self, capacity: int = CAPACITY):
+        self._capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._angles = array("d", bytes(8 * capacity))
+        self._count = 0
+
+    def add(self, timestamp: float, angle: float):
+        """Store a sample, only ever called by the sampling thread."""
+        index = self._count % self._capacity
+        self._times[index] = timestamp
+        self._angles[index] = angle
+        self._count += 1
+
+    def get_count(self) -> int:
+        return self._count
+
+    def get_capacity(self) -> int:
+        return self._capacity
+
+    def get_latest(self) -> Tuple[float, float]:
+        """Return the (timestamp, angle) of the newest sample, (0.0, 0.0) before the first."""
+        samples = self.get_history(1)
+        return samples[0] if samples else (0.0, 0.0)
+
+    def get_angle(self) -> float:
+        return self.get_latest()[1]
+
+    def get_history(self, samples: int) -> List[Tuple[float, float]]:
+        """Return up to the given number of the newest (timestamp, angle) samples, oldest first."""
+        capacity = self._capacity
+        history = []
+        for _ in range(GyroHistory.READ_ATTEMPTS):
+            count = self._count
+            first = max(0, count - min(samples, capacity - 1))
+            history = [(self._times[i % capacity], self._angles[i % capacity]) for i in range(first, count)]
+            # Consistent unless the writer got round to a slot we copied while we copied it
+            if self._count - count < capacity - len(history):
+                break
+        return history
+
+    def get_rate(self, samples: int = 5) -> float:
+        """Return the angular rate in degrees per second, over the newest samples."""
+        history = self.get_history(samples)
+        if len(history) < 2:
+            return 0.0
+        (first_time, first_angle), (last_time, last_angle) = history[0], history[-1]
+        if last_time <= first_time:
+            return 0.0
+        return (last_angle - first_angle) / (last_time - first_time)
+
+    def get_angle_at(self, timestamp: float) -> float:
+        """Return the angle at a past time, interpolated between the samples around it.
+
+        Times before the oldest sample kept get the oldest angle and times
+        after the newest get the newest angle.
+        """
+        history = self.get_history(self._capacity)
+        if not history:
+            return 0.0
+        if timestamp <= history[0][0]:
+            return history[0][1]
+        for (time0, angle0), (time1, angle1) in zip(history, history[1:]):
+            if timestamp <= time1:
+                return angle0 + (angle1 - angle0) * (timestamp - time0) / (time1 - time0)
+        return history[-1][1]
+
+
+class GyroSampler(object):
+    """Samples a gyro into a GyroHistory, from a Notifier running sample() at a fixed rate."""
+    _read: Callable[[], float] = None
+    _history: GyroHistory = None
+    _clock: Callable[[], float] = None
+
+    def __init__(self, read: Callable[[], float], history: GyroHistory, clock: Callable[[], float] = time.monotonic):
+        """Constructor
+
+        Args:
+            read: Returns the gyro angle in degrees, called from the sampling thread only.
+            history: Ring buffer the samples go to.
+            clock: Timestamps the samples, time.monotonic() like the vision results.
+        """
+        self._read = read
+        self._history = history
+        self._clock = clock
+
+    def sample(self):
+        self._history.add(self._clock(), self._read())
@@ -0,0 +1,71 @@
+import math
+
+from util.config import HeadingConfig
+
+
+class HeadingController(object):
+    """PID plus feedforward controller turning the drivetrain to a heading.
+
+    The derivative term uses the measured turn rate rather than the change
+    of the error, so a new target does not kick the output. The integral
+    only accumulates near the target and while the output is not clamped,
+    and is itself limited to max_integral, so it cannot wind up during a
+    long turn. The feedforward adds a constant output in the direction of
+    the error, enough to keep the robot moving against static friction for
+    the last few degrees.
+
+    """
+    _config: HeadingConfig = None
+    _max_output: float = 1.0
+    _tolerance: float = 1.0
+    _integral: float = 0.0
+    # Seconds the turn has been settled for, -1 while it is not
+    _settled_for: float = -1.0
+
+    def __init__(self, config: HeadingConfig, max_output: float = 1.0, tolerance: float = 1.0):
+        """Constructor
+
+        Args:
+            config: Gains and limits.
+            max_output: Largest turn output, in [0, 1].
+            tolerance: Degrees from the target the turn may settle at.
+        """
+        self._config = config
+        self._max_output = max_output
+        self._tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        """Forget the integral and settle time, before starting a new turn."""
+        self._integral = 0.0
+        self._settled_for = -1.0
+
+    def calculate(self, error: float, rate: float, period: float) -> float:
+        """Return the turn output for one loop.
+
+        Args:
+            error: Degrees from the heading to the target.
+            rate: Turn rate in degrees per second, in the direction the heading grows.
+            period: Seconds since the previous calculate().
+        """
+        config = self._config
+        within = abs(error) <= self._tolerance
+        if within and abs(rate) <= config.settle_rate:
+            self._settled_for = 0.0 if self._settled_for < 0.0 else self._settled_for + period
+        else:
+            self._settled_for = -1.0
+        output = config.kp * error - config.kd * rate
+        if not within:
+            output += math.copysign(config.kf, error)
+        if abs(error) <= config.i_zone and abs(output + config.ki * self._integral) < self._max_output:
+            self._integral += error * period
+            limit = config.max_integral / config.ki if config.ki > 0.0 else 0.0
+            self._integral = max(-limit, min(limit, self._integral))
+        elif abs(error) > config.i_zone:
+            self._integral = 0.0
+        output += config.ki * self._integral
+        return max(-self._max_output, min(self._max_output, output))
+
+    def is_settled(self) -> bool:
+        """Return whether the heading stayed within tolerance, and nearly still, for the settle time."""
+        return self._settled_for >= self._config.settle_time
@@ -0,0 +1,110 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from util.heading_controller import HeadingController
+from util.rate_executor import Mailbox
+
+
+@dataclass(frozen=True)
+class HeadingRequest:
+    """A turn asked for by a command, posted to the control loop."""
+    sequence: int
+    target: float
+    controller: HeadingController
+
+
+@dataclass(frozen=True)
+class HeadingStatus:
+    """The last step of the control loop, posted back to the command."""
+    sequence: int
+    output: float
+    settled: bool
+
+
+class HeadingHold(object):
+    """Turns the drivetrain to a heading, stepped by the fast control loop.
+
+    A command posts the target and a fresh controller with start(), and
+    stop() to let go. step() runs in the control loop: it reads the gyro
+    history, runs the controller and drives the turn output, then posts the
+    output and whether the turn settled. Requests and statuses are frozen
+    and swapped whole through mailboxes; the controller itself is only ever
+    touched by step().
+
+    A step and stop() hold the same lock, so once stop() returns no step is
+    still driving and none will drive again: the caller owns the drivetrain
+    and zeroes it itself, and the next command's output is never overwritten.
+
+    """
+    _read: Callable[[], Tuple[float, float]] = None
+    _drive: Callable[[float], None] = None
+    _clock: Callable[[], float] = None
+    _requests: Mailbox = None
+    _status: Mailbox = None
+    # Held by a whole step, from reading the request to driving its output, and by stop()
+    _lock: threading.Lock = None
+    # Written by start() only
+    _sequence: int = 0
+    # Written by step() only
+    _stepping: Optional[int] = None
+    _last_step: float = 0.0
+
+    def __init__(self, read: Callable[[], Tuple[float, float]], drive: Callable[[float], None],
+                 clock: Callable[[], float] = time.monotonic):
+        """Constructor
+
+        Args:
+            read: Returns the heading in degrees and the turn rate in degrees per second.
+            drive: Drives the drivetrain with a turn output.
+            clock: Times the steps.
+        """
+        self._read = read
+        self._drive = drive
+        self._clock = clock
+        self._requests = Mailbox()
+        self._status = Mailbox(HeadingStatus(0, 0.0, False))
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._stepping = None
+        self._last_step = 0.0
+
+    def start(self, target: float, controller: HeadingController):
+        """Turn to a heading, replacing any turn in progress."""
+        self._sequence += 1
+        self._requests.put(HeadingRequest(self._sequence, target, controller))
+
+    def stop(self):
+        """Let go of the drivetrain, waiting for a step in progress to finish driving."""
+        with self._lock:
+            self._requests.put(None)
+
+    def is_active(self) -> bool:
+        return self._requests.get() is not None
+
+    def step(self):
+        """Run one loop of the current turn."""
+        with self._lock:
+            request = self._requests.get()
+            if request is None:
+                self._stepping = None
+                return
+            now = self._clock()
+            period = now - self._last_step if self._stepping == request.sequence else 0.0
+            self._stepping = request.sequence
+            self._last_step = now
+            heading, rate = self._read()
+            output = request.controller.calculate(request.target - heading, rate, period)
+            self._drive(output)
+        self._status.put(HeadingStatus(request.sequence, output, request.controller.is_settled()))
+
+    def get_output(self) -> float:
+        """Return the turn output of the last step of the current turn."""
+        status = self._status.get()
+        return status.output if status.sequence == self._sequence else 0.0
+
+    def is_settled(self) -> bool:
+        """Return whether the current turn settled on its target."""
+        status = self._status.get()
+        return status.sequence == self._sequence and status.settled
@@ -0,0 +1,116 @@
+import struct
+from typing import List, Tuple
+
+from util.match_logger import AXES, CONTROLLERS, HEADER_FORMAT, HEADER_SIZE, MAGIC, MODES, RECORD_FIELDS, \
+    RECORD_FORMAT, RECORD_SIZE, VERSION
+
+_FIELD_INDEXES = {name: index for index, (name, _) in enumerate(RECORD_FIELDS)}
+
+
+class InputReplay(object):
+    """Replays the driver inputs recorded in a match log through the simulated HAL.
+
+    The axes and buttons of both controllers are written to hal_data before
+    each simulation step, so the OI, the joystick button triggers and every
+    command see exactly what they saw during the recorded match. Replay is
+    driven by simulation time, so it runs as fast as the simulator does.
+
+    """
+    _times: List[float] = None
+    _axes: List[Tuple[float, ...]] = None
+    _buttons: List[Tuple[int, ...]] = None
+    _ports: List[int] = None
+    _axis_bindings: List[int] = None
+    _cursor: int = 0
+
+    def __init__(self, path: str, ports: List[int], axis_bindings: List[int], mode: str = "teleop"):
+        """Load the records of one mode from a match log.
+
+        Args:
+            path: Match log written by MatchLogger.
+            ports: Joystick port of each controller, in UserController order.
+            axis_bindings: Joystick axis number of LEFTX, LEFTY, RIGHTX and RIGHTY.
+            mode: Match mode whose records are replayed.
+        """
+        self._ports = ports
+        self._axis_bindings = axis_bindings
+        self._times = []
+        self._axes = []
+        self._buttons = []
+        self._cursor = 0
+        records = InputReplay._read_records(path, MODES.index(mode))
+        start = records[0][_FIELD_INDEXES["timestamp"]] if records else 0.0
+        for record in records:
+            self._times.append(record[_FIELD_INDEXES["timestamp"]] - start)
+            self._axes.append(tuple(record[_FIELD_INDEXES["%s_%s" % (controller, axis)]]
+                                    for controller in CONTROLLERS for axis in AXES))
+            self._buttons.append(tuple(record[_FIELD_INDEXES["%s_buttons" % controller]]
+                                       for controller in CONTROLLERS))
+
+    @staticmethod
+    def _read_records(path: str, mode: int) -> List[tuple]:
+        with open(path, "rb") as log_file:
+            data = log_file.read()
+        magic, version, record_size, capacity, _ = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError("%s is not a version %d match log" % (path, VERSION))
+        end = HEADER_SIZE + min(capacity, (len(data) - HEADER_SIZE) // RECORD_SIZE) * RECORD_SIZE
+        records = [record for record in struct.iter_unpack(RECORD_FORMAT, data[HEADER_SIZE:end])
+                   if record[_FIELD_INDEXES["timestamp"]] > 0.0 and record[_FIELD_INDEXES["mode"]] == mode]
+        records.sort(key=lambda record: record[_FIELD_INDEXES["sequence"]])
+        return records
+
+    def get_duration(self) -> float:
+        """Return the time from the first to the last replayed record in seconds."""
+        return self._times[-1] if self._times else 0.0
+
+    def get_frame(self, elapsed: float) -> int:
+        """Return the index of the latest record at the given time into the replay."""
+        if elapsed < 0.0 or not self._times:
+            return -1
+        if elapsed < self._times[self._cursor]:
+            self._cursor = 0
+        times = self._times
+        last = len(times) - 1
+        while self._cursor < last and times[self._cursor + 1] <= elapsed:
+            self._cursor += 1
+        return self._cursor
+
+    def apply(self, hal_data, elapsed: float) -> bool:
+        """Write the inputs recorded at the given time into the simulated joysticks.
+
+        Args:
+            hal_data: Simulated HAL data.
+            elapsed: Seconds since the replay started.
+
+        Return:
+            False once the replay has passed its last record.
+        """
+        frame = self.get_frame(elapsed)
+        if frame < 0:
+            return False
+        axes = self._axes[frame]
+        buttons = self._buttons[frame]
+        for controller, port in enumerate(self._ports):
+            joystick = hal_data['joysticks'][port]
+            first = controller * len(AXES)
+            for offset, axis in enumerate(self._axis_bindings):
+                joystick['axes'][axis] = axes[first + offset]
+            joystick['povs'][0] = InputReplay._to_pov(axes[first + 4], axes[first + 5])
+            mask = buttons[controller]
+            for button in range(1, len(joystick['buttons'])):
+                joystick['buttons'][button] = bool(mask >> (button - 1) & 1)
+        return elapsed <= self.get_duration()
+
+    @staticmethod
+    def _to_pov(dpad_x: float, dpad_y: float) -> int:
+        """Convert the D-pad axes read by OI.get_axis back into a POV angle."""
+        if dpad_y < 0.0:
+            return 0
+        if dpad_x > 0.0:
+            return 90
+        if dpad_y > 0.0:
+            return 180
+        if dpad_x < 0.0:
+            return 270
+        return -1
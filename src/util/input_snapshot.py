@@ -0,0 +1,69 @@
+from typing import List
+
+# Slots of the axes of one controller, in the order the match log stores them
+LEFT_X = 0
+LEFT_Y = 1
+RIGHT_X = 2
+RIGHT_Y = 3
+DPAD_X = 4
+DPAD_Y = 5
+AXIS_COUNT = 6
+
+
+class InputSnapshot(object):
+    """Every joystick input of one robot loop, sampled once at the top of the loop.
+
+    Axes are kept in one preallocated flat list, AXIS_COUNT slots per
+    controller with the raw stick positions and the POV hat already split
+    into the two D-pad axes, and buttons in one bitmask per
+    controller. Commands read from here instead of the joysticks, so every
+    command sees the same inputs within a loop and no read reaches the HAL.
+
+    """
+    _axes: List[float] = None
+    _buttons: List[int] = None
+    _sequence: int = 0
+
+    def __init__(self, controllers: int = 2):
+        self._axes = [0.0] * (controllers * AXIS_COUNT)
+        self._buttons = [0] * controllers
+        self._sequence = 0
+
+    def set_controller(self, controller: int, leftx: float, lefty: float, rightx: float, righty: float,
+                       pov: int, buttons: int):
+        """Store the raw inputs of one controller.
+
+        Args:
+            controller: Controller index.
+            leftx, lefty, rightx, righty: Raw stick axes.
+            pov: POV hat angle in degrees, -1 when released.
+            buttons: Button bitmask, button 1 in bit 0.
+        """
+        axes = self._axes
+        first = controller * AXIS_COUNT
+        axes[first + LEFT_X] = leftx
+        axes[first + LEFT_Y] = lefty
+        axes[first + RIGHT_X] = rightx
+        axes[first + RIGHT_Y] = righty
+        # Only the four straight D-pad directions count, diagonals read as centered
+        axes[first + DPAD_X] = 1.0 if pov == 90 else -1.0 if pov == 270 else 0.0
+        axes[first + DPAD_Y] = -1.0 if pov == 0 else 1.0 if pov == 180 else 0.0
+        self._buttons[controller] = buttons
+
+    def next_loop(self):
+        """Mark the start of a new loop, once every controller is stored."""
+        self._sequence += 1
+
+    def get_sequence(self) -> int:
+        """Return the number of loops sampled so far."""
+        return self._sequence
+
+    def get_axis(self, controller: int, slot: int) -> float:
+        return self._axes[controller * AXIS_COUNT + slot]
+
+    def get_buttons(self, controller: int) -> int:
+        return self._buttons[controller]
+
+    def is_pressed(self, controller: int, button: int) -> bool:
+        """Return whether a button, numbered from 1, is held."""
+        return (self._buttons[controller] >> (button - 1)) & 1 == 1
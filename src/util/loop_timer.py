@@ -0,0 +1,275 @@
+import time
+from enum import Enum
+from typing import List, Optional
+
+
+class LoopPhase(Enum):
+    """Enumerates the timed sections of a periodic loop."""
+    SCHEDULER = 0
+    DASHBOARD = 1
+    GAME_MESSAGE = 2
+    LOGGING = 3
+    INPUTS = 4
+
+
+class LatencyHistogram(object):
+    """Fixed-size histogram of durations in milliseconds.
+
+    All buckets are allocated up front, so recording a sample never allocates.
+    Samples beyond the last bucket are counted in an overflow bucket, while the
+    exact maximum is always tracked separately.
+
+    """
+    _bucket_width_ms: float = 0.1
+    _buckets: List[int] = None
+    _count: int = 0
+    _total_ms: float = 0.0
+    _max_ms: float = 0.0
+
+    def __init__(self, bucket_width_ms: float = 0.1, max_ms: float = 50.0):
+        """Create a histogram with buckets covering [0, max_ms) plus an overflow bucket.
+
+        Args:
+            bucket_width_ms: Width of each bucket, which is the percentile resolution.
+            max_ms: Upper edge of the last regular bucket.
+
+        """
+        self._bucket_width_ms = bucket_width_ms
+        self._buckets = [0] * (int(round(max_ms / bucket_width_ms)) + 1)
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded samples."""
+        for i in range(len(self._buckets)):
+            self._buckets[i] = 0
+        self._count = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def record(self, duration_ms: float):
+        """Add a single sample to the histogram."""
+        index = int(duration_ms / self._bucket_width_ms)
+        last = len(self._buckets) - 1
+        if index > last:
+            index = last
+        elif index < 0:
+            index = 0
+        self._buckets[index] += 1
+        self._count += 1
+        self._total_ms += duration_ms
+        if duration_ms > self._max_ms:
+            self._max_ms = duration_ms
+
+    def count(self) -> int:
+        return self._count
+
+    def max(self) -> float:
+        return self._max_ms
+
+    def mean(self) -> float:
+        if self._count == 0:
+            return 0.0
+        return self._total_ms / self._count
+
+    def percentile(self, fraction: float) -> float:
+        """Return the upper edge of the bucket containing the given percentile.
+
+        Args:
+            fraction: Percentile as a fraction. (Range [0.0, 1.0])
+
+        Return:
+            Duration in milliseconds, never more than the recorded maximum.
+        """
+        if self._count == 0:
+            return 0.0
+        target = fraction * self._count
+        seen = 0
+        for i in range(len(self._buckets) - 1):
+            bucket = self._buckets[i]
+            seen += bucket
+            if bucket and seen >= target:
+                return min((i + 1) * self._bucket_width_ms, self._max_ms)
+        return self._max_ms
+
+
+class RollingHistogram(object):
+    """Two preallocated LatencyHistograms taking turns over consecutive windows.
+
+    One records while the other holds the last completed window, so
+    percentiles follow recent behaviour instead of everything since the last
+    reset. swap() completes the window without allocating.
+
+    """
+    _recording: LatencyHistogram = None
+    _completed: LatencyHistogram = None
+
+    def __init__(self, bucket_width_ms: float = 0.1, max_ms: float = 50.0):
+        self._recording = LatencyHistogram(bucket_width_ms, max_ms)
+        self._completed = LatencyHistogram(bucket_width_ms, max_ms)
+
+    def reset(self):
+        """Clear both windows."""
+        self._recording.reset()
+        self._completed.reset()
+
+    def record(self, duration_ms: float):
+        """Add a sample to the window being recorded."""
+        self._recording.record(duration_ms)
+
+    def swap(self):
+        """Complete the window being recorded and start an empty one."""
+        self._recording, self._completed = self._completed, self._recording
+        self._recording.reset()
+
+    def completed(self) -> LatencyHistogram:
+        return self._completed
+
+
+class LoopTimer(object):
+    """Times each iteration of a periodic loop and the phases within it.
+
+    Call start() at the top of the loop, mark() after each phase and stop() at
+    the bottom. Total loop time and every phase are kept in their own
+    LatencyHistogram, and loops longer than the period count as overruns.
+    Besides these totals since reset(), each is kept in a RollingHistogram
+    whose window completes every window_loops loops, for live percentiles.
+
+    """
+    _period_ms: float = 20.0
+    _window_loops: int = 250
+    _loop: LatencyHistogram = None
+    _phases: List[LatencyHistogram] = None
+    _rolling_loop: RollingHistogram = None
+    _rolling_phases: List[RollingHistogram] = None
+    _window_count: int = 0
+    _overruns: int = 0
+    _last_ms: float = 0.0
+    _loop_start: Optional[float] = None
+    _last_mark: Optional[float] = None
+
+    def __init__(self, period_ms: float = 20.0, bucket_width_ms: float = 0.1, max_ms: float = 50.0,
+                 window_loops: int = 250):
+        """Create a LoopTimer.
+
+        Args:
+            period_ms: Loop period, any loop taking longer counts as an overrun.
+            bucket_width_ms: Histogram resolution.
+            max_ms: Largest duration the histograms resolve individually.
+            window_loops: Loops in each window of the rolling histograms.
+
+        """
+        self._period_ms = period_ms
+        self._window_loops = window_loops
+        self._loop = LatencyHistogram(bucket_width_ms, max_ms)
+        self._phases = [LatencyHistogram(bucket_width_ms, max_ms) for _ in LoopPhase]
+        self._rolling_loop = RollingHistogram(bucket_width_ms, max_ms)
+        self._rolling_phases = [RollingHistogram(bucket_width_ms, max_ms) for _ in LoopPhase]
+        self._window_count = 0
+        self._overruns = 0
+        self._last_ms = 0.0
+        self._loop_start = None
+        self._last_mark = None
+
+    def reset(self):
+        """Clear all recorded loops."""
+        self._loop.reset()
+        for histogram in self._phases:
+            histogram.reset()
+        self._rolling_loop.reset()
+        for rolling in self._rolling_phases:
+            rolling.reset()
+        self._window_count = 0
+        self._overruns = 0
+        self._last_ms = 0.0
+        self._loop_start = None
+        self._last_mark = None
+
+    def start(self):
+        """Mark the start of a loop iteration."""
+        self._loop_start = time.perf_counter()
+        self._last_mark = self._loop_start
+
+    def mark(self, phase: LoopPhase):
+        """Attribute the time since start() or the previous mark() to a phase."""
+        if self._last_mark is None:
+            return
+        now = time.perf_counter()
+        duration_ms = (now - self._last_mark) * 1000.0
+        self._phases[phase.value].record(duration_ms)
+        self._rolling_phases[phase.value].record(duration_ms)
+        self._last_mark = now
+
+    def stop(self):
+        """Mark the end of a loop iteration and record its total duration."""
+        if self._loop_start is None:
+            return
+        duration_ms = (time.perf_counter() - self._loop_start) * 1000.0
+        self._loop.record(duration_ms)
+        self._rolling_loop.record(duration_ms)
+        self._last_ms = duration_ms
+        if duration_ms > self._period_ms:
+            self._overruns += 1
+        self._loop_start = None
+        self._last_mark = None
+        self._window_count += 1
+        if self._window_count >= self._window_loops:
+            self._window_count = 0
+            self._rolling_loop.swap()
+            for rolling in self._rolling_phases:
+                rolling.swap()
+
+    def loop(self) -> LatencyHistogram:
+        return self._loop
+
+    def phase(self, phase: LoopPhase) -> LatencyHistogram:
+        return self._phases[phase.value]
+
+    def window(self) -> LatencyHistogram:
+        """Return the loop times of the last completed window."""
+        return self._rolling_loop.completed()
+
+    def window_phase(self, phase: LoopPhase) -> LatencyHistogram:
+        """Return the times of a phase in the last completed window."""
+        return self._rolling_phases[phase.value].completed()
+
+    def overruns(self) -> int:
+        return self._overruns
+
+    def last_ms(self) -> float:
+        """Return the duration of the most recently stopped loop."""
+        return self._last_ms
+
+    def report(self) -> str:
+        """Return a human readable summary of the loop and phase timings."""
+        lines = ["period_ms: %.1f" % self._period_ms,
+                 "loops: %d" % self._loop.count(),
+                 "overruns: %d" % self._overruns,
+                 LoopTimer._format_histogram("loop", self._loop)]
+        for phase in LoopPhase:
+            lines.append(LoopTimer._format_histogram(phase.name.lower(), self._phases[phase.value]))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> bool:
+        """Write the report to a file.
+
+        Args:
+            path: File to write, replacing any previous contents.
+
+        Return:
+            True if the report was written, False if there was nothing to
+            write or the file could not be written.
+        """
+        if self._loop.count() == 0:
+            return False
+        try:
+            with open(path, "w") as report_file:
+                report_file.write(self.report())
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def _format_histogram(name: str, histogram: LatencyHistogram) -> str:
+        return "%s: count=%d mean=%.3f p50=%.3f p95=%.3f p99=%.3f max=%.3f" % (
+            name, histogram.count(), histogram.mean(), histogram.percentile(0.50),
+            histogram.percentile(0.95), histogram.percentile(0.99), histogram.max())
@@ -0,0 +1,186 @@
+"""Decode match logs written by MatchLogger and summarize them.
+
+Run from the src directory on a laptop, with NumPy installed:
+
+    python -m util.match_log_analysis [--jobs N] [--max-speed S] match.log ...
+
+"""
+import argparse
+import configparser
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from util.match_logger import HEADER_FORMAT, HEADER_SIZE, MAGIC, MODES, RECORD_FIELDS, RECORD_SIZE, VERSION
+
+# NumPy equivalents of the struct formats used by RECORD_FIELDS
+_NUMPY_FORMATS = {"I": "<u4", "d": "<f8", "B": "u1", "f": "<f4", "H": "<u2"}
+
+RECORD_DTYPE = np.dtype([(name, _NUMPY_FORMATS[fmt]) for name, fmt in RECORD_FIELDS])
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "configs", "subsystems.ini")
+
+_ENABLED_MODES = [MODES.index("autonomous"), MODES.index("teleop")]
+
+
+def decode(path: str) -> np.ndarray:
+    """Read a match log into a structured array, oldest record first.
+
+    Records are ordered by their sequence number instead of the header count,
+    so a log whose header was not flushed before a brownout still decodes.
+
+    Args:
+        path: Log file written by MatchLogger.
+
+    Return:
+        Array of RECORD_DTYPE with one element per recorded loop.
+    """
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+    magic, version, record_size, capacity, _ = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError("%s is not a version %d match log" % (path, VERSION))
+    capacity = min(capacity, (len(data) - HEADER_SIZE) // RECORD_SIZE)
+    records = np.frombuffer(data, RECORD_DTYPE, capacity, HEADER_SIZE)
+    # Unused slots are still zeroed, while the FPGA timestamp of real records is positive
+    records = records[records["timestamp"] > 0.0]
+    return records[np.argsort(records["sequence"], kind="stable")]
+
+
+def analyze(records: np.ndarray, max_speed: float, period_ms: float = 20.0) -> Dict[str, float]:
+    """Compute loop time, duty cycle, winch, saturation and turn statistics.
+
+    Only autonomous and teleop records are considered.
+
+    Args:
+        records: Decoded match log.
+        max_speed: Drivetrain MAX_SPEED the motor outputs are compared to.
+        period_ms: Loop period, longer loops count as overruns.
+
+    Return:
+        Statistic name to value.
+    """
+    records = records[np.isin(records["mode"], _ENABLED_MODES)]
+    stats = {"loops": float(len(records))}
+    if len(records) == 0:
+        return stats
+    timestamps = records["timestamp"]
+    # Time each record represents, ignoring gaps such as the disabled period between modes
+    dt = np.clip(np.diff(timestamps, append=timestamps[-1]), 0.0, 5.0 * period_ms / 1000.0)
+    stats["duration"] = float(dt.sum())
+
+    loop_time = records["loop_time"].astype(np.float64)
+    stats["loop_mean"] = float(loop_time.mean())
+    stats["loop_p50"], stats["loop_p95"], stats["loop_p99"] = (float(p) for p in np.percentile(
+        loop_time, [50.0, 95.0, 99.0]))
+    stats["loop_max"] = float(loop_time.max())
+    stats["overruns"] = float(np.count_nonzero(loop_time > period_ms))
+
+    left = np.abs(records["drive_left"])
+    right = np.abs(records["drive_right"])
+    driving = (left > 0.0) | (right > 0.0)
+    stats["drivetrain_duty"] = float(driving.mean())
+    stats["winch_duty"] = float((records["winch_speed"] != 0.0).mean())
+    stats["vacuum_duty"] = float((records["vacuum_speed"] != 0.0).mean())
+    stats["shooter_duty"] = float((records["shooter_solenoid"] != 0).mean())
+    stats["winch_at_limit_time"] = float(dt[records["winch_retracted"] != 0].sum())
+    saturated = np.maximum(left, right) >= max_speed * (1.0 - 1e-3)
+    stats["drivetrain_saturation"] = float(saturated[driving].mean()) if driving.any() else 0.0
+
+    settle_times, reversals = _turn_segments(records)
+    stats["turns"] = float(len(settle_times))
+    if len(settle_times):
+        stats["turn_settle_mean"] = float(settle_times.mean())
+        stats["turn_settle_max"] = float(settle_times.max())
+        stats["turn_reversals"] = float(reversals.sum())
+    return stats
+
+
+def _turn_segments(records: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Find in-place turns, as driven by TurnDegrees, and time them.
+
+    A turn is a run of records with no linear speed and a non-zero turn speed.
+    Its settle time lasts from its first record until the turn speed drops to
+    zero, and every change of turn direction within it counts as a reversal.
+
+    Return:
+        Settle time in seconds and number of reversals of each turn.
+    """
+    turn = records["drive_turn"]
+    turning = (records["drive_linear"] == 0.0) & (turn != 0.0)
+    edges = np.diff(turning.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    timestamps = records["timestamp"]
+    settle_times = timestamps[np.minimum(ends, len(records) - 1)] - timestamps[starts]
+    direction = np.sign(turn)
+    changes = turning[1:] & turning[:-1] & (direction[1:] != direction[:-1])
+    changes_before = np.concatenate(([0], np.cumsum(changes)))
+    reversals = changes_before[ends - 1] - changes_before[starts]
+    return settle_times, reversals
+
+
+def analyze_file(path: str, max_speed: float, period_ms: float = 20.0) -> Tuple[str, Dict[str, float]]:
+    return path, analyze(decode(path), max_speed, period_ms)
+
+
+def read_max_speed(config_path: str) -> float:
+    """Read the drivetrain MAX_SPEED from a subsystems.ini."""
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    return config.getfloat("DrivetrainGeneral", "MAX_SPEED")
+
+
+def analyze_files(paths: List[str], max_speed: float, period_ms: float = 20.0,
+                  jobs: int = 1) -> List[Tuple[str, Dict[str, float]]]:
+    """Analyze several logs, optionally spread over a pool of processes."""
+    if jobs <= 1 or len(paths) <= 1:
+        return [analyze_file(path, max_speed, period_ms) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(analyze_file, paths, [max_speed] * len(paths), [period_ms] * len(paths)))
+
+
+def summarize(results: List[Tuple[str, Dict[str, float]]]) -> Dict[str, float]:
+    """Combine the statistics of several logs, weighting averages by loop count."""
+    results = [stats for _, stats in results if stats["loops"]]
+    summary = {"loops": float(sum(stats["loops"] for stats in results))}
+    if not results:
+        return summary
+    weights = np.array([stats["loops"] for stats in results])
+    for key in ["loop_mean", "drivetrain_duty", "winch_duty", "vacuum_duty", "shooter_duty",
+                "drivetrain_saturation"]:
+        summary[key] = float(np.average([stats[key] for stats in results], weights=weights))
+    for key in ["loop_p95", "loop_p99", "loop_max", "turn_settle_max"]:
+        summary[key] = max(stats.get(key, 0.0) for stats in results)
+    for key in ["duration", "overruns", "winch_at_limit_time", "turns", "turn_reversals"]:
+        summary[key] = float(sum(stats.get(key, 0.0) for stats in results))
+    return summary
+
+
+def format_stats(name: str, stats: Dict[str, float]) -> str:
+    return "%s: %s" % (name, " ".join("%s=%.3f" % (key, value) for key, value in stats.items()))
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Summarize match logs written by the robot.")
+    parser.add_argument("logs", nargs="+", help="match log files")
+    parser.add_argument("--max-speed", type=float, default=None,
+                        help="drivetrain MAX_SPEED, read from subsystems.ini by default")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="subsystems.ini to read MAX_SPEED from")
+    parser.add_argument("--period", type=float, default=20.0, help="loop period in milliseconds")
+    parser.add_argument("--jobs", type=int, default=1, help="number of processes to analyze logs with")
+    args = parser.parse_args(argv)
+
+    max_speed = args.max_speed if args.max_speed is not None else read_max_speed(args.config)
+    results = analyze_files(args.logs, max_speed, args.period, args.jobs)
+    for path, stats in results:
+        print(format_stats(path, stats))
+    if len(results) > 1:
+        print(format_stats("all", summarize(results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import mmap
+import os
+import struct
+import threading
+from typing import List, Optional
+
+# Match modes in the order they are stored in each record
+MODES = ("disabled", "autonomous", "teleop", "test")
+
+CONTROLLERS = ("driver", "scoring")
+AXES = ("leftx", "lefty", "rightx", "righty", "dpadx", "dpady")
+
+# (name, struct format) of every field of a record, in storage order
+RECORD_FIELDS = [("sequence", "I"), ("timestamp", "d"), ("mode", "B"), ("loop_time", "f")] + \
+                [("%s_%s" % (controller, axis), "f") for controller in CONTROLLERS for axis in AXES] + \
+                [("%s_buttons" % controller, "I") for controller in CONTROLLERS] + \
+                [("drive_left", "f"), ("drive_right", "f"), ("drive_linear", "f"), ("drive_turn", "f"),
+                 ("gyro_angle", "f"), ("winch_speed", "f"), ("winch_retracted", "B"), ("vacuum_speed", "f"),
+                 ("shooter_solenoid", "B")]
+RECORD_FORMAT = "<" + "".join(fmt for _, fmt in RECORD_FIELDS)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+# magic, version, record size, capacity, records written
+HEADER_FORMAT = "<4sHHIQ"
+HEADER_SIZE = 32
+HEADER_COUNT_OFFSET = 12
+MAGIC = b"T94L"
+# Version 2 widened the button masks to the 32 buttons the driver station reports
+VERSION = 2
+
+_FIELD_INDEXES = {name: index for index, (name, _) in enumerate(RECORD_FIELDS)}
+
+
+class MatchLogger(object):
+    """Fixed-size binary ring buffer of per-loop robot inputs and outputs.
+
+    Subsystems and the OI store their latest values through the set_* methods,
+    which only update a preallocated list, and the robot calls commit() once at
+    the end of each loop to pack them into the next slot of a memory-mapped
+    file. The header holds the number of records ever written, so the newest
+    record is at (count - 1) % capacity. Dirty pages are flushed to storage by a
+    background thread, so the loop never waits on the disk and a brownout loses
+    at most one flush period of records.
+
+    Until open() is called, set_* methods still work and commit() does nothing.
+
+    """
+    _SEQUENCE = _FIELD_INDEXES["sequence"]
+    _TIMESTAMP = _FIELD_INDEXES["timestamp"]
+    _MODE = _FIELD_INDEXES["mode"]
+    _LOOP_TIME = _FIELD_INDEXES["loop_time"]
+    _AXES = [_FIELD_INDEXES["%s_%s" % (controller, AXES[0])] for controller in CONTROLLERS]
+    _BUTTONS = [_FIELD_INDEXES["%s_buttons" % controller] for controller in CONTROLLERS]
+    _DRIVE_LEFT = _FIELD_INDEXES["drive_left"]
+    _DRIVE_RIGHT = _FIELD_INDEXES["drive_right"]
+    _DRIVE_LINEAR = _FIELD_INDEXES["drive_linear"]
+    _DRIVE_TURN = _FIELD_INDEXES["drive_turn"]
+    _GYRO_ANGLE = _FIELD_INDEXES["gyro_angle"]
+    _WINCH_SPEED = _FIELD_INDEXES["winch_speed"]
+    _WINCH_RETRACTED = _FIELD_INDEXES["winch_retracted"]
+    _VACUUM_SPEED = _FIELD_INDEXES["vacuum_speed"]
+    _SHOOTER_SOLENOID = _FIELD_INDEXES["shooter_solenoid"]
+
+    _struct: struct.Struct = None
+    _values: List = None
+    _mode: int = 0
+    _file = None
+    _mmap: Optional[mmap.mmap] = None
+    _capacity: int = 0
+    _count: int = 0
+    _flush_period: float = 1.0
+    _flush_thread: Optional[threading.Thread] = None
+    _stop_event: Optional[threading.Event] = None
+
+    def __init__(self):
+        self._struct = struct.Struct(RECORD_FORMAT)
+        self._values = [0] * len(RECORD_FIELDS)
+        self._mode = 0
+        self._file = None
+        self._mmap = None
+        self._capacity = 0
+        self._count = 0
+
+    def open(self, path: str, capacity: int = 15000, flush_period: float = 1.0) -> bool:
+        """Create a new log file and start the background flush thread.
+
+        An existing log at the same path is kept as path + ".prev", so the log
+        of a match interrupted by a brownout survives the restart.
+
+        Args:
+            path: Log file to create.
+            capacity: Number of records in the ring buffer.
+            flush_period: Seconds between flushes of the log to storage.
+
+        Return:
+            True if the log was opened, False if it could not be created.
+        """
+        self.close()
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        try:
+            if os.path.exists(path):
+                os.replace(path, path + ".prev")
+            self._file = open(path, "w+b")
+            # Write every page now so logging never waits on a page allocation
+            self._file.write(bytes(size))
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), size)
+        except OSError:
+            self.close()
+            return False
+        struct.pack_into(HEADER_FORMAT, self._mmap, 0, MAGIC, VERSION, RECORD_SIZE, capacity, 0)
+        self._capacity = capacity
+        self._count = 0
+        self._flush_period = flush_period
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_loop, name="MatchLoggerFlush", daemon=True)
+        self._flush_thread.start()
+        return True
+
+    def close(self):
+        """Stop the flush thread, flush the log and close the file."""
+        if self._flush_thread is not None:
+            self._stop_event.set()
+            self._flush_thread.join()
+            self._flush_thread = None
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def is_open(self) -> bool:
+        return self._mmap is not None
+
+    def get_count(self) -> int:
+        """Return the number of records committed since the log was opened."""
+        return self._count
+
+    def set_mode(self, mode: str):
+        self._mode = MODES.index(mode)
+
+    def set_axes(self, controller: int, leftx: float, lefty: float, rightx: float, righty: float,
+                 dpadx: float, dpady: float):
+        first = MatchLogger._AXES[controller]
+        values = self._values
+        values[first] = leftx
+        values[first + 1] = lefty
+        values[first + 2] = rightx
+        values[first + 3] = righty
+        values[first + 4] = dpadx
+        values[first + 5] = dpady
+
+    def set_buttons(self, controller: int, buttons: int):
+        self._values[MatchLogger._BUTTONS[controller]] = buttons
+
+    def set_drive(self, left: float, right: float, linear: float, turn: float):
+        """Store the drivetrain motor outputs, and the arcade inputs (zero in tank drive)."""
+        values = self._values
+        values[MatchLogger._DRIVE_LEFT] = left
+        values[MatchLogger._DRIVE_RIGHT] = right
+        values[MatchLogger._DRIVE_LINEAR] = linear
+        values[MatchLogger._DRIVE_TURN] = turn
+
+    def set_gyro_angle(self, angle: float):
+        self._values[MatchLogger._GYRO_ANGLE] = angle
+
+    def set_winch(self, speed: float, retracted: bool):
+        self._values[MatchLogger._WINCH_SPEED] = speed
+        self._values[MatchLogger._WINCH_RETRACTED] = retracted
+
+    def set_vacuum(self, speed: float):
+        self._values[MatchLogger._VACUUM_SPEED] = speed
+
+    def set_shooter(self, solenoid: bool):
+        self._values[MatchLogger._SHOOTER_SOLENOID] = solenoid
+
+    def commit(self, timestamp: float, loop_time_ms: float):
+        """Write the current values as the next record of the ring buffer.
+
+        Args:
+            timestamp: Time of the loop in seconds.
+            loop_time_ms: Duration of the loop in milliseconds.
+        """
+        if self._mmap is None:
+            return
+        values = self._values
+        values[MatchLogger._SEQUENCE] = self._count & 0xFFFFFFFF
+        values[MatchLogger._TIMESTAMP] = timestamp
+        values[MatchLogger._MODE] = self._mode
+        values[MatchLogger._LOOP_TIME] = loop_time_ms
+        offset = HEADER_SIZE + (self._count % self._capacity) * RECORD_SIZE
+        self._struct.pack_into(self._mmap, offset, *values)
+        self._count += 1
+        struct.pack_into("<Q", self._mmap, HEADER_COUNT_OFFSET, self._count)
+
+    def _flush_loop(self):
+        # mmap.flush() holds the GIL through the whole msync and would stall the robot loop, fsync releases it and
+        # still writes back the dirty pages of the shared mapping
+        fileno = self._file.fileno()
+        while not self._stop_event.wait(self._flush_period):
+            os.fsync(fileno)
+
+
+# Shared by the robot, OI and all subsystems
+match_log = MatchLogger()
@@ -0,0 +1,196 @@
+import math
+from array import array
+from typing import Dict, Tuple
+
+from util.config import ProfileConfig
+
+# Sample spacing, one sample per robot loop
+PERIOD = 0.02
+
+
+class MotionProfile(object):
+    """Position, velocity and acceleration of a drive, sampled every period.
+
+    Samples are precomputed into arrays when the profile is generated, so
+    following it only takes an index per loop.
+
+    """
+    _period: float = PERIOD
+    _positions: array = None
+    _velocities: array = None
+    _accelerations: array = None
+
+    def __init__(self, positions: array, velocities: array, accelerations: array, period: float = PERIOD):
+        self._period = period
+        self._positions = positions
+        self._velocities = velocities
+        self._accelerations = accelerations
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def get_period(self) -> float:
+        return self._period
+
+    def get_duration(self) -> float:
+        """Return the time of the last sample, where the drive has stopped."""
+        return (len(self._positions) - 1) * self._period
+
+    def get_distance(self) -> float:
+        return self._positions[-1]
+
+    def get_positions(self) -> array:
+        return self._positions
+
+    def get_velocities(self) -> array:
+        return self._velocities
+
+    def get_accelerations(self) -> array:
+        return self._accelerations
+
+    def sample(self, elapsed: float) -> Tuple[float, float, float]:
+        """Return the (position, velocity, acceleration) at a time since the start, the end state after it ends."""
+        # Nudged so a time on a sample, like 3 * period, does not round down to the one before it
+        index = min(len(self._positions) - 1, max(0, int(elapsed / self._period + 1e-6)))
+        return self._positions[index], self._velocities[index], self._accelerations[index]
+
+
+def trapezoid(distance: float, max_velocity: float, max_acceleration: float, period: float = PERIOD) -> MotionProfile:
+    """Return the fastest profile over a distance within the velocity and acceleration limits.
+
+    It accelerates at max_acceleration, cruises at max_velocity and
+    decelerates again, or only accelerates and decelerates when the
+    distance is too short to reach max_velocity.
+
+    Args:
+        distance: Metres, negative to drive backwards.
+        max_velocity: Metres per second.
+        max_acceleration: Metres per second squared.
+        period: Seconds between samples.
+    """
+    sign = math.copysign(1.0, distance)
+    distance = abs(distance)
+    accelerate_time = max_velocity / max_acceleration
+    if max_acceleration * accelerate_time * accelerate_time > distance:
+        # Triangle, the peak velocity stays below max_velocity
+        accelerate_time = math.sqrt(distance / max_acceleration)
+    peak_velocity = max_acceleration * accelerate_time
+    cruise_time = (distance - peak_velocity * accelerate_time) / peak_velocity if peak_velocity > 0.0 else 0.0
+    decelerate_start = accelerate_time + cruise_time
+    duration = decelerate_start + accelerate_time
+
+    samples = int(math.ceil(duration / period - 1e-9)) + 1
+    positions = array("d", bytes(8 * samples))
+    velocities = array("d", bytes(8 * samples))
+    accelerations = array("d", bytes(8 * samples))
+    for i in range(samples):
+        t = min(i * period, duration)
+        if t < accelerate_time:
+            acceleration = max_acceleration
+            velocity = max_acceleration * t
+            position = 0.5 * max_acceleration * t * t
+        elif t < decelerate_start:
+            acceleration = 0.0
+            velocity = peak_velocity
+            position = peak_velocity * (t - 0.5 * accelerate_time)
+        elif t < duration:
+            left = duration - t
+            acceleration = -max_acceleration
+            velocity = max_acceleration * left
+            position = distance - 0.5 * max_acceleration * left * left
+        else:
+            acceleration, velocity, position = 0.0, 0.0, distance
+        positions[i] = sign * position
+        velocities[i] = sign * velocity
+        accelerations[i] = sign * acceleration
+    return MotionProfile(positions, velocities, accelerations, period)
+
+
+def s_curve(distance: float, max_velocity: float, max_acceleration: float, max_jerk: float,
+            period: float = PERIOD) -> MotionProfile:
+    """Return a profile over a distance that also limits the jerk, for smoother starts and stops.
+
+    The trapezoid profile is smoothed with a moving average over
+    max_acceleration / max_jerk seconds: acceleration then ramps up and
+    down at max_jerk instead of stepping, or twice that where a drive too
+    short to cruise turns straight from accelerating to braking. The
+    distance is unchanged and the drive takes that much longer.
+
+    Args:
+        distance: Metres, negative to drive backwards.
+        max_velocity: Metres per second.
+        max_acceleration: Metres per second squared.
+        max_jerk: Metres per second cubed.
+        period: Seconds between samples.
+    """
+    profile = trapezoid(distance, max_velocity, max_acceleration, period)
+    width = int(round(max_acceleration / max_jerk / period))
+    if width <= 1 or distance == 0.0:
+        return profile
+    smoothed = []
+    for values, end in [(profile.get_positions(), profile.get_distance()), (profile.get_velocities(), 0.0),
+                        (profile.get_accelerations(), 0.0)]:
+        samples = len(values) + width - 1
+        result = array("d", bytes(8 * samples))
+        total = 0.0
+        for i in range(samples):
+            # Before the start the drive stands still at 0, after the end at the end state
+            total += values[i] if i < len(values) else end
+            if i >= width:
+                total -= values[i - width] if i - width < len(values) else end
+            result[i] = total / width
+        smoothed.append(result)
+    # Exactly at rest on the distance, without the rounding of the running sums
+    smoothed[0][-1] = profile.get_distance()
+    smoothed[1][-1] = 0.0
+    smoothed[2][-1] = 0.0
+    return MotionProfile(smoothed[0], smoothed[1], smoothed[2], period)
+
+
+def feedforward(config: ProfileConfig, velocity: float, acceleration: float) -> float:
+    """Return the drive output for a profile velocity and acceleration, in [-1, 1]."""
+    output = config.kv * velocity + config.ka * acceleration
+    if velocity != 0.0:
+        output += math.copysign(config.ks, velocity)
+    return max(-1.0, min(1.0, output))
+
+
+class ProfileCache(object):
+    """Generated profiles, by distance and limits, so routines rebuilt with the same drives reuse them."""
+    _profiles: Dict[Tuple[float, float, float, float, float], MotionProfile] = None
+    _misses: int = 0
+
+    def __init__(self):
+        self._profiles = {}
+        self._misses = 0
+
+    def get(self, distance: float, config: ProfileConfig, period: float = PERIOD) -> MotionProfile:
+        """Return the profile over a distance within the limits of a config, generating it the first time.
+
+        Args:
+            distance: Metres, negative to drive backwards.
+            config: Velocity, acceleration and jerk limits, a max_jerk of 0 gives a trapezoid profile.
+            period: Seconds between samples.
+        """
+        key = (distance, config.max_velocity, config.max_acceleration, config.max_jerk, period)
+        profile = self._profiles.get(key)
+        if profile is None:
+            self._misses += 1
+            if config.max_jerk > 0.0:
+                profile = s_curve(distance, config.max_velocity, config.max_acceleration, config.max_jerk, period)
+            else:
+                profile = trapezoid(distance, config.max_velocity, config.max_acceleration, period)
+            self._profiles[key] = profile
+        return profile
+
+    def get_misses(self) -> int:
+        """Return the number of profiles generated so far."""
+        return self._misses
+
+    def clear(self):
+        self._profiles = {}
+        self._misses = 0
+
+
+# Shared by every autonomous routine
+profile_cache = ProfileCache()
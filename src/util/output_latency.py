@@ -0,0 +1,50 @@
+import time
+from typing import Callable, Optional
+
+
+class OutputLatency(object):
+    """Measures the time from an event to the first motor output that follows it.
+
+    The robot calls start() when the event happens, such as autonomousInit,
+    and whatever drives the motors calls record() on every output; only the
+    first one after start() is measured.
+
+    """
+    _clock: Callable[[], float] = None
+    _start: Optional[float] = None
+    _latency_ms: float = 0.0
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._start = None
+        self._latency_ms = 0.0
+
+    def start(self):
+        self._start = self._clock()
+
+    def cancel(self):
+        """Stop waiting for an output, keeping the last measured latency."""
+        self._start = None
+
+    def is_waiting(self) -> bool:
+        return self._start is not None
+
+    def record(self) -> bool:
+        """Mark a motor output.
+
+        Return:
+            True if this was the first output since start().
+        """
+        if self._start is None:
+            return False
+        self._latency_ms = (self._clock() - self._start) * 1000.0
+        self._start = None
+        return True
+
+    def get_latency_ms(self) -> float:
+        """Return the last measured latency in milliseconds."""
+        return self._latency_ms
+
+
+# From autonomousInit to the first drivetrain output, shared by the robot and the drivetrain
+auto_start_latency = OutputLatency()
@@ -0,0 +1,187 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+from util.loop_timer import LatencyHistogram
+
+# Latency-sensitive loops, run on their own Notifier
+CONTROL_GROUP = "control"
+CONTROL_RATE = 200.0
+# The robot loop, which runs the scheduler, the teleop commands and the dashboard
+MAIN_GROUP = "main"
+MAIN_RATE = 50.0
+
+
+class Mailbox(object):
+    """Hands the latest value from one thread to another.
+
+    Values are replaced, never changed in place, so posting one is a single
+    reference assignment: the reader always gets a whole value, the newest
+    one posted, without a lock.
+
+    """
+    _value = None
+
+    def __init__(self, value=None):
+        self._value = value
+
+    def put(self, value):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+
+class RateGroup(object):
+    """Tasks run together at one rate, and the jitter of their ticks.
+
+    Jitter is how far the time between two ticks strays from the period, in
+    milliseconds. It is recorded by the thread ticking the group and may be
+    read by another one, which at worst sees a sample being added.
+
+    """
+    _name: str = ""
+    _period: float = 0.02
+    _threaded: bool = False
+    _tasks: List[Callable[[], None]] = None
+    _jitter: LatencyHistogram = None
+    _last_tick: Optional[float] = None
+    _clock: Callable[[], float] = None
+
+    def __init__(self, name: str, rate: float, threaded: bool, clock: Callable[[], float] = time.perf_counter):
+        """Constructor
+
+        Args:
+            name: Group name, e.g. CONTROL_GROUP.
+            rate: Ticks per second.
+            threaded: Ticked by a Notifier of its own, instead of by the robot loop.
+            clock: Time the ticks are measured with.
+        """
+        self._name = name
+        self._period = 1.0 / rate
+        self._threaded = threaded
+        self._tasks = []
+        self._jitter = LatencyHistogram(0.1, 1000.0 * self._period)
+        self._last_tick = None
+        self._clock = clock
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_period(self) -> float:
+        return self._period
+
+    def is_threaded(self) -> bool:
+        return self._threaded
+
+    def add(self, task: Callable[[], None]):
+        self._tasks.append(task)
+
+    def clear(self):
+        self._tasks = []
+
+    def tick(self):
+        """Record the jitter since the previous tick and run every task."""
+        now = self._clock()
+        if self._last_tick is not None:
+            self._jitter.record(abs(now - self._last_tick - self._period) * 1000.0)
+        self._last_tick = now
+        for task in self._tasks:
+            task()
+
+    def get_jitter(self) -> LatencyHistogram:
+        return self._jitter
+
+    def reset(self):
+        """Clear the jitter, the next tick starts measuring again."""
+        self._jitter.reset()
+        self._last_tick = None
+
+
+class RateExecutor(object):
+    """Runs groups of tasks at different rates.
+
+    Threaded groups each get a Notifier calling their tick() at their rate,
+    the others are ticked by the robot loop. Tasks of a threaded group must
+    only hand data to the robot loop through a Mailbox or other values that
+    are swapped whole.
+
+    """
+    _groups: Dict[str, RateGroup] = None
+    _notifiers: Dict[str, object] = None
+
+    def __init__(self):
+        self._groups = {}
+        self._notifiers = {}
+
+    def add_group(self, name: str, rate: float, threaded: bool) -> RateGroup:
+        group = RateGroup(name, rate, threaded)
+        self._groups[name] = group
+        return group
+
+    def get_group(self, name: str) -> RateGroup:
+        return self._groups[name]
+
+    def add_task(self, name: str, task: Callable[[], None]):
+        """Add a task to a group, before the executor is started."""
+        self._groups[name].add(task)
+
+    def start(self, notifier_factory: Callable):
+        """Start a Notifier for every threaded group.
+
+        Args:
+            notifier_factory: Builds a notifier calling a function, e.g. wpilib.Notifier.
+        """
+        for name, group in self._groups.items():
+            if group.is_threaded() and name not in self._notifiers:
+                notifier = notifier_factory(group.tick)
+                notifier.startPeriodic(group.get_period())
+                self._notifiers[name] = notifier
+
+    def stop(self):
+        for notifier in self._notifiers.values():
+            notifier.stop()
+        self._notifiers = {}
+
+    def clear(self):
+        """Stop the notifiers and drop every task, before the robot is initialised again."""
+        self.stop()
+        for group in self._groups.values():
+            group.clear()
+        self.reset()
+
+    def is_running(self, name: str) -> bool:
+        """Return whether a Notifier ticks the group."""
+        return name in self._notifiers
+
+    def tick(self, name: str):
+        """Tick a group run by the robot loop."""
+        self._groups[name].tick()
+
+    def reset(self):
+        for group in self._groups.values():
+            group.reset()
+
+    def report(self) -> str:
+        """Return the jitter of every group, in milliseconds."""
+        lines = []
+        for name, group in self._groups.items():
+            jitter = group.get_jitter()
+            lines.append("%s: rate=%.0f ticks=%d jitter_mean=%.2f p95=%.2f p99=%.2f max=%.2f" % (
+                name, 1.0 / group.get_period(), jitter.count(), jitter.mean(), jitter.percentile(0.95),
+                jitter.percentile(0.99), jitter.max()))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> bool:
+        """Write the report to a file, returning False if it could not be written."""
+        try:
+            with open(path, "w") as report_file:
+                report_file.write(self.report())
+        except OSError:
+            return False
+        return True
+
+
+# Shared by the robot, which starts it and adds the tasks, and the subsystems checking whether it runs their loops
+control_executor = RateExecutor()
+control_executor.add_group(CONTROL_GROUP, CONTROL_RATE, True)
+control_executor.add_group(MAIN_GROUP, MAIN_RATE, False)
@@ -0,0 +1,64 @@
+from enum import Enum
+from typing import List
+
+from util.config import CurveConfig
+
+
+class CurveSet(Enum):
+    """Enumerates the response curve sets of a controller."""
+    NORMAL = 0
+    MODIFIER = 1
+
+
+class ResponseCurve(object):
+    """A stick response curve compiled into a lookup table.
+
+    The dead band is applied exactly; past it, the stick travel is
+    stretched over [0, 1] and looked up in a table of the curve sampled at
+    evenly spaced points, interpolating linearly between the two nearest
+    entries. The curve is symmetric around zero, so only positive travel is
+    tabled.
+
+    """
+    SEGMENTS = 128
+
+    _dead_band: float = 0.0
+    _stretch: float = 1.0
+    _table: List[float] = None
+
+    def __init__(self, config: CurveConfig, segments: int = SEGMENTS):
+        self._dead_band = config.dead_band
+        # Maps travel past the dead band straight to a table position
+        self._stretch = segments / (1.0 - config.dead_band)
+        self._table = [ResponseCurve._shape(config, i / segments) * config.scale for i in range(segments + 1)]
+        # One extra entry, so full stick interpolates without a bounds check
+        self._table.append(self._table[-1])
+
+    @staticmethod
+    def _shape(config: CurveConfig, travel: float) -> float:
+        if config.shape == "expo":
+            return (1.0 - config.expo) * travel + config.expo * travel ** 3
+        if config.shape == "cubic":
+            return travel ** 3
+        if config.shape == "points":
+            points = config.points
+            for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                if travel <= x1:
+                    return y0 + (y1 - y0) * (travel - x0) / (x1 - x0)
+            return points[-1][1]
+        return travel
+
+    def apply(self, value: float) -> float:
+        """Shape a stick position in [-1, 1]."""
+        magnitude = abs(value) - self._dead_band
+        if magnitude <= 0.0:
+            return 0.0
+        position = magnitude * self._stretch
+        index = int(position)
+        table = self._table
+        if index >= len(table) - 1:
+            output = table[-1]
+        else:
+            low = table[index]
+            output = low + (table[index + 1] - low) * (position - index)
+        return output if value > 0.0 else -output
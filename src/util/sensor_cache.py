@@ -0,0 +1,76 @@
+import time
+from typing import Callable
+
+
+class CachedSensor(object):
+    """One sensor value, read from the device at most once per tick of its SensorCache."""
+    _cache: 'SensorCache' = None
+    _read: Callable[[], float] = None
+    _value: float = 0.0
+    _timestamp: float = 0.0
+    # Tick the value was read in, -1 before the first read
+    _tick: int = -1
+
+    def __init__(self, cache: 'SensorCache', read: Callable[[], float]):
+        self._cache = cache
+        self._read = read
+        self._value = 0.0
+        self._timestamp = 0.0
+        self._tick = -1
+
+    def get(self) -> float:
+        """Return the value of this tick, reading the device on the first call of the tick."""
+        cache = self._cache
+        if self._tick != cache.get_tick():
+            self._value = self._read()
+            self._timestamp = cache.clock()
+            self._tick = cache.get_tick()
+            cache.count_read()
+        return self._value
+
+    def is_fresh(self) -> bool:
+        """Return whether the value was already read in this tick."""
+        return self._tick == self._cache.get_tick()
+
+    def get_timestamp(self) -> float:
+        """Return the clock time of the last device read."""
+        return self._timestamp
+
+    def invalidate(self):
+        """Make the next get() read the device again, e.g. after the device was reset."""
+        self._tick = -1
+
+
+class SensorCache(object):
+    """Serves every sensor read of one robot loop from a single device read.
+
+    A subsystem adds its sensors and starts a new tick at the top of each
+    loop, from its periodic(). Every get() within the tick returns the value
+    read by the first one, with the time it was read, so commands and the
+    subsystem all see the same reading and each bus transaction happens once.
+
+    """
+    _tick: int = 0
+    _reads: int = 0
+    clock: Callable[[], float] = None
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._tick = 0
+        self._reads = 0
+        self.clock = clock
+
+    def add(self, read: Callable[[], float]) -> CachedSensor:
+        return CachedSensor(self, read)
+
+    def next_tick(self):
+        self._tick += 1
+
+    def get_tick(self) -> int:
+        return self._tick
+
+    def count_read(self):
+        self._reads += 1
+
+    def get_reads(self) -> int:
+        """Return the number of device reads so far, across all sensors."""
+        return self._reads
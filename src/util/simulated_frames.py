@@ -0,0 +1,48 @@
+import numpy
+
+
+class SimulatedFrameSource(object):
+    """Generates camera frames for the simulator and tests, in place of a USB camera.
+
+    Frames are BGR images like the ones OpenCV grabs from a camera: a grey
+    background with a bright bar sweeping across it, so a dashboard stream
+    visibly moves. The same preallocated image is redrawn for every frame.
+
+    """
+    BACKGROUND = 64
+    BAR_COLOR = (0, 255, 255)
+
+    _width: int = 0
+    _height: int = 0
+    _bar_width: int = 0
+    _step: int = 0
+    _position: int = 0
+    _frame: numpy.ndarray = None
+
+    def __init__(self, width: int, height: int, step: int = 4):
+        """Create a frame source.
+
+        Args:
+            width: Frame width in pixels.
+            height: Frame height in pixels.
+            step: Pixels the bar moves each frame.
+        """
+        self._width = width
+        self._height = height
+        self._bar_width = max(1, width // 10)
+        self._step = step
+        self._position = 0
+        self._frame = numpy.full((height, width, 3), SimulatedFrameSource.BACKGROUND, dtype=numpy.uint8)
+
+    def next_frame(self) -> numpy.ndarray:
+        """Return the next frame, only valid until the following call."""
+        left = self._position
+        self._frame[:, left:left + self._bar_width] = SimulatedFrameSource.BACKGROUND
+        self._position = (self._position + self._step) % (self._width - self._bar_width + 1)
+        left = self._position
+        self._frame[:, left:left + self._bar_width] = SimulatedFrameSource.BAR_COLOR
+        return self._frame
+
+    def get_position(self) -> int:
+        """Return the column of the left edge of the bar."""
+        return self._position
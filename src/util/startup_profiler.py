@@ -0,0 +1,70 @@
+import contextlib
+import time
+from typing import Callable, List, Tuple
+
+
+class StartupProfiler(object):
+    """Times the named sections of robot startup, such as imports and subsystem construction.
+
+    Sections are kept in the order they were timed, so the report reads like
+    the startup sequence.
+
+    """
+    _clock: Callable[[], float] = None
+    _sections: List[Tuple[str, float]] = None
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._sections = []
+
+    def reset(self):
+        self._sections = []
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        """Time the body of a with statement as one section."""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, (self._clock() - start) * 1000.0)
+
+    def record(self, name: str, duration_ms: float):
+        self._sections.append((name, duration_ms))
+
+    def get_sections(self) -> List[Tuple[str, float]]:
+        """Return (name, duration in milliseconds) of every section, in startup order."""
+        return list(self._sections)
+
+    def get_total_ms(self) -> float:
+        return sum(duration for _, duration in self._sections)
+
+    def report(self) -> str:
+        """Return a human readable breakdown, one section per line."""
+        total = self.get_total_ms()
+        lines = []
+        for name, duration in self._sections:
+            share = duration / total * 100.0 if total else 0.0
+            lines.append("%s: %.3f ms (%.1f%%)" % (name, duration, share))
+        lines.append("total: %.3f ms" % total)
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> bool:
+        """Write the report to a file.
+
+        Return:
+            True if the report was written, False if there was nothing to
+            write or the file could not be written.
+        """
+        if not self._sections:
+            return False
+        try:
+            with open(path, "w") as report_file:
+                report_file.write(self.report())
+        except OSError:
+            return False
+        return True
+
+
+# Shared by robot.py, which times its own imports before anything else is loaded
+startup_profiler = StartupProfiler()
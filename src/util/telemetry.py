@@ -0,0 +1,128 @@
+import time
+from enum import Enum
+from typing import Dict, List
+
+from util.dashboard import publisher
+
+
+class TelemetryKind(Enum):
+    """Enumerates the dashboard value types."""
+    NUMBER = 0
+    BOOLEAN = 1
+    STRING = 2
+
+
+class Telemetry(object):
+    """Registry of dashboard values, each published at its own rate.
+
+    Subsystems register their keys once with a publish rate, then set() values
+    from their hot paths, which only stores the value. flush() is called once
+    at the end of each robot loop and publishes every value that changed since
+    it was last published and whose publish period has elapsed.
+
+    """
+    _sink = None
+    _clock = None
+    _indexes: Dict[str, int] = None
+    _keys: List[str] = None
+    _kinds: List[TelemetryKind] = None
+    _periods: List[float] = None
+    _next_publish: List[float] = None
+    _values: List[object] = None
+    _pending: List[bool] = None
+
+    def __init__(self, sink=publisher, clock=time.monotonic):
+        """Create a Telemetry registry.
+
+        Args:
+            sink: DashboardPublisher the values are flushed to.
+            clock: Function returning the current time in seconds.
+
+        """
+        self._sink = sink
+        self._clock = clock
+        self._indexes = {}
+        self._keys = []
+        self._kinds = []
+        self._periods = []
+        self._next_publish = []
+        self._values = []
+        self._pending = []
+
+    def register(self, key: str, rate_hz: float, value, epsilon: float = 0.0):
+        """Declare a dashboard value, or update the declaration of an existing one.
+
+        Args:
+            key: Dashboard key.
+            rate_hz: Highest rate the value is published at.
+            value: Initial value, its type decides how the value is published.
+            epsilon: Change in a number needed to republish it.
+        """
+        if isinstance(value, bool):
+            kind = TelemetryKind.BOOLEAN
+        elif isinstance(value, str):
+            kind = TelemetryKind.STRING
+        else:
+            kind = TelemetryKind.NUMBER
+            self._sink.set_epsilon(key, epsilon)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = len(self._keys)
+            self._keys.append(key)
+            self._kinds.append(kind)
+            self._periods.append(1.0 / rate_hz)
+            self._next_publish.append(0.0)
+            self._values.append(value)
+            self._pending.append(True)
+        else:
+            self._kinds[index] = kind
+            self._periods[index] = 1.0 / rate_hz
+            self.set(key, value)
+
+    def is_registered(self, key: str) -> bool:
+        return key in self._indexes
+
+    def set(self, key: str, value):
+        """Store a value to be published by the next due flush."""
+        index = self._indexes[key]
+        self._values[index] = value
+        self._pending[index] = True
+
+    def get(self, key: str):
+        """Return the latest value set for a key, published or not."""
+        return self._values[self._indexes[key]]
+
+    def flush(self, now: float = None) -> int:
+        """Publish every pending value whose publish period has elapsed.
+
+        Args:
+            now: Current time in seconds, read from the clock if not given.
+
+        Return:
+            Number of values handed to the dashboard publisher.
+        """
+        if now is None:
+            now = self._clock()
+        flushed = 0
+        for index in range(len(self._keys)):
+            if not self._pending[index] or now < self._next_publish[index]:
+                continue
+            self._pending[index] = False
+            # Schedule from the previous publish so loop jitter does not lower the rate
+            next_publish = self._next_publish[index] + self._periods[index]
+            if next_publish <= now:
+                next_publish = now + self._periods[index]
+            self._next_publish[index] = next_publish
+            kind = self._kinds[index]
+            if kind is TelemetryKind.NUMBER:
+                self._sink.put_number(self._keys[index], self._values[index])
+            elif kind is TelemetryKind.BOOLEAN:
+                self._sink.put_boolean(self._keys[index], self._values[index])
+            else:
+                self._sink.put_string(self._keys[index], self._values[index])
+            flushed += 1
+        return flushed
+
+
+# Shared by the robot and all subsystems
+telemetry = Telemetry()
@@ -0,0 +1,152 @@
+"""Compare the heading controller with the former bang-bang turn on a simulated drivetrain.
+
+Run from src: python -m util.turn_benchmark
+"""
+import argparse
+import math
+import os
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+from util.config import HeadingConfig, read_ini
+from util.heading_controller import HeadingController
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "configs", "subsystems.ini")
+
+
+class TurnModel(object):
+    """Yaw of a drivetrain turning in place.
+
+    The turn rate follows the commanded output with a first order lag, and
+    an output below the static friction does not move a robot standing still.
+    """
+    MAX_RATE = 360.0
+    TIME_CONSTANT = 0.12
+    STATIC_OUTPUT = 0.06
+    STEP = 0.001
+
+    heading: float = 0.0
+    rate: float = 0.0
+
+    def __init__(self, heading: float = 0.0):
+        self.heading = heading
+        self.rate = 0.0
+
+    def run(self, output: float, period: float):
+        """Simulate one loop period at a constant output."""
+        target_rate = output * TurnModel.MAX_RATE
+        if self.rate == 0.0 and abs(output) < TurnModel.STATIC_OUTPUT:
+            target_rate = 0.0
+        blend = 1.0 - math.exp(-TurnModel.STEP / TurnModel.TIME_CONSTANT)
+        for _ in range(int(round(period / TurnModel.STEP))):
+            self.rate += (target_rate - self.rate) * blend
+            self.heading += self.rate * TurnModel.STEP
+
+
+@dataclass(frozen=True)
+class TurnResult(object):
+    # Seconds until the command finished, the timeout if it never did
+    finish_time: float
+    # Seconds until the heading came within the band around the target for good, inf if it never did
+    settle_time: float
+    # Degrees the heading went past the target
+    overshoot: float
+    # Degrees from the target once the robot came to rest
+    final_error: float
+    finished: bool
+
+
+# Returns the turn output and whether the command is finished, from the error, turn rate and loop period
+TurnStep = Callable[[float, float, float], Tuple[float, bool]]
+
+
+def simulate(step: TurnStep, target: float, band: float = 2.0, period: float = 0.02, timeout: float = 3.0,
+             coast: float = 0.5) -> TurnResult:
+    """Turn from heading 0 to target with a command, then let the robot come to rest.
+
+    Args:
+        step: The command under test.
+        target: Target heading in degrees.
+        band: Degrees from the target the heading has to stay within to count as settled.
+        period: Loop period in seconds.
+        timeout: Seconds the command may run for.
+        coast: Seconds simulated after the command finished.
+    """
+    model = TurnModel()
+    direction = math.copysign(1.0, target)
+    overshoot = 0.0
+    # End of the last loop the heading was outside the band
+    outside = 0.0
+    elapsed = 0.0
+    finished = False
+    finish_time = timeout
+    coast_loops = int(round(coast / period))
+    while coast_loops > 0:
+        output = 0.0
+        if finished or elapsed >= timeout - period / 2:
+            coast_loops -= 1
+        else:
+            output, finished = step(target - model.heading, model.rate, period)
+            if finished:
+                finish_time = elapsed
+                output = 0.0
+        model.run(output, period)
+        elapsed += period
+        overshoot = max(overshoot, direction * (model.heading - target))
+        if abs(target - model.heading) > band:
+            outside = elapsed
+    final_error = abs(target - model.heading)
+    return TurnResult(finish_time, outside if final_error <= band else math.inf, overshoot, final_error, finished)
+
+
+def bang_bang(speed: float, threshold: float) -> TurnStep:
+    """The former TurnDegrees: full speed toward the target until within threshold."""
+    def step(error: float, rate: float, period: float) -> Tuple[float, bool]:
+        if abs(error) <= threshold:
+            return 0.0, True
+        return math.copysign(speed, error), False
+    return step
+
+
+def heading_control(config: HeadingConfig, speed: float, tolerance: float) -> TurnStep:
+    controller = HeadingController(config, speed, tolerance)
+
+    def step(error: float, rate: float, period: float) -> Tuple[float, bool]:
+        output = controller.calculate(error, rate, period)
+        return output, controller.is_settled()
+    return step
+
+
+def benchmark(config: HeadingConfig, targets: List[float], speed: float, threshold: float, tolerance: float,
+              band: float) -> List[Tuple[float, TurnResult, TurnResult]]:
+    """Return the (target, bang-bang result, heading controller result) of every target angle."""
+    return [(target, simulate(bang_bang(speed, threshold), target, band),
+             simulate(heading_control(config, speed, tolerance), target, band)) for target in targets]
+
+
+def format_result(result: TurnResult) -> str:
+    return "finish=%.2fs%s settle=%.2fs overshoot=%.1f error=%.1f" % (
+        result.finish_time, "" if result.finished else "(timeout)", result.settle_time, result.overshoot,
+        result.final_error)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmark in-place turns on a simulated drivetrain.")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="subsystems.ini to read [DrivetrainHeading] from")
+    parser.add_argument("--speed", type=float, default=0.7, help="turn speed")
+    parser.add_argument("--threshold", type=float, default=5.0, help="bang-bang threshold in degrees")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="heading controller tolerance in degrees")
+    parser.add_argument("--band", type=float, default=2.0,
+                        help="degrees from the target a turn has to stay within to count as settled")
+    parser.add_argument("targets", nargs="*", type=float, default=[10.0, 30.0, 45.0, 90.0, 180.0, -90.0],
+                        help="target angles in degrees")
+    args = parser.parse_args(argv)
+
+    config = HeadingConfig.from_parser(read_ini(args.config))
+    for target, old, new in benchmark(config, args.targets, args.speed, args.threshold, args.tolerance,
+                                   args.band):
+        print("%7.1f  bang-bang: %s  pid: %s" % (target, format_result(old), format_result(new)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import math
+import time
+from typing import List, Optional, Tuple
+
+import numpy
+
+from util.config import VisionConfig
+from util.frame_buffer import SharedFrameBuffer
+from util.vision_results import SharedVisionResults, VisionResult
+
+
+class TargetPipeline(object):
+    """Finds the retroreflective target in a BGR frame with numpy only.
+
+    Pixels inside the configured color bounds are thresholded into a mask.
+    The mask is reduced to per column pixel counts, runs of adjacent
+    non-empty columns form the target candidates, and the candidate with the
+    most pixels is the target if it has at least min_area of them. Its
+    centroid gives the angle and its height in pixels the distance.
+
+    """
+    _config: VisionConfig = None
+    _width: int = 0
+    _height: int = 0
+    _focal_length: float = 0.0
+    _lower: numpy.ndarray = None
+    _upper: numpy.ndarray = None
+    _columns: numpy.ndarray = None
+    _mask: numpy.ndarray = None
+    _channel_mask: numpy.ndarray = None
+
+    def __init__(self, width: int, height: int, config: VisionConfig):
+        self._config = config
+        self._width = width
+        self._height = height
+        # In pixels, the same horizontally and vertically for square pixels
+        self._focal_length = width / 2.0 / math.tan(math.radians(config.field_of_view / 2.0))
+        self._lower = numpy.array(config.lower, numpy.uint8)
+        self._upper = numpy.array(config.upper, numpy.uint8)
+        self._columns = numpy.arange(width)
+        self._mask = numpy.empty((height, width), bool)
+        self._channel_mask = numpy.empty((height, width), bool)
+
+    def process(self, frame: numpy.ndarray) -> Optional[Tuple[float, float]]:
+        """Look for the target.
+
+        Args:
+            frame: BGR frame, height x width x 3.
+
+        Return:
+            (angle in degrees, positive to the right, distance in meters), or None without a target.
+        """
+        mask = self._threshold(frame)
+        counts = numpy.count_nonzero(mask, axis=0)
+        # Starts and ends of the runs of occupied columns
+        edges = numpy.flatnonzero(numpy.diff(numpy.concatenate(([0], counts > 0, [0])).astype(numpy.int8)))
+        if not len(edges):
+            return None
+        starts, ends = edges[::2], edges[1::2]
+        totals = numpy.concatenate(([0], numpy.cumsum(counts)))
+        areas = totals[ends] - totals[starts]
+        best = int(numpy.argmax(areas))
+        area = int(areas[best])
+        if area < self._config.min_area:
+            return None
+        start, end = starts[best], ends[best]
+        center_x = float(numpy.dot(counts[start:end], self._columns[start:end])) / area + 0.5
+        rows = numpy.flatnonzero(mask[:, start:end].any(axis=1))
+        pixel_height = rows[-1] - rows[0] + 1
+        angle = math.degrees(math.atan((center_x - self._width / 2.0) / self._focal_length))
+        return angle, self._config.target_height * self._focal_length / pixel_height
+
+    def _threshold(self, frame: numpy.ndarray) -> numpy.ndarray:
+        """Mark the pixels inside the color bounds, reusing the same mask arrays for every frame."""
+        mask = self._mask
+        mask.fill(True)
+        for channel in range(3):
+            plane = frame[:, :, channel]
+            numpy.greater_equal(plane, self._lower[channel], out=self._channel_mask)
+            mask &= self._channel_mask
+            numpy.less_equal(plane, self._upper[channel], out=self._channel_mask)
+            mask &= self._channel_mask
+        return mask
+
+
+class RecordedFrameSource(object):
+    """Plays back recorded camera images, to test the vision pipeline without a camera.
+
+    Images are .npy arrays or any image file OpenCV reads, in BGR order.
+
+    """
+    _frames: List[numpy.ndarray] = None
+    _index: int = 0
+
+    def __init__(self, paths: List[str]):
+        self._frames = [RecordedFrameSource._load(path) for path in sorted(paths)]
+        if not self._frames:
+            raise ValueError("No recorded images")
+        self._index = 0
+
+    @staticmethod
+    def _load(path: str) -> numpy.ndarray:
+        if path.endswith(".npy"):
+            frame = numpy.load(path)
+        else:
+            import cv2
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+        if frame is None or frame.ndim != 3 or frame.shape[2] != 3:
+            raise ValueError("Not a color image: %s" % path)
+        return frame.astype(numpy.uint8, copy=False)
+
+    def get_size(self) -> Tuple[int, int]:
+        """Return (width, height) of the first image."""
+        height, width, _ = self._frames[0].shape
+        return width, height
+
+    def __len__(self):
+        return len(self._frames)
+
+    def next_frame(self) -> numpy.ndarray:
+        """Return the next image, starting over after the last one."""
+        frame = self._frames[self._index]
+        self._index = (self._index + 1) % len(self._frames)
+        return frame
+
+
+class VisionWorker(object):
+    """Runs the pipeline on the frames of a frame buffer and publishes the results."""
+    # Seconds to wait when there is no new frame
+    IDLE_SLEEP = 0.005
+
+    _frames: SharedFrameBuffer = None
+    _results: SharedVisionResults = None
+    _pipeline: TargetPipeline = None
+    _dropped: int = 0
+
+    def __init__(self, frames: SharedFrameBuffer, results: SharedVisionResults, pipeline: TargetPipeline):
+        self._frames = frames
+        self._results = results
+        self._pipeline = pipeline
+        self._dropped = 0
+
+    def step(self) -> bool:
+        """Process the latest frame, if there is a new one.
+
+        Return:
+            True if a result was published.
+        """
+        latest = self._frames.read_latest()
+        if latest is None:
+            return False
+        sequence, timestamp, frame = latest
+        target = self._pipeline.process(frame)
+        # The camera wrote over the frame while it was processed
+        if not self._frames.is_intact():
+            self._dropped += 1
+            return False
+        if target is None:
+            self._results.publish(VisionResult(sequence, timestamp))
+        else:
+            self._results.publish(VisionResult(sequence, timestamp, True, target[0], target[1]))
+        return True
+
+    def run(self, keep_running=lambda: True):
+        while keep_running():
+            if not self.step():
+                time.sleep(VisionWorker.IDLE_SLEEP)
+
+    def get_dropped(self) -> int:
+        """Return the number of frames overwritten while they were processed."""
+        return self._dropped
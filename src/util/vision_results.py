@@ -0,0 +1,143 @@
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Optional
+
+# Shared memory block names, created by the robot and attached to by the camera and vision processes
+FRAMES_NAME = "team94_frames"
+RESULTS_NAME = "team94_vision"
+
+# Blocks created by this process, which its resource tracker removes when it exits
+_created = set()
+
+
+def create_shared_memory(name: str, size: int) -> shared_memory.SharedMemory:
+    """Create a shared memory block, replacing one left over by a previous run of the robot code."""
+    try:
+        memory = shared_memory.SharedMemory(name, create=True, size=size)
+    except FileExistsError:
+        stale = shared_memory.SharedMemory(name)
+        stale.close()
+        stale.unlink()
+        memory = shared_memory.SharedMemory(name, create=True, size=size)
+    _created.add(memory.name)
+    return memory
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to a shared memory block created by another process.
+
+    The block is left to the process that created it: otherwise the
+    resource tracker of this process would remove it when this process
+    exits, under the other processes still using it.
+
+    Raises:
+        FileNotFoundError: No block with that name exists.
+    """
+    memory = shared_memory.SharedMemory(name)
+    if memory.name not in _created:
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+@dataclass(frozen=True)
+class VisionResult(object):
+    """What the vision process found in one camera frame."""
+    # Number of the frame in the frame buffer, 0 before the first result
+    sequence: int = 0
+    # time.monotonic() when the frame was captured
+    timestamp: float = 0.0
+    found: bool = False
+    # Degrees from the camera axis to the target, positive to the right
+    angle: float = 0.0
+    # Meters to the target
+    distance: float = 0.0
+
+
+class SharedVisionResults(object):
+    """The latest VisionResult, published by the vision process and read by the robot loop.
+
+    The result lives in a few bytes of shared memory guarded by a sequence
+    lock: the writer makes the lock odd while it writes and even again when
+    done, and the reader retries when the lock was odd or changed while it
+    read. Neither side ever blocks the other.
+
+    """
+    # (lock, sequence, timestamp, found, angle, distance)
+    FORMAT = "<IIdBff"
+    SIZE = struct.calcsize(FORMAT)
+    READ_ATTEMPTS = 3
+
+    _memory: Optional[shared_memory.SharedMemory] = None
+    _owner: bool = False
+    _max_age: float = 0.5
+    _last: VisionResult = VisionResult()
+
+    def __init__(self):
+        self._memory = None
+        self._owner = False
+        self._last = VisionResult()
+
+    def create(self, name: str = RESULTS_NAME, max_age: float = 0.5):
+        """Create the shared block, done by the robot before starting the vision process.
+
+        Args:
+            name: Shared memory block name.
+            max_age: Seconds after its capture a target is used for by get_target().
+        """
+        self.close()
+        self._memory = create_shared_memory(name, SharedVisionResults.SIZE)
+        self._memory.buf[:SharedVisionResults.SIZE] = bytes(SharedVisionResults.SIZE)
+        self._owner = True
+        self._max_age = max_age
+        self._last = VisionResult()
+
+    def attach(self, name: str = RESULTS_NAME):
+        """Attach to the block created by the robot, done by the vision process."""
+        self.close()
+        self._memory = attach_shared_memory(name)
+        self._owner = False
+
+    def close(self):
+        """Detach from the block, removing it if this side created it."""
+        if self._memory is not None:
+            self._memory.close()
+            if self._owner:
+                self._memory.unlink()
+            self._memory = None
+
+    def is_open(self) -> bool:
+        return self._memory is not None
+
+    def publish(self, result: VisionResult):
+        buf = self._memory.buf
+        lock = struct.unpack_from("<I", buf)[0] + 1
+        struct.pack_into("<I", buf, 0, lock)
+        struct.pack_into(SharedVisionResults.FORMAT, buf, 0, lock, result.sequence, result.timestamp,
+                         result.found, result.angle, result.distance)
+        struct.pack_into("<I", buf, 0, lock + 1)
+
+    def read(self) -> VisionResult:
+        """Return the latest result, or the previous one read if the writer kept getting in the way."""
+        if self._memory is None:
+            return self._last
+        buf = self._memory.buf
+        for _ in range(SharedVisionResults.READ_ATTEMPTS):
+            lock, sequence, timestamp, found, angle, distance = struct.unpack_from(SharedVisionResults.FORMAT, buf)
+            if lock % 2 == 0 and struct.unpack_from("<I", buf)[0] == lock:
+                if sequence != self._last.sequence:
+                    self._last = VisionResult(sequence, timestamp, bool(found), angle, distance)
+                break
+        return self._last
+
+    def get_target(self, clock: Callable[[], float] = time.monotonic) -> Optional[VisionResult]:
+        """Return the latest result if it found a target in a frame captured recently enough, else None."""
+        result = self.read()
+        if not result.found or clock() - result.timestamp > self._max_age:
+            return None
+        return result
+
+
+# Read by the robot loop and the commands aiming at the target
+vision_results = SharedVisionResults()
@@ -0,0 +1,77 @@
+"""Vision process, started by the Vision subsystem.
+
+Finds the target in the frames the camera process leaves in shared memory
+and publishes the results back to the robot through shared memory, so the
+image processing never competes with the robot loop for the GIL.
+
+Run with image files to try the pipeline on a laptop, without a camera or
+the robot code:
+
+    python vision_worker.py recorded/*.png
+
+"""
+import os
+import sys
+import threading
+import time
+
+from util.config import read_config
+from util.frame_buffer import SharedFrameBuffer
+from util.vision_pipeline import RecordedFrameSource, TargetPipeline, VisionWorker
+from util.vision_results import SharedVisionResults
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs")
+RECORDED_FRAMES_NAME = "team94_recorded_frames"
+RECORDED_RESULTS_NAME = "team94_recorded_vision"
+
+
+def main():
+    """Serve the robot until the robot code exits."""
+    config = read_config(CONFIG_DIR).vision
+    parent = os.getppid()
+    frames = SharedFrameBuffer.attach()
+    results = SharedVisionResults()
+    results.attach()
+    width, height = frames.get_size()
+    worker = VisionWorker(frames, results, TargetPipeline(width, height, config))
+    worker.run(lambda: os.getppid() == parent)
+
+
+def run_recorded(paths, fps: float = 15.0):
+    """Feed recorded images through shared memory at the camera frame rate and print every result."""
+    config = read_config(CONFIG_DIR).vision
+    source = RecordedFrameSource(paths)
+    width, height = source.get_size()
+    frames = SharedFrameBuffer.create(width, height, RECORDED_FRAMES_NAME)
+    results = SharedVisionResults()
+    results.create(RECORDED_RESULTS_NAME)
+    stop = threading.Event()
+
+    def capture():
+        for _ in range(len(source)):
+            frames.begin_write()[:] = source.next_frame()
+            frames.commit(time.monotonic())
+            stop.wait(1.0 / fps)
+        stop.set()
+
+    capture_thread = threading.Thread(target=capture, name="RecordedCapture")
+    capture_thread.start()
+    worker = VisionWorker(frames, results, TargetPipeline(width, height, config))
+    while not stop.is_set():
+        if worker.step():
+            result = results.read()
+            print("frame %d: found %s, angle %.2f, distance %.2f, latency %.1f ms" % (
+                result.sequence, result.found, result.angle, result.distance,
+                (time.monotonic() - result.timestamp) * 1000.0))
+        else:
+            time.sleep(VisionWorker.IDLE_SLEEP)
+    capture_thread.join()
+    results.close()
+    frames.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_recorded(sys.argv[1:])
+    else:
+        main()
@@ -0,0 +1,7 @@
+import pytest
+from fake_clock import FakeClock
+
+
+@pytest.fixture(scope="function")
+def clock():
+    return FakeClock()
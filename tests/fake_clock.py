@@ -0,0 +1,6 @@
+class FakeClock(object):
+    """Clock for the time sources the util classes take, returning whatever the test set now to."""
+    now = 0.0
+
+    def __call__(self):
+        return self.now
@@ -0,0 +1,36 @@
+import pytest
+from commands.autonomous import DriveToWall, MoveFromLine, check_drive
+from commands.drive_time import DriveTime
+from commands.profiled_drive import ProfiledDrive
+from subsystems.drivetrain import Drivetrain
+from util.config import AutonomousProgramConfig, DrivetrainConfig, read_ini
+from util.motion_profile import trapezoid
+
+
+@pytest.fixture(scope="function")
+def drivetrain_default(robot):
+    config = DrivetrainConfig.from_parser(read_ini('../tests/test_configs/drivetrain_default.ini'))
+    robot.drivetrain = Drivetrain(robot, None, config)
+    return robot.drivetrain
+
+
+def test_check_timed_drive(robot, drivetrain_default):
+    assert check_drive(robot, DriveTime(robot, 0.2, 0.5)) == ""
+    assert check_drive(robot, DriveTime(robot, 0.0, 0.5)) == "Zero DRIVE_TIME or DRIVE_SPEED"
+    assert check_drive(robot, DriveTime(robot, 0.2, 0.0)) == "Zero DRIVE_TIME or DRIVE_SPEED"
+
+
+def test_check_profiled_drive(robot, drivetrain_default):
+    assert check_drive(robot, ProfiledDrive(robot, trapezoid(1.0, 2.0, 2.0))) == ""
+    assert check_drive(robot, ProfiledDrive(robot, trapezoid(0.0, 2.0, 2.0))) == "Empty drive profile"
+
+
+def test_check_program(robot, drivetrain_default):
+    assert MoveFromLine(robot, AutonomousProgramConfig(0.5, 0.2)).check() == ""
+    program = DriveToWall(robot, AutonomousProgramConfig(0.5, 0.0))
+    assert program.check() == "Zero DRIVE_TIME or DRIVE_SPEED"
+    # A reloaded config arms the program again
+    program.apply_config(AutonomousProgramConfig(0.5, 0.2))
+    assert program.check() == ""
+    robot.drivetrain = None
+    assert program.check() == "No drivetrain"
@@ -0,0 +1,84 @@
+import pytest
+from util.button_manager import ButtonManager
+from util.input_snapshot import InputSnapshot
+
+
+class MockCommand(object):
+    def __init__(self):
+        self.events = []
+
+    def start(self):
+        self.events.append("start")
+
+    def cancel(self):
+        self.events.append("cancel")
+
+
+@pytest.fixture(scope="function")
+def snapshot_default():
+    return InputSnapshot(2)
+
+
+@pytest.fixture(scope="function")
+def manager_default():
+    return ButtonManager(2)
+
+
+def press(snapshot, manager, controller, buttons):
+    snapshot.set_controller(controller, 0.0, 0.0, 0.0, 0.0, -1, buttons)
+    snapshot.next_loop()
+    manager.update(snapshot)
+
+
+@pytest.mark.parametrize("event,on_press,on_release", [
+    (ButtonManager.PRESSED, ["start"], ["start"]),
+    (ButtonManager.RELEASED, [], ["start"]),
+    (ButtonManager.HELD, ["start"], ["start", "cancel"]),
+])
+def test_button_edges(snapshot_default, manager_default, event, on_press, on_release):
+    command = MockCommand()
+    manager_default.bind(1, 2, event, command)
+    press(snapshot_default, manager_default, 1, 0b10)
+    press(snapshot_default, manager_default, 1, 0b10)
+    assert command.events == on_press
+    press(snapshot_default, manager_default, 1, 0b0)
+    press(snapshot_default, manager_default, 1, 0b0)
+    assert command.events == on_release
+
+
+def test_button_edges_only(snapshot_default, manager_default):
+    command = MockCommand()
+    manager_default.bind(0, 1, ButtonManager.PRESSED, command)
+    press(snapshot_default, manager_default, 0, 0b1)
+    press(snapshot_default, manager_default, 0, 0b1)
+    assert command.events == ["start"]
+    assert manager_default.get_held(0) == 0b1
+    press(snapshot_default, manager_default, 0, 0b0)
+    press(snapshot_default, manager_default, 0, 0b1)
+    assert command.events == ["start", "start"]
+
+
+def test_button_unbound_ignored(snapshot_default, manager_default):
+    command = MockCommand()
+    manager_default.bind(0, 3, ButtonManager.HELD, command)
+    # Other buttons and the other controller never dispatch
+    press(snapshot_default, manager_default, 0, 0b11)
+    press(snapshot_default, manager_default, 1, 0b100)
+    assert command.events == []
+    assert manager_default.get_held(0) == 0
+
+
+def test_button_several_edges(snapshot_default, manager_default):
+    first = MockCommand()
+    second = MockCommand()
+    third = MockCommand()
+    manager_default.bind(0, 1, ButtonManager.HELD, first)
+    manager_default.bind(0, 4, ButtonManager.PRESSED, second)
+    manager_default.bind(0, 4, ButtonManager.RELEASED, third)
+    press(snapshot_default, manager_default, 0, 0b1001)
+    assert first.events == ["start"]
+    assert second.events == ["start"]
+    press(snapshot_default, manager_default, 0, 0b0)
+    assert first.events == ["start", "cancel"]
+    assert second.events == ["start"]
+    assert third.events == ["start"]
@@ -0,0 +1,69 @@
+import pytest
+from fake_clock import FakeClock
+from util.camera_throttle import CpuBudget, FpsThrottle
+
+
+@pytest.fixture(scope="function")
+def throttle_default():
+    return FpsThrottle(16, 3, window_loops=10, recover_windows=2)
+
+
+def run_window(throttle, overruns, loops=10):
+    fps = 0
+    for _ in range(loops):
+        fps = throttle.update(overruns)
+    return fps
+
+
+def test_throttle_default(throttle_default):
+    assert throttle_default.get_fps() == 16
+    assert run_window(throttle_default, 0) == 16
+
+
+def test_throttle_overruns(throttle_default):
+    assert run_window(throttle_default, 1) == 8
+    # The same count is not a new overrun
+    assert run_window(throttle_default, 1) == 8
+    assert run_window(throttle_default, 2) == 4
+    assert run_window(throttle_default, 5) == 3
+    assert run_window(throttle_default, 9) == 3
+
+
+def test_throttle_recover(throttle_default):
+    run_window(throttle_default, 1)
+    assert run_window(throttle_default, 1) == 8
+    assert run_window(throttle_default, 1) == 9
+    assert run_window(throttle_default, 1) == 10
+    # An overrun restarts the wait for recovery
+    assert run_window(throttle_default, 2) == 5
+    assert run_window(throttle_default, 2) == 5
+    for _ in range(20):
+        run_window(throttle_default, 2)
+    assert throttle_default.get_fps() == 16
+
+
+def test_throttle_counter_reset(throttle_default):
+    run_window(throttle_default, 4)
+    assert run_window(throttle_default, 0) == 8
+    assert run_window(throttle_default, 1) == 4
+
+
+@pytest.fixture(scope="function")
+def clocks():
+    return FakeClock(), FakeClock()
+
+
+def test_cpu_budget(clocks):
+    clock, cpu_clock = clocks
+    budget = CpuBudget(0.25, 20, 4, clock, cpu_clock)
+    assert budget.update() == 20
+    clock.now, cpu_clock.now = 1.0, 0.5
+    assert budget.update() == 10
+    assert budget.get_usage() == pytest.approx(0.5)
+    clock.now, cpu_clock.now = 2.0, 1.5
+    assert budget.update() == 4
+    clock.now, cpu_clock.now = 3.0, 1.6
+    assert budget.update() == 5
+    # Close to the budget the frame rate holds
+    clock.now, cpu_clock.now = 4.0, 1.83
+    assert budget.update() == 5
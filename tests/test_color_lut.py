@@ -0,0 +1,62 @@
+import pytest
+from util.color_lut import ColorLookup, PanelColor, next_color, sensor_color
+from util.config import ControlPanelConfig
+
+REFERENCES = {PanelColor.BLUE: ControlPanelConfig.blue, PanelColor.GREEN: ControlPanelConfig.green,
+              PanelColor.RED: ControlPanelConfig.red, PanelColor.YELLOW: ControlPanelConfig.yellow}
+
+
+@pytest.fixture(scope="function")
+def lookup_default():
+    return ColorLookup(REFERENCES, 0.1)
+
+
+def nearest(red, green, blue, max_distance=0.1):
+    best, best_distance = PanelColor.UNKNOWN, max_distance * max_distance
+    for color, (r, g, b) in REFERENCES.items():
+        distance = (red - r) ** 2 + (green - g) ** 2 + (blue - b) ** 2
+        if distance < best_distance:
+            best, best_distance = color, distance
+    return best
+
+
+def test_lookup_references(lookup_default):
+    for color, reference in REFERENCES.items():
+        assert lookup_default.classify(*reference) is color
+
+
+def test_lookup_unknown(lookup_default):
+    assert lookup_default.classify(0.33, 0.33, 0.33) is PanelColor.UNKNOWN
+    assert lookup_default.classify(0.0, 0.0, 0.0) is PanelColor.UNKNOWN
+    assert lookup_default.classify(1.0, 1.0, 1.0) is PanelColor.UNKNOWN
+
+
+def test_lookup_matches_distance(lookup_default):
+    # The cube only disagrees with the distance math it replaces near the edges of its cells
+    mismatches = 0
+    samples = 0
+    for r in range(0, 64):
+        for g in range(0, 64):
+            red, green = (r + 0.5) / 64, (g + 0.5) / 64
+            blue = 1.0 - red - green
+            if blue < 0.0:
+                continue
+            samples += 1
+            if lookup_default.classify(red, green, blue) is not nearest(red, green, blue):
+                mismatches += 1
+    assert mismatches / samples < 0.05
+
+
+def test_game_message():
+    assert PanelColor.from_game_message("B") is PanelColor.BLUE
+    assert PanelColor.from_game_message("Y") is PanelColor.YELLOW
+    assert PanelColor.from_game_message("") is PanelColor.UNKNOWN
+    assert PanelColor.from_game_message("X") is PanelColor.UNKNOWN
+
+
+def test_wheel_order():
+    assert next_color(PanelColor.RED, 1) is PanelColor.GREEN
+    assert next_color(PanelColor.RED, -1) is PanelColor.YELLOW
+    assert sensor_color(PanelColor.BLUE) is PanelColor.RED
+    assert sensor_color(PanelColor.GREEN) is PanelColor.YELLOW
+    assert sensor_color(PanelColor.UNKNOWN) is PanelColor.UNKNOWN
@@ -0,0 +1,102 @@
+import pytest
+from util.command_profiler import CommandMethod, CommandProfiler, InstrumentedCommand, profiler
+
+
+class FakeCommand(object):
+    def __init__(self, name):
+        self._name = name
+
+    def getName(self):
+        return self._name
+
+    def initialize(self):
+        pass
+
+    def execute(self):
+        pass
+
+
+class ProfiledCommand(InstrumentedCommand, FakeCommand):
+    def execute(self):
+        return "executed"
+
+    def isFinished(self):
+        return True
+
+
+@pytest.fixture(scope="function")
+def profiler_default():
+    return CommandProfiler()
+
+
+@pytest.fixture(scope="function")
+def shared_profiler():
+    profiler.reset()
+    profiler.set_mode("teleop")
+    yield profiler
+    profiler.enabled = False
+    profiler.reset()
+    profiler.set_mode("disabled")
+
+
+def test_profiler_default(profiler_default):
+    assert profiler_default.enabled is False
+    assert profiler_default.get_mode() == "disabled"
+    assert profiler_default.get_modes() == []
+
+
+def test_profiler_record(profiler_default):
+    profiler_default.set_mode("teleop")
+    profiler_default.record("TankDrive", CommandMethod.EXECUTE, 0.002)
+    profiler_default.record("TankDrive", CommandMethod.EXECUTE, 0.001)
+    profiler_default.record("TankDrive", CommandMethod.IS_FINISHED, 0.0005)
+    profiler_default.set_mode("autonomous")
+    profiler_default.record("DriveTime", CommandMethod.INITIALIZE, 0.003)
+    assert profiler_default.get_modes() == ["teleop", "autonomous"]
+    assert profiler_default.get_names("teleop") == ["TankDrive"]
+    assert profiler_default.get_count("teleop", "TankDrive", CommandMethod.EXECUTE) == 2
+    assert profiler_default.get_total_ms("teleop", "TankDrive", CommandMethod.EXECUTE) == pytest.approx(3.0)
+    assert profiler_default.get_max_ms("teleop", "TankDrive", CommandMethod.EXECUTE) == pytest.approx(2.0)
+    assert profiler_default.get_mode_total_ms("teleop", "TankDrive") == pytest.approx(3.5)
+    assert profiler_default.get_count("teleop", "DriveTime", CommandMethod.INITIALIZE) == 0
+    assert profiler_default.get_count("autonomous", "DriveTime", CommandMethod.INITIALIZE) == 1
+
+
+def test_profiler_memory_is_bounded(profiler_default):
+    for _ in range(1000):
+        profiler_default.record("TankDrive", CommandMethod.EXECUTE, 0.001)
+    stats = profiler_default._stats["disabled"]["TankDrive"]
+    assert len(stats) == len(CommandMethod) * 3
+    assert profiler_default.get_count("disabled", "TankDrive", CommandMethod.EXECUTE) == 1000
+
+
+def test_profiler_report(profiler_default, tmp_path):
+    path = tmp_path / "command_profile.txt"
+    assert profiler_default.dump(str(path)) is False
+    profiler_default.set_mode("teleop")
+    profiler_default.record("MoveWinch", CommandMethod.EXECUTE, 0.001)
+    profiler_default.record("TankDrive", CommandMethod.EXECUTE, 0.002)
+    assert profiler_default.dump(str(path)) is True
+    lines = path.read_text().splitlines()
+    assert lines[0] == "[teleop]"
+    assert lines[1].startswith("TankDrive: total=2.000")
+    assert lines[2].startswith("MoveWinch: total=1.000")
+
+
+def test_instrumented_command_disabled(shared_profiler):
+    command = ProfiledCommand("Profiled")
+    assert command.execute() == "executed"
+    assert shared_profiler.get_modes() == []
+
+
+def test_instrumented_command_enabled(shared_profiler):
+    shared_profiler.enabled = True
+    command = ProfiledCommand("Profiled")
+    assert command.execute() == "executed"
+    assert command.isFinished() is True
+    command.initialize()
+    assert shared_profiler.get_count("teleop", "Profiled", CommandMethod.EXECUTE) == 1
+    assert shared_profiler.get_count("teleop", "Profiled", CommandMethod.IS_FINISHED) == 1
+    # initialize is inherited from the base class rather than defined by the command
+    assert shared_profiler.get_count("teleop", "Profiled", CommandMethod.INITIALIZE) == 0
+    assert ProfiledCommand.execute.__name__ == "execute"
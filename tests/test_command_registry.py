@@ -0,0 +1,46 @@
+import pytest
+from util.command_registry import CommandRegistry
+
+
+@pytest.fixture(scope="function")
+def registry_default():
+    registry = CommandRegistry()
+    registry.register("Stopwatch", "util.stopwatch:Stopwatch")
+    registry.register("Fraction", "fractions:Fraction")
+    return registry
+
+
+def test_registry_default(registry_default):
+    assert registry_default.get_names() == ["Stopwatch", "Fraction"]
+    assert registry_default.is_loaded("Stopwatch") is False
+
+
+def test_get(registry_default):
+    from util.stopwatch import Stopwatch
+    assert registry_default.get("Stopwatch") is Stopwatch
+    assert registry_default.is_loaded("Stopwatch") is True
+
+
+def test_create(registry_default):
+    fraction = registry_default.create("Fraction", 1, 4)
+    assert fraction * 4 == 1
+
+
+def test_import_on_first_use(registry_default):
+    # Registering never imports, so a missing module only fails when the command is built
+    registry_default.register("Missing", "commands.missing:Missing")
+    with pytest.raises(ImportError):
+        registry_default.create("Missing")
+
+
+def test_unknown(registry_default):
+    with pytest.raises(KeyError):
+        registry_default.get("TurnDegrees")
+
+
+def test_register_again(registry_default):
+    registry_default.get("Fraction")
+    registry_default.register("Fraction", "util.stopwatch:Stopwatch")
+    assert registry_default.is_loaded("Fraction") is False
+    from util.stopwatch import Stopwatch
+    assert registry_default.get("Fraction") is Stopwatch
@@ -0,0 +1,315 @@
+import dataclasses
+import os
+
+import pytest
+import util.config
+from util.config import AutonomousConfig, AutonomousProgramConfig, ButtonCommandConfig, CameraConfig, ClimbingConfig, ConfigError, ConfigService, CurveConfig, \
+    DeviceConfig, DrivetrainConfig, HeadingConfig, JoysticksConfig, ProfileConfig, RobotConfig, ShooterConfig, VisionConfig, parse_ini, read_config, read_config_cached, read_ini
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "configs")
+TEST_CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_configs")
+
+DRIVETRAIN = """
+[DrivetrainGeneral]
+MAX_SPEED: 0.7
+DPAD_SCALING: 0.4
+
+[DrivetrainLeftMotor]
+ENABLED: True
+CHANNEL: 0
+INVERTED: True
+
+[DrivetrainRightMotor]
+ENABLED: True
+CHANNEL: 1
+INVERTED: False
+
+[DrivetrainGyro]
+ENABLED: False
+"""
+
+
+def test_read_config():
+    config = read_config(CONFIG_DIR)
+    assert config.drivetrain.max_speed == 0.7
+    assert config.drivetrain.left_motor == DeviceConfig(True, 0, True)
+    assert config.drivetrain.gyro.enabled is False
+    assert config.climbing.limit_switch == DeviceConfig(True, 0, True)
+    assert config.vacuum.motor.channel == 5
+    assert config.shooter.solenoid == DeviceConfig(True, 0, False)
+    assert config.joysticks.axes["RIGHTY"] == 5
+    assert config.joysticks.buttons["RIGHTBUMPER"] == 6
+    assert [controller.port for controller in config.joysticks.controllers] == [0, 1]
+    assert config.joysticks.controllers[0].dead_zone == 0.05
+    assert config.autonomous.move_from_line.drive_time == 0.2
+    assert config.autonomous.move_from_line.wait_time == 0.0
+    assert config.autonomous.dead_reckoning_score.wait_time == 0.5
+    assert config.autonomous.move_from_line.drive_distance == 0.0
+    assert config.autonomous.drive_to_wall.drive_distance == 0.0
+
+
+def test_read_config_missing(tmp_path):
+    with pytest.raises(ConfigError):
+        read_config(str(tmp_path))
+
+
+def test_heading_config():
+    assert read_config(CONFIG_DIR).drivetrain.heading == HeadingConfig()
+    # Every gain missing from [DrivetrainHeading] keeps its default
+    heading = DrivetrainConfig.from_parser(parse_ini(DRIVETRAIN + "[DrivetrainHeading]\nKP: 0.05\n")).heading
+    assert heading == HeadingConfig(kp=0.05)
+    with pytest.raises(ConfigError):
+        DrivetrainConfig.from_parser(parse_ini(DRIVETRAIN + "[DrivetrainHeading]\nKD: -0.1\n"))
+
+
+def test_profile_config():
+    assert read_config(CONFIG_DIR).drivetrain.profile == ProfileConfig()
+    profile = DrivetrainConfig.from_parser(parse_ini(DRIVETRAIN + "[DrivetrainProfile]\nMAX_JERK: 0\n")).profile
+    assert profile == ProfileConfig(max_jerk=0.0)
+    # Velocity and acceleration limits have to be positive
+    for key in ["MAX_VELOCITY: 0", "MAX_ACCELERATION: 0", "KV: -0.1"]:
+        with pytest.raises(ConfigError):
+            DrivetrainConfig.from_parser(parse_ini(DRIVETRAIN + "[DrivetrainProfile]\n%s\n" % key))
+
+
+def test_config_frozen():
+    config = DrivetrainConfig.from_parser(parse_ini(DRIVETRAIN))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.max_speed = 1.0
+    joysticks = JoysticksConfig.from_parser(read_ini(os.path.join(CONFIG_DIR, "joysticks.ini")))
+    with pytest.raises(TypeError):
+        joysticks.axes["LEFTX"] = 3
+
+
+def test_drivetrain_config():
+    config = DrivetrainConfig.from_parser(parse_ini(DRIVETRAIN))
+    assert config == DrivetrainConfig(0.7, 0.4, DeviceConfig(True, 0, True), DeviceConfig(True, 1, False),
+                                      DeviceConfig())
+
+
+@pytest.mark.parametrize("name", ["drivetrain_default", "drivetrain_left_disabled", "drivetrain_zero_speed"])
+def test_drivetrain_test_configs(name):
+    with open(os.path.join(TEST_CONFIG_DIR, name + ".ini")) as config_file:
+        assert DrivetrainConfig.from_parser(parse_ini(config_file.read())) is not None
+
+
+@pytest.mark.parametrize("old,new", [
+    ("MAX_SPEED: 0.7", "MAX_SPEED: 1.5"),
+    ("MAX_SPEED: 0.7", "MAX_SPEED: fast"),
+    ("MAX_SPEED: 0.7", ""),
+    ("CHANNEL: 0", "CHANNEL: -1"),
+    ("CHANNEL: 0", ""),
+    ("[DrivetrainGyro]\nENABLED: False", ""),
+])
+def test_drivetrain_config_invalid(old, new):
+    with pytest.raises(ConfigError):
+        DrivetrainConfig.from_parser(parse_ini(DRIVETRAIN.replace(old, new)))
+
+
+def test_disabled_device_needs_no_channel():
+    config = ClimbingConfig.from_parser(parse_ini("""
+[ClimbingGeneral]
+MAX_SPEED: 1.0
+ENABLED: False
+[ClimbingLimitSwitch]
+ENABLED: False
+"""))
+    assert config.motor == DeviceConfig()
+    assert config.limit_switch == DeviceConfig()
+
+
+def test_shooter_config():
+    config = ShooterConfig.from_parser(parse_ini("""
+[ShooterGeneral]
+ENABLED: True
+SOLENOID_CHANNEL: 2
+SOLENOID_INVERTED: True
+"""))
+    assert config.solenoid == DeviceConfig(True, 2, True)
+
+
+CAMERA = """
+[Camera]
+ENABLED: True
+WIDTH: 160
+HEIGHT: 120
+FPS: 10
+MIN_FPS: 2
+COMPRESSION: 50
+CPU_BUDGET: 0.3
+MODES: Teleop, test
+"""
+
+
+def test_camera_config():
+    assert CameraConfig.from_parser(parse_ini(CAMERA)) == CameraConfig(True, 160, 120, 10, 2, 50, 0.3,
+                                                                      ("teleop", "test"))
+    assert CameraConfig.from_parser(parse_ini("[Camera]\nENABLED: False\n")) == CameraConfig()
+    assert read_config(CONFIG_DIR).camera.modes == ("autonomous", "teleop")
+
+
+@pytest.mark.parametrize("old,new", [
+    ("MIN_FPS: 2", "MIN_FPS: 12"),
+    ("COMPRESSION: 50", "COMPRESSION: 101"),
+    ("CPU_BUDGET: 0.3", "CPU_BUDGET: 0"),
+    ("MODES: Teleop, test", "MODES: teleop, practice"),
+    ("WIDTH: 160", ""),
+])
+def test_camera_config_invalid(old, new):
+    with pytest.raises(ConfigError):
+        CameraConfig.from_parser(parse_ini(CAMERA.replace(old, new)))
+
+
+def test_vision_config():
+    config = read_config(CONFIG_DIR).vision
+    assert config == VisionConfig(False, 60.0, 0.43, 40, (0, 180, 0), (120, 255, 120), 0.5)
+    with pytest.raises(ConfigError):
+        VisionConfig.from_parser(parse_ini("""
+[Vision]
+ENABLED: True
+FIELD_OF_VIEW: 60.0
+TARGET_HEIGHT: 0.43
+MIN_AREA: 40
+LOWER: 0, 180
+UPPER: 120, 255, 120
+MAX_AGE: 0.5
+"""))
+
+
+CURVES = """
+[JoyCurves0]
+LEFTY: Drive
+[JoyModifierCurves0]
+LEFTY: Precision
+[CurveDrive]
+SHAPE: Expo
+DEAD_BAND: 0.1
+EXPO: 0.3
+[CurvePrecision]
+SHAPE: points
+POINTS: 0 0, 0.5 0.2, 1 0.6
+"""
+
+
+def test_joystick_curves_config():
+    parser = read_ini(os.path.join(CONFIG_DIR, "joysticks.ini"))
+    for section in ["JoyCurves0", "JoyModifierCurves0", "CurveDrive", "CurvePrecision"]:
+        parser.remove_section(section)
+    parser.read_string(CURVES)
+    controllers = JoysticksConfig.from_parser(parser).controllers
+    linear = CurveConfig(dead_band=0.05)
+    drive = CurveConfig("expo", 0.1, 0.3)
+    assert controllers[0].curves == (linear, drive, linear, linear)
+    assert controllers[0].modifier_curves == (linear, CurveConfig("points", points=((0.0, 0.0), (0.5, 0.2),
+                                                                                    (1.0, 0.6))), linear, linear)
+    # Without modifier curves the modifier keeps the normal ones
+    assert controllers[1].modifier_curves == controllers[1].curves == (linear,) * 4
+
+
+@pytest.mark.parametrize("old,new", [
+    ("LEFTY: Drive", "LEFTY: Missing"),
+    ("SHAPE: Expo", "SHAPE: quadratic"),
+    ("DEAD_BAND: 0.1", "DEAD_BAND: 1.0"),
+    ("POINTS: 0 0, 0.5 0.2, 1 0.6", "POINTS: 0 0, 0.5 0.2"),
+    ("POINTS: 0 0, 0.5 0.2, 1 0.6", "POINTS: 0 0, 0.5 0.2, 0.4 0.6, 1 1"),
+])
+def test_joystick_curves_config_invalid(old, new):
+    parser = read_ini(os.path.join(CONFIG_DIR, "joysticks.ini"))
+    for section in ["JoyCurves0", "JoyModifierCurves0", "CurveDrive", "CurvePrecision"]:
+        parser.remove_section(section)
+    parser.read_string(CURVES.replace(old, new))
+    with pytest.raises(ConfigError):
+        JoysticksConfig.from_parser(parser)
+
+
+def test_button_commands_config():
+    commands = read_config(CONFIG_DIR).joysticks.button_commands
+    assert commands[0] == ButtonCommandConfig(1, "RIGHTBUMPER", "held", "Vacuum", (1.0,))
+    assert commands[3] == ButtonCommandConfig(1, "X", "pressed", "RotateControlPanel", (3.5,))
+    assert commands[4] == ButtonCommandConfig(1, "Y", "pressed", "StopOnColor", ())
+
+
+@pytest.mark.parametrize("binding", [
+    "PILOT_A: pressed StopOnColor",
+    "SCORING_Z: pressed StopOnColor",
+    "SCORING_A: clicked StopOnColor",
+    "SCORING_A: pressed Vacuum fast",
+    "SCORING_A: pressed",
+])
+def test_button_commands_config_invalid(binding):
+    parser = read_ini(os.path.join(CONFIG_DIR, "joysticks.ini"))
+    parser.remove_section("ButtonCommands")
+    parser.read_string("[ButtonCommands]\n%s\n" % binding)
+    with pytest.raises(ConfigError):
+        JoysticksConfig.from_parser(parser)
+
+
+def test_autonomous_drive_distance():
+    parser = parse_ini("[MoveFromLine]\nDRIVE_SPEED: 0.5\nDRIVE_TIME: 0.2\nDRIVE_DISTANCE: 0.3\n")
+    assert AutonomousProgramConfig.from_parser(parser, "MoveFromLine").drive_distance == 0.3
+
+
+def test_autonomous_config_invalid():
+    with pytest.raises(ConfigError):
+        AutonomousConfig.from_parser(parse_ini("[MoveFromLine]\nDRIVE_SPEED: 0.5\nDRIVE_TIME: 1.0\n"))
+
+
+def test_config_service():
+    service = ConfigService()
+    config = RobotConfig(drivetrain=DrivetrainConfig(max_speed=0.5))
+    service.set(config)
+    assert service.get() is config
+    assert service.load(CONFIG_DIR).drivetrain.max_speed == 0.7
+    assert service.get().drivetrain.max_speed == 0.7
+
+
+@pytest.fixture(scope="function")
+def config_dir(tmp_path):
+    for name in ["subsystems.ini", "joysticks.ini", "autonomous.ini"]:
+        with open(os.path.join(CONFIG_DIR, name)) as config_file:
+            (tmp_path / name).write_text(config_file.read())
+    return tmp_path
+
+
+def test_read_config_cached(config_dir, monkeypatch):
+    cache_path = str(config_dir / "config.cache")
+    config = read_config_cached(str(config_dir), cache_path)
+    assert config == read_config(CONFIG_DIR)
+    assert os.path.exists(cache_path)
+
+    # Unchanged files are not parsed again
+    def parse(sources):
+        raise AssertionError("config parsed again")
+    monkeypatch.setattr(util.config, "_parse_sources", parse)
+    cached = read_config_cached(str(config_dir), cache_path)
+    assert cached == config
+    assert cached.joysticks.axes["LEFTY"] == 1
+    with pytest.raises(TypeError):
+        cached.joysticks.axes["LEFTY"] = 3
+
+
+def test_read_config_cached_changed(config_dir):
+    cache_path = str(config_dir / "config.cache")
+    read_config_cached(str(config_dir), cache_path)
+    subsystems = config_dir / "subsystems.ini"
+    subsystems.write_text(subsystems.read_text().replace("MAX_SPEED: 0.7", "MAX_SPEED: 0.6"))
+    assert read_config_cached(str(config_dir), cache_path).drivetrain.max_speed == 0.6
+    assert read_config_cached(str(config_dir), cache_path).drivetrain.max_speed == 0.6
+
+
+def test_read_config_cached_invalid(config_dir):
+    cache_path = config_dir / "config.cache"
+    read_config_cached(str(config_dir), str(cache_path))
+    # A torn cache falls back to parsing
+    cache_path.write_bytes(cache_path.read_bytes()[:40])
+    assert read_config_cached(str(config_dir), str(cache_path)).drivetrain.max_speed == 0.7
+    # An invalid file is never served from the cache
+    subsystems = config_dir / "subsystems.ini"
+    subsystems.write_text(subsystems.read_text().replace("MAX_SPEED: 0.7", "MAX_SPEED: 7"))
+    with pytest.raises(ConfigError):
+        read_config_cached(str(config_dir), str(cache_path))
+
+
+def test_read_config_cached_unwritable(config_dir):
+    cache_path = str(config_dir / "missing" / "config.cache")
+    assert read_config_cached(str(config_dir), cache_path).drivetrain.max_speed == 0.7
@@ -0,0 +1,104 @@
+import os
+import time
+
+import pytest
+from util.config_watcher import ConfigWatcher
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "configs")
+
+
+def edit(path, old, new):
+    with open(path) as config_file:
+        text = config_file.read()
+    with open(path, "w") as config_file:
+        config_file.write(text.replace(old, new))
+    # Make sure the change is visible even on a file system with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+
+@pytest.fixture(scope="function")
+def config_dir(tmp_path):
+    for name in ["subsystems.ini", "joysticks.ini", "autonomous.ini"]:
+        with open(os.path.join(CONFIG_DIR, name)) as config_file:
+            (tmp_path / name).write_text(config_file.read())
+    return str(tmp_path)
+
+
+@pytest.fixture(scope="function")
+def watcher_default(config_dir):
+    watcher = ConfigWatcher()
+    # A long poll period keeps the thread out of the way, tests poll directly
+    watcher.start(config_dir, poll_period=60.0)
+    yield watcher
+    watcher.stop()
+
+
+def test_watcher_default(watcher_default):
+    assert watcher_default.poll() is False
+    assert watcher_default.take() is None
+    assert watcher_default.get_error() is None
+
+
+def test_reload(watcher_default, config_dir):
+    edit(os.path.join(config_dir, "subsystems.ini"), "MAX_SPEED: 0.7", "MAX_SPEED: 0.6")
+    assert watcher_default.poll() is True
+    config = watcher_default.take()
+    assert config.drivetrain.max_speed == 0.6
+    # Each config is only taken once
+    assert watcher_default.take() is None
+    assert watcher_default.poll() is False
+
+
+def test_reload_newest(watcher_default, config_dir):
+    path = os.path.join(config_dir, "autonomous.ini")
+    edit(path, "DRIVE_TIME: 0.2", "DRIVE_TIME: 0.3")
+    watcher_default.poll()
+    edit(path, "DRIVE_TIME: 0.3", "DRIVE_TIME: 0.4")
+    watcher_default.poll()
+    assert watcher_default.take().autonomous.move_from_line.drive_time == 0.4
+    assert watcher_default.take() is None
+
+
+def test_reload_invalid(watcher_default, config_dir):
+    path = os.path.join(config_dir, "joysticks.ini")
+    edit(path, "DEAD_ZONE:0.05", "DEAD_ZONE:1.5")
+    assert watcher_default.poll() is False
+    assert watcher_default.take() is None
+    assert "DEAD_ZONE" in watcher_default.get_error()
+    edit(path, "DEAD_ZONE:1.5", "DEAD_ZONE:0.1")
+    assert watcher_default.poll() is True
+    assert watcher_default.get_error() is None
+    assert watcher_default.take().joysticks.controllers[0].dead_zone == 0.1
+
+
+def test_reload_missing(watcher_default, config_dir):
+    os.remove(os.path.join(config_dir, "autonomous.ini"))
+    assert watcher_default.poll() is False
+    assert watcher_default.get_error() is not None
+
+
+def test_watch_thread(config_dir):
+    watcher = ConfigWatcher()
+    watcher.start(config_dir, poll_period=0.01)
+    try:
+        edit(os.path.join(config_dir, "subsystems.ini"), "MAX_SPEED: 0.7", "MAX_SPEED: 0.5")
+        config = None
+        deadline = time.monotonic() + 5.0
+        while config is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+            config = watcher.take()
+    finally:
+        watcher.stop()
+    assert config.drivetrain.max_speed == 0.5
+
+
+def test_reload_cache(config_dir):
+    cache_path = os.path.join(config_dir, "config.cache")
+    watcher = ConfigWatcher()
+    watcher.start(config_dir, cache_path, poll_period=60.0)
+    watcher.stop()
+    edit(os.path.join(config_dir, "subsystems.ini"), "CHANNEL: 5", "CHANNEL: 6")
+    assert watcher.poll() is True
+    assert os.path.exists(cache_path)
+    assert watcher.take().vacuum.motor.channel == 6
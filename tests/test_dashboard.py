@@ -0,0 +1,72 @@
+import pytest
+from util.dashboard import DashboardPublisher
+
+
+class MockSink(object):
+    def __init__(self):
+        self.puts = []
+
+    def putNumber(self, key, value):
+        self.puts.append((key, value))
+
+    def putBoolean(self, key, value):
+        self.puts.append((key, value))
+
+    def putString(self, key, value):
+        self.puts.append((key, value))
+
+
+@pytest.fixture(scope="function")
+def sink():
+    return MockSink()
+
+
+@pytest.fixture(scope="function")
+def publisher_default(sink):
+    return DashboardPublisher(sink)
+
+
+def test_put_number_unchanged(publisher_default, sink):
+    assert publisher_default.put_number("Gyro Angle", 1.0) is True
+    assert publisher_default.put_number("Gyro Angle", 1.0) is False
+    assert sink.puts == [("Gyro Angle", 1.0)]
+
+
+@pytest.mark.parametrize("epsilon,values,expected", [
+    (0.0, [0.0, 0.01, 0.01, 0.02], [0.0, 0.01, 0.02]),
+    (0.1, [0.0, 0.05, 0.1, 0.15, -0.2], [0.0, 0.15, -0.2]),
+    (0.5, [1.0, 1.3, 1.6, 1.8], [1.0, 1.6]),
+])
+def test_put_number_epsilon(publisher_default, sink, epsilon, values, expected):
+    publisher_default.set_epsilon("Gyro Angle", epsilon)
+    for value in values:
+        publisher_default.put_number("Gyro Angle", value)
+    assert [value for _, value in sink.puts] == expected
+
+
+def test_put_number_default_epsilon(sink):
+    publisher = DashboardPublisher(sink, 0.5)
+    publisher.set_epsilon("Winch Speed", 0.0)
+    for value in [0.0, 0.25]:
+        publisher.put_number("Vacuum Speed", value)
+        publisher.put_number("Winch Speed", value)
+    assert sink.puts == [("Vacuum Speed", 0.0), ("Winch Speed", 0.0), ("Winch Speed", 0.25)]
+
+
+def test_put_boolean(publisher_default, sink):
+    for value in [False, False, True, True, False]:
+        publisher_default.put_boolean("Shooter Solenoid", value)
+    assert sink.puts == [("Shooter Solenoid", False), ("Shooter Solenoid", True), ("Shooter Solenoid", False)]
+
+
+def test_put_string(publisher_default, sink):
+    for value in ["", "", "B", "B", "R"]:
+        publisher_default.put_string("Color Target", value)
+    assert sink.puts == [("Color Target", ""), ("Color Target", "B"), ("Color Target", "R")]
+
+
+def test_reset(publisher_default, sink):
+    publisher_default.put_number("Vacuum Speed", 0.0)
+    publisher_default.reset()
+    assert publisher_default.put_number("Vacuum Speed", 0.0) is True
+    assert len(sink.puts) == 2
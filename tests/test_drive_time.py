@@ -1,6 +1,7 @@
 import pytest
 from commands.drive_time import DriveTime
 from subsystems.drivetrain import Drivetrain
+from util.config import DrivetrainConfig, read_ini
 from util.stopwatch import Stopwatch
 
 
@@ -26,7 +27,8 @@ hal_data['pwm'] looks like this:
 
 @pytest.fixture(scope="function")
 def drivetrain_default(robot):
-    return Drivetrain(robot, None, '../tests/test_configs/drivetrain_default.ini')
+    config = DrivetrainConfig.from_parser(read_ini('../tests/test_configs/drivetrain_default.ini'))
+    return Drivetrain(robot, None, config)
 
 
 @pytest.fixture(scope="function")
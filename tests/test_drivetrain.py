@@ -1,5 +1,6 @@
 import pytest
 from subsystems.drivetrain import Drivetrain
+from util.config import DeviceConfig, DrivetrainConfig, RobotConfig, config_service, parse_ini, read_ini
 
 """
 hal_data['pwm'] looks like this:
@@ -21,9 +22,13 @@ hal_data['pwm'] looks like this:
 """
 
 
+def read_config(name: str) -> DrivetrainConfig:
+    return DrivetrainConfig.from_parser(read_ini('../tests/test_configs/%s.ini' % name))
+
+
 @pytest.fixture(scope="function")
 def drivetrain_default(robot):
-    return Drivetrain(robot, None, '../tests/test_configs/drivetrain_default.ini')
+    return Drivetrain(robot, None, read_config('drivetrain_default'))
 
 
 def test_drivetrain_default(drivetrain_default):
@@ -36,8 +41,48 @@ def test_drivetrain_default(drivetrain_default):
     assert drivetrain_default.get_arcade_rotation_modifier() == -1
 
 
+def test_drivetrain_gyro_read_once_per_tick(drivetrain_default):
+    drivetrain_default.periodic()
+    reads = drivetrain_default.get_sensor_reads()
+    angle = drivetrain_default.get_gyro_angle()
+    drivetrain_default.arcade_drive(0.0, 0.5, False)
+    drivetrain_default.tank_drive(0.2, 0.2)
+    assert drivetrain_default.get_gyro_angle() == angle
+    assert drivetrain_default.get_sensor_reads() == reads + 1
+    drivetrain_default.periodic()
+    drivetrain_default.get_gyro_angle()
+    assert drivetrain_default.get_sensor_reads() == reads + 2
+
+
+def test_drivetrain_gyro_history(drivetrain_default):
+    history = drivetrain_default._gyro_history
+    history.add(100.0, 30.0)
+    history.add(100.005, 30.5)
+    drivetrain_default.periodic()
+    assert drivetrain_default.get_gyro_angle() == 30.5
+    assert drivetrain_default.get_gyro_rate() == pytest.approx(100.0)
+    assert drivetrain_default.get_gyro_angle_at(100.0025) == pytest.approx(30.25)
+    # A reset keeps the history, shifted to the new zero
+    assert drivetrain_default.reset_gyro_angle() == 0.0
+    assert drivetrain_default.get_gyro_history(2) == [(100.0, -0.5), (100.005, 0.0)]
+
+
+def test_drivetrain_heading_hold(drivetrain_default, hal_data):
+    drivetrain_default._gyro_history.add(100.0, 0.0)
+    drivetrain_default.start_heading_hold(90.0, 0.5, 2.0)
+    # Without a running control loop the robot loop steps the turn
+    drivetrain_default.update_heading_hold()
+    assert hal_data['pwm'][1]['value'] == pytest.approx(-0.5306122448979592)
+    assert drivetrain_default.is_heading_settled() is False
+    # Once stopped the control loop leaves the motors to the robot loop
+    drivetrain_default.stop_heading_hold()
+    drivetrain_default.arcade_drive(0.0, 0.0)
+    drivetrain_default.step_heading_hold()
+    assert hal_data['pwm'][1]['value'] == 0.0
+
+
 def test_drivetrain_channels_0_1(hal_data, robot):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_channels_0_1.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_channels_0_1'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is not None
@@ -52,7 +97,7 @@ def test_drivetrain_channels_0_1(hal_data, robot):
 
 
 def test_drivetrain_channels_1_2(hal_data, robot):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_channels_1_2.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_channels_1_2'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is not None
@@ -75,7 +120,7 @@ def test_drivetrain_channels_1_2(hal_data, robot):
     (-1.0, -1.0, 0.0, 0.0),
 ])
 def test_drivetrain_zero_speed(hal_data, robot, left_speed, right_speed, left_ex_speed, right_ex_speed):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_zero_speed.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_zero_speed'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is not None
@@ -94,7 +139,7 @@ def test_drivetrain_zero_speed(hal_data, robot, left_speed, right_speed, left_ex
     (-1.0, -1.0, -0.5, 0.5),
 ])
 def test_drivetrain_half_speed(hal_data, robot, left_speed, right_speed, left_ex_speed, right_ex_speed):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_half_speed.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_half_speed'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is not None
@@ -113,7 +158,7 @@ def test_drivetrain_half_speed(hal_data, robot, left_speed, right_speed, left_ex
     (-1.0, -1.0, -0.75, 0.75),
 ])
 def test_drivetrain_3_4_speed(hal_data, robot, left_speed, right_speed, left_ex_speed, right_ex_speed):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_3_4_speed.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_3_4_speed'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is not None
@@ -132,7 +177,7 @@ def test_drivetrain_3_4_speed(hal_data, robot, left_speed, right_speed, left_ex_
     (-1.0, -1.0, -1.0, 1.0),
 ])
 def test_drivetrain_full_speed(hal_data, robot, left_speed, right_speed, left_ex_speed, right_ex_speed):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_full_speed.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_full_speed'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is not None
@@ -144,7 +189,7 @@ def test_drivetrain_full_speed(hal_data, robot, left_speed, right_speed, left_ex
 
 
 def test_drivetrain_left_inverted(hal_data, robot):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_left_inverted.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_left_inverted'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is not None
@@ -160,7 +205,7 @@ def test_drivetrain_left_inverted(hal_data, robot):
 
 
 def test_drivetrain_right_inverted(hal_data, robot):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_right_inverted.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_right_inverted'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is not None
@@ -176,7 +221,7 @@ def test_drivetrain_right_inverted(hal_data, robot):
 
 
 def test_drivetrain_left_disabled(hal_data, robot):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_left_disabled.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_left_disabled'))
     assert dt is not None
     assert dt._left_motor is None
     assert dt._right_motor is not None
@@ -184,8 +229,54 @@ def test_drivetrain_left_disabled(hal_data, robot):
 
 
 def test_drivetrain_right_disabled(hal_data, robot):
-    dt = Drivetrain(robot, None, '../tests/test_configs/drivetrain_right_disabled.ini')
+    dt = Drivetrain(robot, None, read_config('drivetrain_right_disabled'))
     assert dt is not None
     assert dt._left_motor is not None
     assert dt._right_motor is None
     assert dt._robot_drive is None
+
+
+def test_drivetrain_injected_config(hal_data, robot):
+    config = DrivetrainConfig(max_speed=0.5, left_motor=DeviceConfig(True, 3, True),
+                              right_motor=DeviceConfig(True, 4, False))
+    dt = Drivetrain(robot, None, config)
+    assert dt._max_speed == 0.5
+    assert dt._robot_drive is not None
+    assert dt.is_gyro_enabled() is False
+    assert hal_data['pwm'][3]['initialized'] is True
+    assert hal_data['pwm'][4]['initialized'] is True
+    assert dt._left_motor.getInverted() is True
+    assert dt._right_motor.getInverted() is False
+
+
+def test_drivetrain_shared_config(hal_data, robot):
+    config = DrivetrainConfig.from_parser(parse_ini("""
+[DrivetrainGeneral]
+MAX_SPEED: 0.25
+DPAD_SCALING: 0.4
+[DrivetrainLeftMotor]
+ENABLED: True
+CHANNEL: 1
+[DrivetrainRightMotor]
+ENABLED: False
+[DrivetrainGyro]
+ENABLED: False
+"""))
+    config_service.set(RobotConfig(drivetrain=config))
+    try:
+        dt = Drivetrain(robot)
+    finally:
+        config_service.set(None)
+    assert dt._max_speed == 0.25
+    assert dt._left_motor is not None
+    assert dt._right_motor is None
+
+
+def test_drivetrain_apply_config(hal_data, robot):
+    dt = Drivetrain(robot, None, read_config('drivetrain_half_speed'))
+    config = read_config('drivetrain_3_4_speed')
+    dt.apply_config(config)
+    assert dt._max_speed == 0.75
+    assert dt._dpad_scaling == config.dpad_scaling
+    # Motors keep the channels they were created with
+    assert hal_data['pwm'][1]['initialized'] is True
@@ -0,0 +1,82 @@
+import uuid
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+from util.frame_buffer import SharedFrameBuffer  # noqa: E402
+
+
+@pytest.fixture(scope="function")
+def writer():
+    frames = SharedFrameBuffer.create(8, 6, "test_frames_" + uuid.uuid4().hex[:8])
+    yield frames
+    frames.close()
+
+
+@pytest.fixture(scope="function")
+def reader(writer):
+    frames = SharedFrameBuffer.attach(writer._memory.name)
+    yield frames
+    frames.close()
+
+
+def write(frames, value, timestamp):
+    frames.begin_write()[:] = value
+    frames.commit(timestamp)
+
+
+def test_frame_buffer_size(reader):
+    assert reader.get_size() == (8, 6)
+    assert reader.read_latest() is None
+
+
+def test_frame_buffer_latest(writer, reader):
+    write(writer, 1, 1.0)
+    sequence, timestamp, frame = reader.read_latest()
+    assert (sequence, timestamp) == (1, 1.0)
+    assert frame.shape == (6, 8, 3)
+    assert numpy.all(frame == 1)
+    assert reader.is_intact() is True
+    # Nothing new
+    assert reader.read_latest() is None
+    # Only the latest of several frames is read
+    write(writer, 2, 2.0)
+    write(writer, 3, 3.0)
+    sequence, timestamp, frame = reader.read_latest()
+    assert (sequence, timestamp) == (3, 3.0)
+    assert numpy.all(frame == 3)
+
+
+def test_frame_buffer_zero_copy(writer, reader):
+    write(writer, 7, 1.0)
+    _, _, frame = reader.read_latest()
+    writer.begin_write()[0, 0, 0] = 9
+    writer.commit(2.0)
+    # The reader sees the shared slots, not copies
+    _, _, second = reader.read_latest()
+    assert second[0, 0, 0] == 9
+    assert frame[0, 0, 0] == 7
+
+
+def test_frame_buffer_overwritten(writer, reader):
+    write(writer, 1, 1.0)
+    _, _, frame = reader.read_latest()
+    write(writer, 2, 2.0)
+    write(writer, 3, 3.0)
+    assert reader.is_intact() is True
+    # The writer comes back around to the slot being read
+    writer.begin_write()
+    assert reader.is_intact() is False
+
+
+def test_frame_buffer_writing(writer, reader):
+    write(writer, 1, 1.0)
+    # A slot claimed but not committed is never read
+    writer.begin_write()
+    assert reader.read_latest()[0] == 1
+    assert reader.read_latest() is None
+
+
+def test_frame_buffer_too_many_slots():
+    with pytest.raises(ValueError):
+        SharedFrameBuffer.create(8, 6, "test_frames_" + uuid.uuid4().hex[:8], slots=10)
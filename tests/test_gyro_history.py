@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+from util.gyro_history import GyroHistory, GyroSampler
+
+
+@pytest.fixture(scope="function")
+def history_default():
+    return GyroHistory(8)
+
+
+def fill(history, samples):
+    # 200 Hz samples turning at 100 degrees per second
+    for i in range(samples):
+        history.add(i * 0.005, i * 0.5)
+
+
+def test_empty(history_default):
+    assert history_default.get_latest() == (0.0, 0.0)
+    assert history_default.get_history(4) == []
+    assert history_default.get_rate() == 0.0
+    assert history_default.get_angle_at(1.0) == 0.0
+
+
+def test_latest(history_default):
+    fill(history_default, 3)
+    assert history_default.get_latest() == (0.01, 1.0)
+    assert history_default.get_angle() == 1.0
+    assert history_default.get_count() == 3
+
+
+def test_history_wraps(history_default):
+    fill(history_default, 20)
+    history = history_default.get_history(100)
+    # One slot is always left to the writer
+    assert len(history) == history_default.get_capacity() - 1
+    assert history[0] == (pytest.approx(13 * 0.005), 6.5)
+    assert history[-1] == (pytest.approx(19 * 0.005), 9.5)
+    assert [angle for _, angle in history_default.get_history(3)] == [8.5, 9.0, 9.5]
+
+
+def test_rate(history_default):
+    fill(history_default, 20)
+    assert history_default.get_rate() == pytest.approx(100.0)
+    assert history_default.get_rate(2) == pytest.approx(100.0)
+
+
+@pytest.mark.parametrize("timestamp,expected", [
+    (0.0, 6.5),
+    (0.0725, 7.25),
+    (0.09, 9.0),
+    (1.0, 9.5),
+])
+def test_angle_at(history_default, timestamp, expected):
+    fill(history_default, 20)
+    assert history_default.get_angle_at(timestamp) == pytest.approx(expected)
+
+
+def test_sampler(history_default):
+    readings = iter([1.0, 2.0])
+    times = iter([10.0, 10.005])
+    sampler = GyroSampler(lambda: next(readings), history_default, lambda: next(times))
+    sampler.sample()
+    sampler.sample()
+    assert history_default.get_history(2) == [(10.0, 1.0), (10.005, 2.0)]
+
+
+def test_concurrent_reads():
+    history = GyroHistory(16)
+    done = threading.Event()
+
+    def write():
+        i = 0
+        while not done.is_set():
+            history.add(float(i), 2.0 * i)
+            i += 1
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(2000):
+            # Every sample read is one the writer wrote whole
+            for timestamp, angle in history.get_history(15):
+                assert angle == 2.0 * timestamp
+    finally:
+        done.set()
+        writer.join()
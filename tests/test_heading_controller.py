@@ -0,0 +1,61 @@
+import pytest
+from util.config import HeadingConfig
+from util.heading_controller import HeadingController
+from util.turn_benchmark import bang_bang, heading_control, simulate
+
+
+@pytest.fixture(scope="function")
+def controller_default():
+    return HeadingController(HeadingConfig(kp=0.04, ki=0.5, kd=0.004, kf=0.08, i_zone=10.0, max_integral=0.2,
+                                           settle_rate=10.0, settle_time=0.1), 0.7, 1.0)
+
+
+def test_output_clamped(controller_default):
+    assert controller_default.calculate(90.0, 0.0, 0.02) == 0.7
+    assert controller_default.calculate(-90.0, 0.0, 0.02) == -0.7
+
+
+def test_output_terms(controller_default):
+    # Proportional plus feedforward, the rate term brakes
+    assert controller_default.calculate(5.0, 0.0, 0.0) == pytest.approx(0.28)
+    assert controller_default.calculate(5.0, 20.0, 0.0) == pytest.approx(0.2)
+    # Within tolerance there is no feedforward
+    assert controller_default.calculate(0.5, 0.0, 0.0) == pytest.approx(0.02)
+
+
+def test_integral_anti_windup(controller_default):
+    # Nothing accumulates far from the target
+    for _ in range(100):
+        controller_default.calculate(30.0, 0.0, 0.02)
+    assert controller_default.calculate(5.0, 0.0, 0.0) == pytest.approx(0.28)
+    # Near it the integral grows, but never past max_integral
+    for _ in range(500):
+        controller_default.calculate(2.0, 0.0, 0.02)
+    assert controller_default.calculate(2.0, 0.0, 0.0) == pytest.approx(0.16 + 0.2)
+    controller_default.reset()
+    assert controller_default.calculate(2.0, 0.0, 0.0) == pytest.approx(0.16)
+
+
+def test_settle(controller_default):
+    assert controller_default.is_settled() is False
+    controller_default.calculate(0.5, 0.0, 0.02)
+    assert controller_default.is_settled() is False
+    for _ in range(5):
+        controller_default.calculate(0.5, 0.0, 0.02)
+    assert controller_default.is_settled() is True
+    # Passing through the target too fast starts over
+    controller_default.calculate(0.5, 50.0, 0.02)
+    assert controller_default.is_settled() is False
+
+
+@pytest.mark.parametrize("target", [10.0, 45.0, 90.0, 180.0, -90.0])
+def test_benchmark(target):
+    config = HeadingConfig()
+    old = simulate(bang_bang(0.7, 5.0), target)
+    new = simulate(heading_control(config, 0.7, 1.0), target)
+    assert new.finished is True
+    assert new.final_error <= 1.0
+    assert new.overshoot < 2.0
+    # The bang-bang turn coasts well past the target and never settles near it
+    assert new.settle_time < old.settle_time
+    assert new.overshoot < old.overshoot
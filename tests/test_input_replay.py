@@ -0,0 +1,103 @@
+import pytest
+from util.input_replay import InputReplay
+from util.match_logger import MatchLogger
+
+PORTS = [0, 1]
+AXIS_BINDINGS = [0, 1, 4, 5]
+
+
+def make_hal_data():
+    return {'joysticks': [{'buttons': [None] + [False] * 12, 'axes': [0] * 12, 'povs': [-1] * 12}
+                          for _ in range(6)]}
+
+
+@pytest.fixture(scope="function")
+def log_path(tmp_path):
+    path = str(tmp_path / "match.log")
+    logger = MatchLogger()
+    logger.open(path, 100)
+    logger.set_mode("disabled")
+    logger.commit(0.5, 1.0)
+    logger.set_mode("teleop")
+    for i in range(5):
+        logger.set_axes(0, 0.0, -0.1 * i, 0.0, 0.1 * i, 0.0, -1.0 if i == 2 else 0.0)
+        logger.set_axes(1, 0.0, 0.0, 0.0, 0.0, 1.0 if i == 3 else 0.0, 0.0)
+        logger.set_buttons(1, 0b101 if i >= 2 else 0)
+        logger.commit(2.0 + i * 0.02, 1.0)
+    logger.set_mode("disabled")
+    logger.commit(3.0, 1.0)
+    logger.close()
+    return path
+
+
+@pytest.fixture(scope="function")
+def replay_default(log_path):
+    return InputReplay(log_path, PORTS, AXIS_BINDINGS)
+
+
+def test_replay_default(replay_default):
+    assert replay_default.get_duration() == pytest.approx(0.08)
+
+
+def test_get_frame(replay_default):
+    assert replay_default.get_frame(-0.01) == -1
+    assert replay_default.get_frame(0.0) == 0
+    assert replay_default.get_frame(0.03) == 1
+    assert replay_default.get_frame(0.05) == 2
+    # Seeking backwards restarts the search
+    assert replay_default.get_frame(0.01) == 0
+    assert replay_default.get_frame(10.0) == 4
+
+
+def test_apply(replay_default):
+    hal_data = make_hal_data()
+    assert replay_default.apply(hal_data, 0.045) is True
+    driver = hal_data['joysticks'][0]
+    scoring = hal_data['joysticks'][1]
+    assert driver['axes'][1] == pytest.approx(-0.2)
+    assert driver['axes'][5] == pytest.approx(0.2)
+    assert driver['povs'][0] == 0
+    assert scoring['povs'][0] == -1
+    assert scoring['buttons'][1:4] == [True, False, True]
+    assert driver['buttons'][1] is False
+
+    replay_default.apply(hal_data, 0.065)
+    assert driver['povs'][0] == -1
+    assert scoring['povs'][0] == 90
+
+
+def test_apply_end(replay_default):
+    hal_data = make_hal_data()
+    assert replay_default.apply(hal_data, 1.0) is False
+    # The last recorded inputs are held
+    assert hal_data['joysticks'][0]['axes'][1] == pytest.approx(-0.4)
+
+
+def test_apply_before_start(replay_default):
+    assert replay_default.apply(make_hal_data(), -1.0) is False
+
+
+def test_replay_mode(log_path):
+    replay = InputReplay(log_path, PORTS, AXIS_BINDINGS, "disabled")
+    assert replay.get_duration() == pytest.approx(2.5)
+    replay = InputReplay(log_path, PORTS, AXIS_BINDINGS, "autonomous")
+    assert replay.get_duration() == 0.0
+    assert replay.apply(make_hal_data(), 0.0) is False
+
+
+@pytest.mark.parametrize("dpad_x,dpad_y,pov", [
+    (0.0, -1.0, 0),
+    (1.0, 0.0, 90),
+    (0.0, 1.0, 180),
+    (-1.0, 0.0, 270),
+    (0.0, 0.0, -1),
+])
+def test_to_pov(dpad_x, dpad_y, pov):
+    assert InputReplay._to_pov(dpad_x, dpad_y) == pov
+
+
+def test_replay_invalid(tmp_path):
+    path = tmp_path / "bad.log"
+    path.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        InputReplay(str(path), PORTS, AXIS_BINDINGS)
@@ -0,0 +1,54 @@
+import pytest
+from util import input_snapshot
+from util.input_snapshot import InputSnapshot
+
+
+@pytest.fixture(scope="function")
+def snapshot_default():
+    return InputSnapshot(2)
+
+
+def test_snapshot_default(snapshot_default):
+    assert snapshot_default.get_sequence() == 0
+    for controller in range(2):
+        for slot in range(input_snapshot.AXIS_COUNT):
+            assert snapshot_default.get_axis(controller, slot) == 0.0
+        assert snapshot_default.get_buttons(controller) == 0
+
+
+def test_snapshot_axes(snapshot_default):
+    snapshot_default.set_controller(1, 0.5, -0.04, 0.05, -1.0, -1, 0)
+    snapshot_default.next_loop()
+    assert snapshot_default.get_sequence() == 1
+    assert snapshot_default.get_axis(1, input_snapshot.LEFT_X) == 0.5
+    # Stored raw, the response curves apply the dead band when read
+    assert snapshot_default.get_axis(1, input_snapshot.LEFT_Y) == -0.04
+    assert snapshot_default.get_axis(1, input_snapshot.RIGHT_X) == 0.05
+    assert snapshot_default.get_axis(1, input_snapshot.RIGHT_Y) == -1.0
+    # The other controller is untouched
+    assert snapshot_default.get_axis(0, input_snapshot.LEFT_X) == 0.0
+
+
+@pytest.mark.parametrize("pov,dpad_x,dpad_y", [
+    (-1, 0.0, 0.0),
+    (0, 0.0, -1.0),
+    (90, 1.0, 0.0),
+    (180, 0.0, 1.0),
+    (270, -1.0, 0.0),
+    (45, 0.0, 0.0),
+])
+def test_snapshot_dpad(snapshot_default, pov, dpad_x, dpad_y):
+    snapshot_default.set_controller(0, 0.0, 0.0, 0.0, 0.0, pov, 0)
+    assert snapshot_default.get_axis(0, input_snapshot.DPAD_X) == dpad_x
+    assert snapshot_default.get_axis(0, input_snapshot.DPAD_Y) == dpad_y
+
+
+def test_snapshot_buttons(snapshot_default):
+    snapshot_default.set_controller(0, 0.0, 0.0, 0.0, 0.0, -1, 0b100101)
+    assert snapshot_default.get_buttons(0) == 0b100101
+    assert snapshot_default.is_pressed(0, 1) is True
+    assert snapshot_default.is_pressed(0, 2) is False
+    assert snapshot_default.is_pressed(0, 3) is True
+    assert snapshot_default.is_pressed(0, 6) is True
+    assert snapshot_default.is_pressed(0, 10) is False
+    assert snapshot_default.is_pressed(1, 1) is False
@@ -0,0 +1,154 @@
+import pytest
+from util.loop_timer import LatencyHistogram, LoopPhase, LoopTimer, RollingHistogram
+
+
+@pytest.fixture(scope="function")
+def histogram_default():
+    return LatencyHistogram(1.0, 10.0)
+
+
+@pytest.fixture(scope="function")
+def loop_timer_default():
+    return LoopTimer(20.0)
+
+
+def test_histogram_default(histogram_default):
+    assert histogram_default is not None
+    assert histogram_default.count() == 0
+    assert histogram_default.max() == 0.0
+    assert histogram_default.mean() == 0.0
+    assert histogram_default.percentile(0.5) == 0.0
+    assert len(histogram_default._buckets) == 11
+
+
+def test_histogram_record(histogram_default):
+    for duration in [0.5, 1.5, 2.5, 3.5]:
+        histogram_default.record(duration)
+    assert histogram_default.count() == 4
+    assert histogram_default.max() == 3.5
+    assert histogram_default.mean() == 2.0
+    assert histogram_default._buckets[0:4] == [1, 1, 1, 1]
+
+
+@pytest.mark.parametrize("fraction,expected", [
+    (0.0, 1.0),
+    (0.5, 5.0),
+    (0.95, 9.5),
+    (0.99, 9.5),
+    (1.0, 9.5),
+])
+def test_histogram_percentile(histogram_default, fraction, expected):
+    for i in range(10):
+        histogram_default.record(i + 0.5)
+    assert histogram_default.percentile(fraction) == pytest.approx(expected)
+
+
+def test_histogram_overflow(histogram_default):
+    histogram_default.record(25.0)
+    histogram_default.record(-1.0)
+    assert histogram_default._buckets[-1] == 1
+    assert histogram_default._buckets[0] == 1
+    assert histogram_default.max() == 25.0
+    assert histogram_default.percentile(1.0) == 25.0
+
+
+def test_histogram_reset(histogram_default):
+    histogram_default.record(3.0)
+    buckets = histogram_default._buckets
+    histogram_default.reset()
+    assert histogram_default._buckets is buckets
+    assert sum(histogram_default._buckets) == 0
+    assert histogram_default.count() == 0
+    assert histogram_default.max() == 0.0
+
+
+def test_rolling_histogram():
+    rolling = RollingHistogram(1.0, 10.0)
+    first = rolling.completed()
+    rolling.record(2.5)
+    assert rolling.completed().count() == 0
+    rolling.swap()
+    assert rolling.completed().max() == 2.5
+    rolling.record(7.5)
+    rolling.swap()
+    # Only the last window counts, and the two histograms are reused
+    assert rolling.completed().count() == 1
+    assert rolling.completed().max() == 7.5
+    assert rolling.completed() is first
+    rolling.reset()
+    assert rolling.completed().count() == 0
+
+
+def test_loop_timer_default(loop_timer_default):
+    assert loop_timer_default.loop().count() == 0
+    assert loop_timer_default.overruns() == 0
+    for phase in LoopPhase:
+        assert loop_timer_default.phase(phase).count() == 0
+
+
+def test_loop_timer_loop(loop_timer_default):
+    loop_timer_default.start()
+    loop_timer_default.mark(LoopPhase.GAME_MESSAGE)
+    loop_timer_default.mark(LoopPhase.SCHEDULER)
+    loop_timer_default.stop()
+    assert loop_timer_default.loop().count() == 1
+    assert loop_timer_default.phase(LoopPhase.GAME_MESSAGE).count() == 1
+    assert loop_timer_default.phase(LoopPhase.SCHEDULER).count() == 1
+    assert loop_timer_default.phase(LoopPhase.DASHBOARD).count() == 0
+    assert loop_timer_default.overruns() == 0
+    assert loop_timer_default.last_ms() == loop_timer_default.loop().max()
+
+
+def test_loop_timer_not_started(loop_timer_default):
+    loop_timer_default.mark(LoopPhase.SCHEDULER)
+    loop_timer_default.stop()
+    assert loop_timer_default.loop().count() == 0
+    assert loop_timer_default.phase(LoopPhase.SCHEDULER).count() == 0
+
+
+def test_loop_timer_overrun():
+    timer = LoopTimer(0.0)
+    timer.start()
+    timer.stop()
+    assert timer.overruns() == 1
+    timer.reset()
+    assert timer.overruns() == 0
+    assert timer.loop().count() == 0
+
+
+def test_loop_timer_window():
+    timer = LoopTimer(20.0, window_loops=3)
+    for loops in range(1, 8):
+        timer.start()
+        timer.mark(LoopPhase.SCHEDULER)
+        timer.stop()
+        # The window is only published once it is complete
+        assert timer.window().count() == (3 if loops >= 3 else 0)
+        assert timer.window_phase(LoopPhase.SCHEDULER).count() == (3 if loops >= 3 else 0)
+    assert timer.loop().count() == 7
+    timer.reset()
+    assert timer.window().count() == 0
+
+
+@pytest.mark.parametrize("loops,expected", [
+    (0, False),
+    (3, True),
+])
+def test_loop_timer_dump(loop_timer_default, tmp_path, loops, expected):
+    for _ in range(loops):
+        loop_timer_default.start()
+        loop_timer_default.mark(LoopPhase.SCHEDULER)
+        loop_timer_default.stop()
+    path = tmp_path / "loop_timing.txt"
+    assert loop_timer_default.dump(str(path)) is expected
+    assert path.exists() is expected
+    if expected:
+        report = path.read_text()
+        assert "loops: 3" in report
+        assert "scheduler: count=3" in report
+
+
+def test_loop_timer_dump_unwritable(loop_timer_default, tmp_path):
+    loop_timer_default.start()
+    loop_timer_default.stop()
+    assert loop_timer_default.dump(str(tmp_path / "missing" / "loop_timing.txt")) is False
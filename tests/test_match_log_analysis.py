@@ -0,0 +1,108 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from util.match_log_analysis import analyze, analyze_files, decode, main, read_max_speed, summarize  # noqa: E402
+from util.match_logger import MatchLogger  # noqa: E402
+
+
+def write_log(path, loops, capacity=1000, mode="teleop"):
+    """Write one record per (loop_time, left, right, linear, turn, retracted) tuple, 20 ms apart."""
+    logger = MatchLogger()
+    logger.open(path, capacity)
+    logger.set_mode(mode)
+    for i, (loop_time, left, right, linear, turn, retracted) in enumerate(loops):
+        logger.set_drive(left, right, linear, turn)
+        logger.set_winch(0.0, retracted)
+        logger.commit(1.0 + i * 0.02, loop_time)
+    logger.close()
+
+
+@pytest.fixture(scope="function")
+def log_path(tmp_path):
+    return str(tmp_path / "match.log")
+
+
+def test_decode_order(log_path):
+    write_log(log_path, [(float(i), 0.0, 0.0, 0.0, 0.0, False) for i in range(7)], capacity=4)
+    records = decode(log_path)
+    assert list(records["sequence"]) == [3, 4, 5, 6]
+    assert list(records["loop_time"]) == [3.0, 4.0, 5.0, 6.0]
+
+
+def test_decode_partial(log_path):
+    write_log(log_path, [(1.0, 0.0, 0.0, 0.0, 0.0, False)] * 3, capacity=10)
+    assert len(decode(log_path)) == 3
+
+
+def test_decode_invalid(tmp_path):
+    path = tmp_path / "bad.log"
+    path.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        decode(str(path))
+
+
+def test_analyze_loop_time(log_path):
+    write_log(log_path, [(float(i % 25), 0.0, 0.0, 0.0, 0.0, False) for i in range(100)])
+    stats = analyze(decode(log_path), 1.0)
+    assert stats["loops"] == 100
+    assert stats["loop_max"] == 24.0
+    assert stats["overruns"] == 16
+    assert stats["loop_mean"] == pytest.approx(12.0)
+
+
+def test_analyze_disabled_only(log_path):
+    write_log(log_path, [(1.0, 0.0, 0.0, 0.0, 0.0, False)] * 5, mode="disabled")
+    assert analyze(decode(log_path), 1.0) == {"loops": 0.0}
+
+
+def test_analyze_duty_and_saturation(log_path):
+    loops = [(1.0, 0.7, -0.7, 0.0, 0.0, False)] * 2 + \
+            [(1.0, 0.35, -0.35, 0.0, 0.0, True)] * 2 + \
+            [(1.0, 0.0, 0.0, 0.0, 0.0, True)] * 4
+    write_log(log_path, loops)
+    stats = analyze(decode(log_path), 0.7)
+    assert stats["drivetrain_duty"] == pytest.approx(0.5)
+    assert stats["drivetrain_saturation"] == pytest.approx(0.5)
+    # The last record has no following record to measure its time from
+    assert stats["winch_at_limit_time"] == pytest.approx(0.1)
+
+
+def test_analyze_turns(log_path):
+    loops = [(1.0, 0.5, 0.5, 0.0, 0.5, False)] * 5 + \
+            [(1.0, -0.5, -0.5, 0.0, -0.5, False)] * 2 + \
+            [(1.0, 0.0, 0.0, 0.0, 0.0, False)] * 3 + \
+            [(1.0, 0.5, 0.5, 0.0, 0.5, False)] * 2 + \
+            [(1.0, 0.5, -0.5, 0.5, 0.0, False)] * 2
+    write_log(log_path, loops)
+    stats = analyze(decode(log_path), 1.0)
+    assert stats["turns"] == 2
+    assert stats["turn_settle_max"] == pytest.approx(0.14)
+    assert stats["turn_settle_mean"] == pytest.approx(0.09)
+    assert stats["turn_reversals"] == 1
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_analyze_files(tmp_path, jobs):
+    paths = [str(tmp_path / ("match%d.log" % i)) for i in range(3)]
+    for i, path in enumerate(paths):
+        write_log(path, [(float(i), 0.0, 0.0, 0.0, 0.0, False)] * (i + 1))
+    results = analyze_files(paths, 1.0, jobs=jobs)
+    assert [path for path, _ in results] == paths
+    summary = summarize(results)
+    assert summary["loops"] == 6
+    assert summary["loop_max"] == 2.0
+    assert summary["loop_mean"] == pytest.approx((0 * 1 + 1 * 2 + 2 * 3) / 6)
+
+
+def test_read_max_speed(tmp_path):
+    path = tmp_path / "subsystems.ini"
+    path.write_text("[DrivetrainGeneral]\nMAX_SPEED: 0.7\n")
+    assert read_max_speed(str(path)) == 0.7
+
+
+def test_main(log_path, capsys):
+    write_log(log_path, [(1.0, 0.0, 0.0, 0.0, 0.0, False)] * 3)
+    main(["--max-speed", "0.7", log_path])
+    output = capsys.readouterr().out
+    assert output.startswith(log_path + ": loops=3.000")
@@ -0,0 +1,131 @@
+import os
+import struct
+import threading
+
+import pytest
+from util.match_logger import HEADER_FORMAT, HEADER_SIZE, MAGIC, RECORD_FIELDS, RECORD_FORMAT, RECORD_SIZE, \
+    VERSION, MatchLogger
+
+
+def read_header(path):
+    with open(path, "rb") as log_file:
+        return struct.unpack_from(HEADER_FORMAT, log_file.read(HEADER_SIZE))
+
+
+def read_record(path, slot):
+    with open(path, "rb") as log_file:
+        log_file.seek(HEADER_SIZE + slot * RECORD_SIZE)
+        values = struct.unpack(RECORD_FORMAT, log_file.read(RECORD_SIZE))
+    return dict(zip([name for name, _ in RECORD_FIELDS], values))
+
+
+@pytest.fixture(scope="function")
+def log_path(tmp_path):
+    return str(tmp_path / "match.log")
+
+
+@pytest.fixture(scope="function")
+def logger_default():
+    logger = MatchLogger()
+    yield logger
+    logger.close()
+
+
+def test_logger_default(logger_default):
+    assert logger_default.is_open() is False
+    assert logger_default.get_count() == 0
+    # Values may be set and committed before the log is opened
+    logger_default.set_vacuum(1.0)
+    logger_default.commit(0.0, 0.0)
+    assert logger_default.get_count() == 0
+
+
+def test_open(logger_default, log_path):
+    assert logger_default.open(log_path, 10) is True
+    assert logger_default.is_open() is True
+    logger_default.close()
+    assert read_header(log_path) == (MAGIC, VERSION, RECORD_SIZE, 10, 0)
+    with open(log_path, "rb") as log_file:
+        assert len(log_file.read()) == HEADER_SIZE + 10 * RECORD_SIZE
+
+
+def test_open_keeps_previous(logger_default, log_path):
+    logger_default.open(log_path, 10)
+    logger_default.commit(1.0, 5.0)
+    logger_default.open(log_path, 10)
+    assert read_header(log_path + ".prev")[4] == 1
+    assert logger_default.get_count() == 0
+
+
+def test_open_unwritable(logger_default, tmp_path):
+    assert logger_default.open(str(tmp_path / "missing" / "match.log"), 10) is False
+    assert logger_default.is_open() is False
+
+
+def test_commit(logger_default, log_path):
+    logger_default.open(log_path, 10)
+    logger_default.set_mode("teleop")
+    logger_default.set_axes(0, 0.1, 0.2, 0.3, 0.4, 0.0, -1.0)
+    logger_default.set_axes(1, 0.0, -0.5, 0.0, 0.0, 1.0, 0.0)
+    logger_default.set_buttons(0, 1 << 31)
+    logger_default.set_buttons(1, 0b100000)
+    logger_default.set_drive(0.5, -0.25, 0.75, 0.125)
+    logger_default.set_gyro_angle(90.0)
+    logger_default.set_winch(1.0, True)
+    logger_default.set_vacuum(-1.0)
+    logger_default.set_shooter(True)
+    logger_default.commit(12.5, 3.25)
+    logger_default.close()
+    assert read_header(log_path)[4] == 1
+    record = read_record(log_path, 0)
+    assert record["sequence"] == 0
+    assert record["timestamp"] == 12.5
+    assert record["mode"] == 2
+    assert record["loop_time"] == 3.25
+    assert record["driver_lefty"] == pytest.approx(0.2)
+    assert record["driver_dpady"] == -1.0
+    assert record["scoring_lefty"] == -0.5
+    assert record["scoring_dpadx"] == 1.0
+    # The driver station reports up to 32 buttons
+    assert record["driver_buttons"] == 1 << 31
+    assert record["scoring_buttons"] == 0b100000
+    assert record["drive_left"] == 0.5
+    assert record["drive_right"] == -0.25
+    assert record["drive_linear"] == 0.75
+    assert record["drive_turn"] == 0.125
+    assert record["gyro_angle"] == 90.0
+    assert record["winch_speed"] == 1.0
+    assert record["winch_retracted"] == 1
+    assert record["vacuum_speed"] == -1.0
+    assert record["shooter_solenoid"] == 1
+
+
+def test_commit_wraps(logger_default, log_path):
+    logger_default.open(log_path, 4)
+    for loop in range(6):
+        logger_default.set_gyro_angle(float(loop))
+        logger_default.commit(loop * 0.02, 1.0)
+    logger_default.close()
+    assert read_header(log_path)[4] == 6
+    assert [read_record(log_path, slot)["sequence"] for slot in range(4)] == [4, 5, 2, 3]
+    assert read_record(log_path, 1)["gyro_angle"] == 5.0
+
+
+def test_background_flush_uses_fsync(logger_default, log_path, monkeypatch):
+    # The flush thread must not use mmap.flush(), whose msync holds the GIL
+    flushed = threading.Event()
+    fsync = os.fsync
+
+    def record_fsync(fileno):
+        fsync(fileno)
+        flushed.set()
+
+    monkeypatch.setattr(os, "fsync", record_fsync)
+    logger_default.open(log_path, 4, flush_period=0.01)
+    logger_default.commit(0.0, 1.0)
+    assert flushed.wait(2.0) is True
+
+
+def test_set_mode_unknown(logger_default):
+    with pytest.raises(ValueError):
+        logger_default.set_mode("practice")
@@ -0,0 +1,69 @@
+import pytest
+from util.config import ProfileConfig
+from util.motion_profile import ProfileCache, feedforward, s_curve, trapezoid
+
+
+def jerks(profile):
+    accelerations = [profile.sample(i * profile.get_period())[2] for i in range(len(profile))]
+    return [abs(a1 - a0) / profile.get_period() for a0, a1 in zip(accelerations, accelerations[1:-1])]
+
+
+@pytest.mark.parametrize("distance,duration", [
+    # Cruising at 2 m/s after 1 s of acceleration, and a triangle too short to reach it
+    (3.0, 2.5),
+    (-3.0, 2.5),
+    (0.5, 1.0),
+])
+def test_trapezoid(distance, duration):
+    profile = trapezoid(distance, 2.0, 2.0)
+    assert profile.get_duration() == pytest.approx(duration)
+    assert profile.get_distance() == pytest.approx(distance)
+    velocities = [profile.sample(i * 0.02)[1] for i in range(len(profile))]
+    assert max(abs(v) for v in velocities) <= 2.0 + 1e-9
+    # Velocities integrate to the positions
+    position, _, _ = profile.sample(1.0)
+    assert sum(v0 + v1 for v0, v1 in zip(velocities[:50], velocities[1:51])) * 0.01 == pytest.approx(position)
+
+
+def test_sample_clamped():
+    profile = trapezoid(1.0, 2.0, 2.0)
+    assert profile.sample(-1.0) == (0.0, 0.0, 2.0)
+    assert profile.sample(100.0) == (1.0, 0.0, 0.0)
+    assert profile.sample(profile.get_duration()) == (1.0, 0.0, 0.0)
+
+
+def test_s_curve():
+    trapezoid_profile = trapezoid(3.0, 2.0, 2.0)
+    profile = s_curve(3.0, 2.0, 2.0, 10.0)
+    # Same distance, 0.2 s longer, and the acceleration ramps at the jerk limit instead of stepping
+    assert profile.get_distance() == 3.0
+    assert profile.get_duration() == pytest.approx(trapezoid_profile.get_duration() + 0.18)
+    assert max(jerks(profile)) == pytest.approx(10.0)
+    assert max(jerks(trapezoid_profile)) == pytest.approx(100.0)
+    assert profile.sample(profile.get_duration()) == (3.0, 0.0, 0.0)
+    # A jerk limit shorter than a sample leaves the trapezoid
+    assert len(s_curve(3.0, 2.0, 2.0, 1000.0)) == len(trapezoid_profile)
+
+
+def test_feedforward():
+    config = ProfileConfig(ks=0.05, kv=0.3, ka=0.05)
+    assert feedforward(config, 0.0, 0.0) == 0.0
+    assert feedforward(config, 2.0, 0.0) == pytest.approx(0.65)
+    assert feedforward(config, -1.0, -2.0) == pytest.approx(-0.45)
+    assert feedforward(config, 10.0, 2.0) == 1.0
+
+
+def test_cache():
+    cache = ProfileCache()
+    config = ProfileConfig()
+    profile = cache.get(1.5, config)
+    assert cache.get(1.5, config) is profile
+    assert cache.get_misses() == 1
+    # Any other distance or limit is another profile
+    assert cache.get(-1.5, config) is not profile
+    trapezoid_profile = cache.get(1.5, ProfileConfig(max_jerk=0.0))
+    assert trapezoid_profile is not profile
+    assert len(trapezoid_profile) == len(trapezoid(1.5, 2.0, 2.0))
+    assert cache.get_misses() == 3
+    cache.clear()
+    assert cache.get(1.5, config) is not profile
@@ -1,14 +1,122 @@
+import dataclasses
+import os
+
 import pytest
-from oi import UserController, JoystickAxis, JoystickButtons
+from oi import OI, UserController, JoystickAxis, JoystickButtons
+from util.command_registry import command_registry
+from util.config import AutonomousConfig, AutonomousProgramConfig, JoysticksConfig, read_ini
+from util.response_curve import CurveSet
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "configs")
+
+
+@pytest.fixture(scope="function")
+def joysticks_config():
+    return JoysticksConfig.from_parser(read_ini(os.path.join(CONFIG_DIR, "joysticks.ini")))
+
+
+@pytest.fixture(scope="function")
+def oi(robot, joysticks_config):
+    return OI(robot, joysticks_config)
+
+
+def test_oi_state_per_instance(robot, joysticks_config, oi):
+    swapped = dataclasses.replace(joysticks_config, axes={**joysticks_config.axes, "LEFTY": 5, "RIGHTY": 1},
+                                  buttons={**joysticks_config.buttons, "A": 3, "B": 2})
+    other = OI(robot, swapped)
+    # Bindings stay with their instance, the enumerations are untouched
+    assert JoystickAxis.LEFTY == 1
+    assert JoystickButtons.A == 2
+    assert oi._axis_channels == (0, 1, 4, 5)
+    assert other._axis_channels == (0, 5, 4, 1)
+    assert oi._button_channels[JoystickButtons.A] == 2
+    assert other._button_channels[JoystickButtons.A] == 3
+    assert len(oi._controllers) == len(other._controllers) == len(UserController)
+    assert other.get_snapshot() is not oi.get_snapshot()
+
+
+def test_oi_many_instances(robot, joysticks_config):
+    for _ in range(100):
+        oi = OI(robot, joysticks_config)
+    assert len(oi._controllers) == len(UserController)
+    assert len(oi._curves) == len(UserController)
+
+
+def test_get_axis(oi):
+    oi.get_snapshot().set_controller(0, 0.0, 1.0, 0.0, 0.02, 180, 0)
+    assert oi.get_axis(UserController.DRIVER, JoystickAxis.LEFTY) == pytest.approx(1.0)
+    assert oi.get_axis(UserController.DRIVER, JoystickAxis.LEFTY, CurveSet.MODIFIER) == pytest.approx(0.5)
+    # Inside the dead band
+    assert oi.get_axis(UserController.DRIVER, JoystickAxis.RIGHTY) == 0.0
+    assert oi.get_axis(UserController.DRIVER, JoystickAxis.DPADY) == 1.0
+
+
+def test_get_button_state(oi):
+    oi.get_snapshot().set_controller(1, 0.0, 0.0, 0.0, 0.0, -1, 0b10)
+    assert oi.get_button_state(UserController.SCORING, JoystickButtons.A) is True
+    assert oi.get_button_state(UserController.SCORING, JoystickButtons.X) is False
+    assert oi.get_button_state(UserController.DRIVER, JoystickButtons.A) is False
+
+
+class FakeProgram(object):
+    def __init__(self, name: str):
+        self.name = name
+        self.configs = []
+
+    def apply_config(self, config):
+        self.configs.append(config)
+
+
+@pytest.fixture(scope="function")
+def built_programs(monkeypatch):
+    built = []
+
+    def create(name, robot, *args):
+        built.append(name)
+        return FakeProgram(name)
+
+    monkeypatch.setattr(command_registry, "create", create)
+    return built
+
+
+def select(oi, monkeypatch, program):
+    monkeypatch.setattr(oi._auto_program_chooser, "getSelected", lambda: program)
+
+
+def test_auto_choice_builds_selected_only(oi, monkeypatch, built_programs):
+    select(oi, monkeypatch, "MoveFromLine")
+    command = oi.get_auto_choice()
+    assert command.name == "MoveFromLine"
+    assert built_programs == ["MoveFromLine"]
+    assert list(oi._auto_programs) == ["MoveFromLine"]
+
+
+def test_auto_choice_built_once(oi, monkeypatch, built_programs):
+    select(oi, monkeypatch, "DriveToWall")
+    command = oi.get_auto_choice()
+    assert oi.get_auto_choice() is command
+    assert oi._auto_programs["DriveToWall"] is command
+    assert built_programs == ["DriveToWall"]
+
+
+def test_auto_choice_default(oi, monkeypatch, built_programs):
+    # Nothing selected yet, e.g. before the dashboard connected
+    select(oi, monkeypatch, None)
+    assert oi.get_auto_choice().name == OI.AUTONOMOUS_PROGRAMS[0][1]
+    assert built_programs == ["DeadReckoningScore"]
 
 
-#@pytest.fixture(scope="function")
-#def oi(robot):
-#    from oi import OI
-#    return OI(robot)
+def test_auto_choice_apply_config(oi, monkeypatch, built_programs, joysticks_config):
+    select(oi, monkeypatch, "MoveFromLine")
+    command = oi.get_auto_choice()
+    autonomous = AutonomousConfig(move_from_line=AutonomousProgramConfig(0.4, 0.3))
+    oi.apply_config(joysticks_config, autonomous)
+    # Only the routine that was built takes the reloaded values, the others read them when they are built
+    assert command.configs == [autonomous.move_from_line]
+    assert built_programs == ["MoveFromLine"]
 
 
-#def test_get_axis(oi):
-    # TODO set mock joystick value
-#    value = oi.get_axis(UserController.DRIVER, JoystickAxis.LEFTX)
-#    assert value == -1.0
+def test_auto_programs_offered():
+    programs = [program for _, program, _ in OI.AUTONOMOUS_PROGRAMS]
+    assert programs == ["DeadReckoningScore", "MoveFromLine", "DriveToWall"]
+    assert "Drive To Wall" in [name for name, _, _ in OI.AUTONOMOUS_PROGRAMS]
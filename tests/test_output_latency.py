@@ -0,0 +1,50 @@
+import pytest
+from util.output_latency import OutputLatency
+
+
+@pytest.fixture(scope="function")
+def latency_default(clock):
+    return OutputLatency(clock)
+
+
+def test_latency_default(latency_default):
+    assert latency_default.is_waiting() is False
+    assert latency_default.get_latency_ms() == 0.0
+    assert latency_default.record() is False
+
+
+def test_latency_first_output(latency_default, clock):
+    clock.now = 10.0
+    latency_default.start()
+    assert latency_default.is_waiting() is True
+    clock.now = 10.025
+    assert latency_default.record() is True
+    assert latency_default.get_latency_ms() == pytest.approx(25.0)
+    # Later outputs do not change the measurement
+    clock.now = 11.0
+    assert latency_default.record() is False
+    assert latency_default.get_latency_ms() == pytest.approx(25.0)
+
+
+def test_latency_restart(latency_default, clock):
+    latency_default.start()
+    clock.now = 0.002
+    latency_default.record()
+    clock.now = 5.0
+    latency_default.start()
+    clock.now = 5.04
+    latency_default.record()
+    assert latency_default.get_latency_ms() == pytest.approx(40.0)
+
+
+def test_latency_cancel(latency_default, clock):
+    latency_default.start()
+    clock.now = 0.03
+    latency_default.record()
+    latency_default.start()
+    latency_default.cancel()
+    assert latency_default.is_waiting() is False
+    # An output after the cancel is not measured, the last latency stays
+    clock.now = 9.0
+    assert latency_default.record() is False
+    assert latency_default.get_latency_ms() == pytest.approx(30.0)
@@ -0,0 +1,59 @@
+import pytest
+from commands.profiled_drive import ProfiledDrive
+from subsystems.drivetrain import Drivetrain
+from util.config import DrivetrainConfig, read_ini
+from util.motion_profile import trapezoid
+from util.stopwatch import Stopwatch
+
+
+@pytest.fixture(scope="function")
+def drivetrain_default(robot):
+    config = DrivetrainConfig.from_parser(read_ini('../tests/test_configs/drivetrain_default.ini'))
+    return Drivetrain(robot, None, config)
+
+
+@pytest.fixture(scope="function")
+def command_default(robot, drivetrain_default):
+    robot.drivetrain = drivetrain_default
+    return ProfiledDrive(robot, trapezoid(1.0, 2.0, 2.0))
+
+
+def test_init_default(command_default):
+    assert command_default is not None
+    assert command_default.robot.drivetrain is not None
+    assert command_default.name == "ProfiledDrive"
+    assert command_default.timeout == 15
+    assert command_default._profile.get_distance() == 1.0
+
+
+def test_set_profile(command_default):
+    profile = trapezoid(-0.5, 2.0, 2.0)
+    command_default.set_profile(profile)
+    assert command_default._profile is profile
+
+
+@pytest.mark.parametrize("distance", [1.0, -1.0])
+def test_execute(robot, drivetrain_default, hal_data, distance):
+    robot.drivetrain = drivetrain_default
+    pd = ProfiledDrive(robot, trapezoid(distance, 2.0, 2.0))
+    pd.initialize()
+    pd.execute()
+    # Accelerating from a standstill, the left and right motors turn opposite ways like DriveTime
+    assert hal_data['pwm'][1]['value'] * distance > 0.0
+    assert hal_data['pwm'][2]['value'] * distance < 0.0
+
+
+def test_command_full(robot, drivetrain_default, hal_data):
+    robot.drivetrain = drivetrain_default
+    profile = trapezoid(0.1, 2.0, 2.0)
+    pd = ProfiledDrive(robot, profile)
+    sw = Stopwatch()
+    pd.initialize()
+    sw.start()
+    while not pd.isFinished():
+        pd.execute()
+    pd.end()
+    sw.stop()
+    assert sw.elapsed_time_in_secs() == pytest.approx(profile.get_duration(), rel=0.1)
+    assert hal_data['pwm'][1]['value'] == 0.0
+    assert hal_data['pwm'][2]['value'] == 0.0
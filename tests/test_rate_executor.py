@@ -0,0 +1,181 @@
+import threading
+
+import pytest
+from util.config import HeadingConfig
+from util.heading_controller import HeadingController
+from util.heading_hold import HeadingHold
+from util.rate_executor import Mailbox, RateExecutor, RateGroup
+
+
+class MockNotifier(object):
+    def __init__(self, run):
+        self.run = run
+        self.period = None
+        self.stopped = False
+
+    def startPeriodic(self, period: float):
+        self.period = period
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture(scope="function")
+def executor_default():
+    executor = RateExecutor()
+    executor.add_group("control", 200.0, True)
+    executor.add_group("main", 50.0, False)
+    return executor
+
+
+def heading_controller(max_output: float = 0.7) -> HeadingController:
+    return HeadingController(HeadingConfig(kp=0.04, ki=0.0, kd=0.004, kf=0.08, i_zone=10.0, max_integral=0.2,
+                                           settle_rate=10.0, settle_time=0.1), max_output, 1.0)
+
+
+def test_group_jitter(clock):
+    group = RateGroup("control", 200.0, True, clock)
+    runs = []
+    group.add(lambda: runs.append(clock.now))
+    # The first tick has nothing to measure against, the next ones stray 0, 1 and 2 ms from 5 ms
+    for now in [1.0, 1.005, 1.011, 1.014]:
+        clock.now = now
+        group.tick()
+    assert runs == [1.0, 1.005, 1.011, 1.014]
+    jitter = group.get_jitter()
+    assert jitter.count() == 3
+    assert jitter.max() == pytest.approx(2.0, abs=0.1)
+    group.reset()
+    clock.now = 2.0
+    group.tick()
+    assert group.get_jitter().count() == 0
+
+
+def test_start_threaded_groups(executor_default):
+    notifiers = []
+
+    def factory(run):
+        notifiers.append(MockNotifier(run))
+        return notifiers[-1]
+
+    runs = []
+    executor_default.add_task("control", lambda: runs.append("control"))
+    executor_default.add_task("main", lambda: runs.append("main"))
+    assert executor_default.is_running("control") is False
+    executor_default.start(factory)
+    # Only the threaded group gets a notifier, the robot loop ticks the other one
+    assert len(notifiers) == 1
+    assert notifiers[0].period == pytest.approx(0.005)
+    assert executor_default.is_running("control") is True
+    assert executor_default.is_running("main") is False
+    notifiers[0].run()
+    executor_default.tick("main")
+    assert runs == ["control", "main"]
+    # Starting again does not start a second notifier
+    executor_default.start(factory)
+    assert len(notifiers) == 1
+    executor_default.clear()
+    assert notifiers[0].stopped is True
+    assert executor_default.is_running("control") is False
+    notifiers[0].run()
+    assert runs == ["control", "main"]
+
+
+def test_report(executor_default, tmp_path):
+    report = executor_default.report()
+    assert report.startswith("control: rate=200 ticks=0")
+    assert "main: rate=50" in report
+    path = tmp_path / "rate_jitter.txt"
+    assert executor_default.dump(str(path)) is True
+    assert path.read_text() == report
+    assert executor_default.dump(str(tmp_path / "missing" / "rate_jitter.txt")) is False
+
+
+def test_mailbox():
+    mailbox = Mailbox()
+    assert mailbox.get() is None
+    mailbox.put((1, 2.0))
+    mailbox.put((2, 3.0))
+    assert mailbox.get() == (2, 3.0)
+
+
+def test_heading_hold(clock):
+    heading = [0.0, 0.0]
+    outputs = []
+    hold = HeadingHold(lambda: tuple(heading), outputs.append, clock)
+    # Nothing to do before a turn starts
+    hold.step()
+    assert outputs == []
+    assert hold.is_active() is False
+    hold.start(90.0, heading_controller())
+    assert hold.is_active() is True
+    assert hold.is_settled() is False
+    hold.step()
+    assert outputs == [0.7]
+    assert hold.get_output() == 0.7
+    # On target and still, settled once the settle time passed
+    heading[0] = 90.0
+    for _ in range(25):
+        clock.now += 0.005
+        hold.step()
+    assert hold.is_settled() is True
+    assert hold.get_output() == 0.0
+    # A new turn is not settled by the status of the previous one
+    hold.start(0.0, heading_controller())
+    assert hold.is_settled() is False
+    assert hold.get_output() == 0.0
+    hold.stop()
+    assert hold.is_active() is False
+    outputs.clear()
+    # Once stopped the drivetrain belongs to the caller, steps never drive it
+    hold.step()
+    hold.step()
+    assert outputs == []
+
+
+def test_heading_hold_no_drive_after_stop():
+    heading = [0.0, 0.0]
+    stopped = threading.Event()
+    late = []
+    hold = HeadingHold(lambda: tuple(heading), lambda output: late.append(output) if stopped.is_set() else None)
+    done = threading.Event()
+
+    def control_loop():
+        while not done.is_set():
+            hold.step()
+
+    control = threading.Thread(target=control_loop)
+    control.start()
+    try:
+        for turn in range(200):
+            stopped.clear()
+            hold.start(float(turn), heading_controller())
+            hold.stop()
+            stopped.set()
+    finally:
+        done.set()
+        control.join()
+    # No step drove between stop() returning and the next start()
+    assert late == []
+
+
+def test_heading_hold_concurrent():
+    heading = [0.0, 0.0]
+    hold = HeadingHold(lambda: tuple(heading), lambda output: None)
+    done = threading.Event()
+
+    def control_loop():
+        while not done.is_set():
+            hold.step()
+
+    control = threading.Thread(target=control_loop)
+    control.start()
+    try:
+        for turn in range(200):
+            hold.start(float(turn), heading_controller())
+            # Whatever the control loop posted last belongs to a turn that started, and stays in range
+            assert -0.7 <= hold.get_output() <= 0.7
+            hold.stop()
+    finally:
+        done.set()
+        control.join()
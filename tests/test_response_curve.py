@@ -0,0 +1,52 @@
+import pytest
+from util.config import CurveConfig
+from util.response_curve import ResponseCurve
+
+
+@pytest.mark.parametrize("value", [0.0, 0.05, -0.09, 0.1])
+def test_dead_band(value):
+    assert ResponseCurve(CurveConfig(dead_band=0.1)).apply(value) == 0.0
+
+
+@pytest.mark.parametrize("value,expected", [
+    (0.2, 0.2),
+    (-0.5, -0.5),
+    (1.0, 1.0),
+    (-1.0, -1.0),
+])
+def test_linear(value, expected):
+    assert ResponseCurve(CurveConfig()).apply(value) == pytest.approx(expected)
+
+
+def test_linear_dead_band_stretched():
+    curve = ResponseCurve(CurveConfig(dead_band=0.2))
+    assert curve.apply(0.6) == pytest.approx(0.5)
+    assert curve.apply(1.0) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("config,shape", [
+    (CurveConfig("expo", expo=0.3), lambda x: 0.7 * x + 0.3 * x ** 3),
+    (CurveConfig("cubic"), lambda x: x ** 3),
+    (CurveConfig("points", points=((0.0, 0.0), (0.5, 0.2), (1.0, 1.0))),
+     lambda x: 0.4 * x if x <= 0.5 else 0.2 + 1.6 * (x - 0.5)),
+])
+def test_shapes(config, shape):
+    curve = ResponseCurve(config)
+    for i in range(-100, 101):
+        value = i / 100
+        expected = shape(abs(value)) if value >= 0 else -shape(abs(value))
+        # The table interpolates linearly between 128 samples
+        assert curve.apply(value) == pytest.approx(expected, abs=1e-4)
+
+
+def test_scale():
+    curve = ResponseCurve(CurveConfig("expo", 0.05, 0.3, 0.5))
+    assert curve.apply(1.0) == pytest.approx(0.5)
+    assert curve.apply(-1.0) == pytest.approx(-0.5)
+    assert 0.0 < curve.apply(0.5) < 0.25
+
+
+def test_out_of_range():
+    curve = ResponseCurve(CurveConfig("cubic"))
+    assert curve.apply(1.2) == 1.0
+    assert curve.apply(-1.2) == -1.0
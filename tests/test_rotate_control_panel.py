@@ -0,0 +1,41 @@
+import pytest
+from commands.rotate_control_panel import RotateControlPanel
+from subsystems.control_panel import ControlPanel
+from util.color_lut import PanelColor
+from util.config import ControlPanelConfig, DeviceConfig
+
+COLORS = [PanelColor.RED, PanelColor.UNKNOWN, PanelColor.GREEN, PanelColor.BLUE, PanelColor.YELLOW]
+
+
+@pytest.fixture(scope="function")
+def control_panel_default(robot, monkeypatch):
+    control_panel = ControlPanel(robot, None, ControlPanelConfig(0.8, 0.25, DeviceConfig(True, 6, False)))
+    readings = iter(COLORS * 20)
+    monkeypatch.setattr(control_panel, "read_color", lambda: next(readings))
+    monkeypatch.setattr(control_panel, "has_color_sensor", lambda: True)
+    return control_panel
+
+
+@pytest.fixture(scope="function")
+def command_default(robot, control_panel_default):
+    robot.control_panel = control_panel_default
+    return RotateControlPanel(robot, 0.5, 1.0, None, 15)
+
+
+def test_init_default(command_default):
+    assert command_default.name == "RotateControlPanel"
+    assert command_default.timeout == 15
+    assert command_default._target_wedges == 4
+
+
+def test_rotate(command_default, hal_data):
+    command_default.initialize()
+    loops = 0
+    while not command_default.isFinished():
+        command_default.execute()
+        loops += 1
+        if not command_default.isFinished():
+            assert hal_data['pwm'][6]['value'] == pytest.approx(0.8)
+    # Four wedges after the first one, UNKNOWN readings do not count
+    assert loops == 6
+    assert hal_data['pwm'][6]['value'] == 0.0
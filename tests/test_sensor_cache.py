@@ -0,0 +1,65 @@
+import pytest
+from util.sensor_cache import SensorCache
+
+
+class MockDevice(object):
+    def __init__(self):
+        self.value = 0.0
+        self.reads = 0
+
+    def read(self) -> float:
+        self.reads += 1
+        return self.value
+
+
+@pytest.fixture(scope="function")
+def cache_default(clock):
+    return SensorCache(clock)
+
+
+def test_read_once_per_tick(cache_default, clock):
+    device = MockDevice()
+    sensor = cache_default.add(device.read)
+    device.value = 10.0
+    clock.now = 1.0
+    assert sensor.is_fresh() is False
+    assert sensor.get() == 10.0
+    device.value = 12.0
+    clock.now = 1.001
+    # Later reads in the same tick see the first reading
+    assert sensor.get() == 10.0
+    assert sensor.get() == 10.0
+    assert sensor.is_fresh() is True
+    assert sensor.get_timestamp() == 1.0
+    assert device.reads == 1
+    cache_default.next_tick()
+    clock.now = 1.02
+    assert sensor.is_fresh() is False
+    assert sensor.get() == 12.0
+    assert sensor.get_timestamp() == 1.02
+    assert device.reads == 2
+    assert cache_default.get_reads() == 2
+
+
+def test_invalidate(cache_default):
+    device = MockDevice()
+    sensor = cache_default.add(device.read)
+    sensor.get()
+    device.value = 0.5
+    sensor.invalidate()
+    assert sensor.get() == 0.5
+    assert device.reads == 2
+
+
+def test_several_sensors(cache_default):
+    first = MockDevice()
+    second = MockDevice()
+    first_sensor = cache_default.add(first.read)
+    second_sensor = cache_default.add(second.read)
+    for _ in range(3):
+        cache_default.next_tick()
+        for _ in range(4):
+            first_sensor.get()
+            second_sensor.get()
+    assert first.reads == second.reads == 3
+    assert cache_default.get_reads() == 6
@@ -0,0 +1,27 @@
+import pytest
+
+numpy = pytest.importorskip("numpy")
+from util.simulated_frames import SimulatedFrameSource  # noqa: E402
+
+
+def test_simulated_frames():
+    source = SimulatedFrameSource(40, 30, step=4)
+    frame = source.next_frame()
+    assert frame.shape == (30, 40, 3)
+    assert frame.dtype == numpy.uint8
+    assert source.get_position() == 4
+    assert tuple(frame[0, 4]) == SimulatedFrameSource.BAR_COLOR
+    assert frame[0, 0, 0] == SimulatedFrameSource.BACKGROUND
+    # The frame is redrawn in place with the bar moved
+    assert source.next_frame() is frame
+    assert tuple(frame[10, 8]) == SimulatedFrameSource.BAR_COLOR
+    assert frame[10, 4, 0] == SimulatedFrameSource.BACKGROUND
+    assert numpy.count_nonzero(frame[0, :, 2] == 255) == 4
+
+
+def test_simulated_frames_wrap():
+    source = SimulatedFrameSource(20, 10, step=7)
+    for _ in range(10):
+        frame = source.next_frame()
+        assert 0 <= source.get_position() <= 18
+        assert numpy.count_nonzero(frame[0, :, 2] == 255) == 2
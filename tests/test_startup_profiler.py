@@ -0,0 +1,43 @@
+import pytest
+from util.startup_profiler import StartupProfiler
+
+
+@pytest.fixture(scope="function")
+def profiler_default(clock):
+    return StartupProfiler(clock)
+
+
+def test_profiler_default(profiler_default, tmp_path):
+    assert profiler_default.get_sections() == []
+    assert profiler_default.get_total_ms() == 0.0
+    assert profiler_default.dump(str(tmp_path / "startup.txt")) is False
+
+
+def test_section(profiler_default, clock):
+    with profiler_default.section("import wpilib"):
+        clock.now += 0.3
+    with profiler_default.section("Drivetrain"):
+        clock.now += 0.1
+    sections = profiler_default.get_sections()
+    assert [name for name, _ in sections] == ["import wpilib", "Drivetrain"]
+    assert sections[0][1] == pytest.approx(300.0)
+    assert profiler_default.get_total_ms() == pytest.approx(400.0)
+
+
+def test_section_raises(profiler_default, clock):
+    with pytest.raises(RuntimeError):
+        with profiler_default.section("CameraServer.launch"):
+            clock.now += 0.05
+            raise RuntimeError()
+    assert profiler_default.get_sections()[0][1] == pytest.approx(50.0)
+
+
+def test_report(profiler_default, tmp_path):
+    profiler_default.record("OI", 3.0)
+    profiler_default.record("Shooter", 1.0)
+    assert profiler_default.report() == "OI: 3.000 ms (75.0%)\nShooter: 1.000 ms (25.0%)\ntotal: 4.000 ms\n"
+    path = tmp_path / "startup.txt"
+    assert profiler_default.dump(str(path)) is True
+    assert path.read_text() == profiler_default.report()
+    profiler_default.reset()
+    assert profiler_default.get_sections() == []
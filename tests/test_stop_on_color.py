@@ -0,0 +1,33 @@
+import pytest
+from commands.stop_on_color import StopOnColor
+from subsystems.control_panel import ControlPanel
+from util.color_lut import PanelColor
+from util.config import ControlPanelConfig, DeviceConfig
+
+
+@pytest.fixture(scope="function")
+def control_panel_default(robot, monkeypatch):
+    control_panel = ControlPanel(robot, None, ControlPanelConfig(0.8, 0.25, DeviceConfig(True, 6, False)))
+    monkeypatch.setattr(control_panel, "has_color_sensor", lambda: True)
+    robot.control_panel = control_panel
+    return control_panel
+
+
+def test_stop_on_color(robot, control_panel_default, monkeypatch, hal_data):
+    readings = iter([PanelColor.GREEN, PanelColor.BLUE, PanelColor.UNKNOWN, PanelColor.YELLOW, PanelColor.RED])
+    monkeypatch.setattr(control_panel_default, "read_color", lambda: next(readings))
+    # The robot sensor has to see RED for the field sensor to see BLUE
+    command = StopOnColor(robot, 1.0, PanelColor.BLUE)
+    command.initialize()
+    speeds = []
+    while not command.isFinished():
+        command.execute()
+        speeds.append(hal_data['pwm'][6]['value'])
+    # Full speed until the wedge before RED, slowly after, stopped on RED
+    assert speeds == [pytest.approx(0.8), pytest.approx(0.8), pytest.approx(0.8), pytest.approx(0.25), 0.0]
+
+
+def test_stop_on_color_no_target(robot, control_panel_default):
+    command = StopOnColor(robot, 1.0, PanelColor.UNKNOWN)
+    command.initialize()
+    assert command.isFinished() is True
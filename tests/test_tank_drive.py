@@ -2,6 +2,8 @@ import pytest
 import oi
 from commands.tank_drive import TankDrive
 from subsystems.drivetrain import Drivetrain
+from util.config import DrivetrainConfig, read_ini
+from util.response_curve import CurveSet
 
 """
 hal_data['pwm'] looks like this:
@@ -25,7 +27,8 @@ hal_data['pwm'] looks like this:
 
 @pytest.fixture(scope="function")
 def drivetrain_default(robot):
-    return Drivetrain(robot, None, '../tests/test_configs/drivetrain_default.ini')
+    config = DrivetrainConfig.from_parser(read_ini('../tests/test_configs/drivetrain_default.ini'))
+    return Drivetrain(robot, None, config)
 
 
 @pytest.fixture(scope="function")
@@ -56,7 +59,11 @@ def mock_oi(robot):
         def set_mock_axis_value(self, controller, axis, value):
             self.axis_values[controller][axis] = value
 
-        def get_axis(self, controller, axis):
+        stick_curve_set = None
+
+        def get_axis(self, controller, axis, curve_set=CurveSet.NORMAL):
+            if axis in (oi.JoystickAxis.LEFTY, oi.JoystickAxis.RIGHTY):
+                self.stick_curve_set = curve_set
             return self.axis_values[controller][axis]
 
         def set_mock_button_value(self, controller, button, value):
@@ -71,7 +78,7 @@ def mock_oi(robot):
 @pytest.fixture(scope="function")
 def command_default(robot, drivetrain_default):
     robot.drivetrain = drivetrain_default
-    return TankDrive(robot, None, 1.0, 1.0, None)
+    return TankDrive(robot, None, 1.0, None)
 
 
 def test_init_default(command_default):
@@ -81,17 +88,15 @@ def test_init_default(command_default):
     assert command_default.name == "TankDrive"
     assert command_default.timeout == -1
     assert command_default._dpad_scaling == 1.0
-    assert command_default._stick_scaling == 1.0
 
 
 def test_init_full(robot, drivetrain_default):
     robot.drivetrain = drivetrain_default
-    td = TankDrive(robot, "CustomTankDrive", 0.7, 0.3, 5)
+    td = TankDrive(robot, "CustomTankDrive", 0.3, 5)
     assert td is not None
     assert td.robot is not None
     assert td.robot.drivetrain is not None
     assert td.name == "CustomTankDrive"
-    assert td._stick_scaling == 0.7
     assert td._dpad_scaling == 0.3
     assert td.timeout == 5
 
@@ -101,33 +106,33 @@ def test_initialize(command_default):
 
 
 @pytest.mark.parametrize(
-    "stick_scale,dpad_scale,left_input,right_input,dpad_input,modifier_input,left_ex_speed,right_ex_speed", [
-        (1.0, 1.0, 0.0, 0.0, 0.0, False, 0.0, 0.0),
-        (1.0, 1.0, 0.5, 0.5, 0.0, False, 0.5306122448979592, -0.5306122448979592),
-        (1.0, 1.0, 1.0, 1.0, 0.0, False, 1.0, -1.0),
-        (1.0, 1.0, -0.5, -0.5, 0.0, False, -0.5306122448979592, 0.5306122448979592),
-        (1.0, 1.0, -1.0, -1.0, 0.0, False, -1.0, 1.0),
-        (0.5, 0.5, 0.0, 0.0, 0.0, True, 0.0, 0.0),
-        (0.5, 0.5, 0.5, 0.5, 0.0, False, 0.5306122448979592, -0.5306122448979592),
-        (0.5, 0.5, 1.0, 1.0, 0.0, True, 0.5306122448979592, -0.5306122448979592),
-        (0.5, 0.5, -0.5, -0.5, 0.0, False, -0.5306122448979592, 0.5306122448979592),
-        (0.5, 0.5, -1.0, -1.0, 0.0, True, -0.5306122448979592, 0.5306122448979592),
-        (1.0, 1.0, 0.0, 0.0, 0.0, False, 0.0, 0.0),
-        (1.0, 1.0, 0.5, 0.5, 1.0, False, 1.0, -1.0),
-        (1.0, 1.0, 1.0, 1.0, 1.0, False, 1.0, -1.0),
-        (1.0, 1.0, -0.5, -0.5, -1.0, False, -1.0, 1.0),
-        (1.0, 1.0, -1.0, -1.0, -1.0, False, -1.0, 1.0),
-        (0.5, 0.5, 0.0, 0.0, 0.0, True, 0.0, 0.0),
-        (0.5, 0.5, 0.5, 0.5, 1.0, False, 0.2815493544356518, -0.2815493544356518),
-        (0.5, 0.5, 1.0, 1.0, 1.0, True, 0.2815493544356518, -0.2815493544356518),
-        (0.5, 0.5, -0.5, -0.5, -1.0, False, -0.2815493544356518, 0.2815493544356518),
-        (0.5, 0.5, -1.0, -1.0, -1.0, True, -0.2815493544356518, 0.2815493544356518),
+    "dpad_scale,left_input,right_input,dpad_input,modifier_input,left_ex_speed,right_ex_speed", [
+        (1.0, 0.0, 0.0, 0.0, False, 0.0, 0.0),
+        (1.0, 0.5, 0.5, 0.0, False, 0.5306122448979592, -0.5306122448979592),
+        (1.0, 1.0, 1.0, 0.0, False, 1.0, -1.0),
+        (1.0, -0.5, -0.5, 0.0, False, -0.5306122448979592, 0.5306122448979592),
+        (1.0, -1.0, -1.0, 0.0, False, -1.0, 1.0),
+        (0.5, 0.0, 0.0, 0.0, True, 0.0, 0.0),
+        (0.5, 0.5, 0.5, 0.0, False, 0.5306122448979592, -0.5306122448979592),
+        (0.5, 1.0, 1.0, 0.0, True, 0.5306122448979592, -0.5306122448979592),
+        (0.5, -0.5, -0.5, 0.0, False, -0.5306122448979592, 0.5306122448979592),
+        (0.5, -1.0, -1.0, 0.0, True, -0.5306122448979592, 0.5306122448979592),
+        (1.0, 0.0, 0.0, 0.0, False, 0.0, 0.0),
+        (1.0, 0.5, 0.5, 1.0, False, 1.0, -1.0),
+        (1.0, 1.0, 1.0, 1.0, False, 1.0, -1.0),
+        (1.0, -0.5, -0.5, -1.0, False, -1.0, 1.0),
+        (1.0, -1.0, -1.0, -1.0, False, -1.0, 1.0),
+        (0.5, 0.0, 0.0, 0.0, True, 0.0, 0.0),
+        (0.5, 0.5, 0.5, 1.0, False, 0.2815493544356518, -0.2815493544356518),
+        (0.5, 1.0, 1.0, 1.0, True, 0.2815493544356518, -0.2815493544356518),
+        (0.5, -0.5, -0.5, -1.0, False, -0.2815493544356518, 0.2815493544356518),
+        (0.5, -1.0, -1.0, -1.0, True, -0.2815493544356518, 0.2815493544356518),
     ])
-def test_execute(mock_oi, drivetrain_default, robot, hal_data, stick_scale, dpad_scale, left_input, right_input,
+def test_execute(mock_oi, drivetrain_default, robot, hal_data, dpad_scale, left_input, right_input,
                  dpad_input, modifier_input, left_ex_speed, right_ex_speed):
     robot.drivetrain = drivetrain_default
     robot.oi = mock_oi
-    td = TankDrive(robot, None, stick_scale, dpad_scale, None)
+    td = TankDrive(robot, None, dpad_scale, None)
     assert td is not None
     td.initialize()
     mock_oi.set_mock_axis_value(oi.UserController.DRIVER, oi.JoystickAxis.LEFTY, left_input)
@@ -139,6 +144,21 @@ def test_execute(mock_oi, drivetrain_default, robot, hal_data, stick_scale, dpad
     assert hal_data['pwm'][2]['value'] == right_ex_speed
 
 
+@pytest.mark.parametrize("modifier_input,expected_curve_set", [
+    (False, CurveSet.NORMAL),
+    (True, CurveSet.MODIFIER),
+])
+def test_execute_modifier_curves(mock_oi, drivetrain_default, robot, hal_data, modifier_input, expected_curve_set):
+    robot.drivetrain = drivetrain_default
+    robot.oi = mock_oi
+    td = TankDrive(robot, None, 1.0, None)
+    td.initialize()
+    mock_oi.set_mock_axis_value(oi.UserController.DRIVER, oi.JoystickAxis.LEFTY, 0.5)
+    mock_oi.set_mock_button_value(oi.UserController.DRIVER, oi.JoystickButtons.LEFTBUMPER, modifier_input)
+    td.execute()
+    assert mock_oi.stick_curve_set == expected_curve_set
+
+
 def test_is_finished(command_default):
     assert command_default.isFinished() is False
 
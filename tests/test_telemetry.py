@@ -0,0 +1,118 @@
+import pytest
+from util.telemetry import Telemetry, TelemetryKind
+
+
+class MockPublisher(object):
+    def __init__(self):
+        self.puts = []
+        self.epsilons = {}
+
+    def set_epsilon(self, key, epsilon):
+        self.epsilons[key] = epsilon
+
+    def put_number(self, key, value):
+        self.puts.append((key, value))
+
+    def put_boolean(self, key, value):
+        self.puts.append((key, value))
+
+    def put_string(self, key, value):
+        self.puts.append((key, value))
+
+
+@pytest.fixture(scope="function")
+def mock_publisher():
+    return MockPublisher()
+
+
+@pytest.fixture(scope="function")
+def telemetry_default(mock_publisher):
+    return Telemetry(mock_publisher)
+
+
+@pytest.mark.parametrize("value,kind", [
+    (0.0, TelemetryKind.NUMBER),
+    (0, TelemetryKind.NUMBER),
+    (False, TelemetryKind.BOOLEAN),
+    ("", TelemetryKind.STRING),
+])
+def test_register_kind(telemetry_default, value, kind):
+    telemetry_default.register("Key", 10.0, value)
+    assert telemetry_default.is_registered("Key") is True
+    assert telemetry_default._kinds[0] == kind
+    assert telemetry_default.get("Key") == value
+
+
+def test_register_epsilon(telemetry_default, mock_publisher):
+    telemetry_default.register("Gyro Angle", 50.0, 0.0, 0.1)
+    assert mock_publisher.epsilons == {"Gyro Angle": 0.1}
+
+
+def test_register_twice(telemetry_default):
+    telemetry_default.register("Gyro Angle", 50.0, 0.0)
+    telemetry_default.register("Gyro Angle", 10.0, 1.0)
+    assert len(telemetry_default._keys) == 1
+    assert telemetry_default._periods[0] == pytest.approx(0.1)
+    assert telemetry_default.get("Gyro Angle") == 1.0
+
+
+def test_set_unregistered(telemetry_default):
+    with pytest.raises(KeyError):
+        telemetry_default.set("Missing", 1.0)
+
+
+def test_flush_initial_values(telemetry_default, mock_publisher):
+    telemetry_default.register("Winch Speed", 10.0, 0.0)
+    telemetry_default.register("Winch Retracted", 10.0, False)
+    telemetry_default.register("Color Target", 5.0, "")
+    assert telemetry_default.flush(0.0) == 3
+    assert mock_publisher.puts == [("Winch Speed", 0.0), ("Winch Retracted", False), ("Color Target", "")]
+    assert telemetry_default.flush(1.0) == 0
+
+
+def test_flush_rate(telemetry_default, mock_publisher):
+    telemetry_default.register("Gyro Angle", 32.0, 0.0)
+    telemetry_default.register("Vacuum Speed", 4.0, 0.0)
+    telemetry_default.flush(0.0)
+    mock_publisher.puts.clear()
+    # Twenty loops at 32 Hz, each setting a new value
+    for loop in range(1, 21):
+        telemetry_default.set("Gyro Angle", float(loop))
+        telemetry_default.set("Vacuum Speed", float(loop))
+        telemetry_default.flush(loop / 32.0)
+    gyro = [value for key, value in mock_publisher.puts if key == "Gyro Angle"]
+    vacuum = [value for key, value in mock_publisher.puts if key == "Vacuum Speed"]
+    assert gyro == [float(loop) for loop in range(1, 21)]
+    assert vacuum == [8.0, 16.0]
+
+
+def test_flush_rate_jitter(telemetry_default, mock_publisher):
+    telemetry_default.register("Gyro Angle", 50.0, 0.0)
+    telemetry_default.flush(0.0)
+    # A late loop followed by an early one still publishes both
+    telemetry_default.set("Gyro Angle", 1.0)
+    assert telemetry_default.flush(0.025) == 1
+    telemetry_default.set("Gyro Angle", 2.0)
+    assert telemetry_default.flush(0.039) == 0
+    assert telemetry_default.flush(0.041) == 1
+
+
+def test_flush_latest_value(telemetry_default, mock_publisher):
+    telemetry_default.register("Winch Speed", 1.0, 0.0)
+    telemetry_default.flush(0.0)
+    telemetry_default.set("Winch Speed", 0.5)
+    telemetry_default.set("Winch Speed", 0.75)
+    assert telemetry_default.flush(0.5) == 0
+    assert telemetry_default.flush(1.0) == 1
+    assert mock_publisher.puts[-1] == ("Winch Speed", 0.75)
+
+
+def test_flush_clock(mock_publisher):
+    now = [0.0]
+    telemetry = Telemetry(mock_publisher, lambda: now[0])
+    telemetry.register("Gyro Angle", 1.0, 0.0)
+    assert telemetry.flush() == 1
+    telemetry.set("Gyro Angle", 1.0)
+    assert telemetry.flush() == 0
+    now[0] = 1.0
+    assert telemetry.flush() == 1
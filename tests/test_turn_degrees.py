@@ -1,6 +1,7 @@
 import pytest
 from commands.turn_degrees import TurnDegrees
 from subsystems.drivetrain import Drivetrain
+from util.config import DrivetrainConfig, read_ini
 
 
 """
@@ -25,7 +26,8 @@ hal_data['pwm'] looks like this:
 
 @pytest.fixture(scope="function")
 def drivetrain_default(robot):
-    return Drivetrain(robot, None, '../tests/test_configs/drivetrain_default.ini')
+    config = DrivetrainConfig.from_parser(read_ini('../tests/test_configs/drivetrain_default.ini'))
+    return Drivetrain(robot, None, config)
 
 
 @pytest.fixture(scope="function")
@@ -77,7 +79,8 @@ def test_initialize(command_default):
 
 
 @pytest.mark.parametrize("initial_angle,target_angle,threshold,speed,left_ex_speed,right_ex_speed", [
-    (0.0, 0.0, 1.0, 1.0, -1.0, -1.0),
+    # On target the heading controller holds still, further away its output is clamped to the speed
+    (0.0, 0.0, 1.0, 1.0, 0.0, 0.0),
     (10.0, 30.0, 2.0, 1.0, -1.0, -1.0),
     (20.0, 60.0, 5.0, 0.5, -0.5306122448979592, -0.5306122448979592),
     (20.0, -60.0, 10.0, 1.0, 1.0, 1.0),
@@ -1,6 +1,7 @@
 import pytest
 from commands.turn_degrees_absolute import TurnDegreesAbsolute
 from subsystems.drivetrain import Drivetrain
+from util.config import DrivetrainConfig, read_ini
 
 """
 hal_data['pwm'] looks like this:
@@ -24,7 +25,8 @@ hal_data['pwm'] looks like this:
 
 @pytest.fixture(scope="function")
 def drivetrain_default(robot):
-    return Drivetrain(robot, None, '../tests/test_configs/drivetrain_default.ini')
+    config = DrivetrainConfig.from_parser(read_ini('../tests/test_configs/drivetrain_default.ini'))
+    return Drivetrain(robot, None, config)
 
 
 @pytest.fixture(scope="function")
@@ -75,7 +77,8 @@ def test_initialize(command_default):
 
 
 @pytest.mark.parametrize("initial_angle,target_angle,threshold,speed,left_ex_speed,right_ex_speed", [
-    (0.0, 0.0, 1.0, 1.0, -1.0, -1.0),
+    # On target the heading controller holds still, further away its output is clamped to the speed
+    (0.0, 0.0, 1.0, 1.0, 0.0, 0.0),
     (10.0, 30.0, 2.0, 1.0, -1.0, -1.0),
     (20.0, 60.0, 5.0, 0.5, -0.5306122448979592, -0.5306122448979592),
     (20.0, -60.0, 10.0, 1.0, 1.0, 1.0),
@@ -140,3 +143,15 @@ def test_end(command_default, hal_data):
 #         assert hal_data['pwm'][2]['value'] == right_ex_speed
 #     td.end()
 #     assert isclose(hal_data['analog_gyro'][1]['angle'], target_angle, threshold)
+
+
+def test_initialize_vision(robot, drivetrain_default, monkeypatch):
+    robot.drivetrain = drivetrain_default
+    command = TurnDegreesAbsolute(robot, 90.0, 1.0, 2.0, None, 15, use_vision=True)
+    monkeypatch.setattr(drivetrain_default, "get_target_heading", lambda: 12.0)
+    command.initialize()
+    assert command._target_degrees == 12.0
+    # Without a target in sight the fixed heading is used
+    monkeypatch.setattr(drivetrain_default, "get_target_heading", lambda: None)
+    command.initialize()
+    assert command._target_degrees == 90.0
@@ -0,0 +1,113 @@
+import math
+import uuid
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+from util.config import VisionConfig  # noqa: E402
+from util.frame_buffer import SharedFrameBuffer  # noqa: E402
+from util.vision_pipeline import RecordedFrameSource, TargetPipeline, VisionWorker  # noqa: E402
+from util.vision_results import SharedVisionResults  # noqa: E402
+
+WIDTH = 160
+HEIGHT = 120
+
+
+def make_frame(left=None, right=None, top=40, bottom=80):
+    frame = numpy.full((HEIGHT, WIDTH, 3), 30, numpy.uint8)
+    if left is not None:
+        frame[top:bottom, left:right] = (60, 240, 60)
+    return frame
+
+
+@pytest.fixture(scope="function")
+def config():
+    return VisionConfig(True, 60.0, 0.4, 40)
+
+
+@pytest.fixture(scope="function")
+def pipeline_default(config):
+    return TargetPipeline(WIDTH, HEIGHT, config)
+
+
+def test_pipeline_no_target(pipeline_default):
+    assert pipeline_default.process(make_frame()) is None
+    # Too small to be the target
+    assert pipeline_default.process(make_frame(10, 14, 10, 15)) is None
+
+
+def test_pipeline_centered(pipeline_default):
+    angle, distance = pipeline_default.process(make_frame(70, 90))
+    assert angle == pytest.approx(0.0)
+    focal_length = WIDTH / 2.0 / math.tan(math.radians(30.0))
+    assert distance == pytest.approx(0.4 * focal_length / 40)
+
+
+def test_pipeline_angle(pipeline_default):
+    assert pipeline_default.process(make_frame(150, 160))[0] == pytest.approx(
+        math.degrees(math.atan(75.0 / (WIDTH / 2.0 / math.tan(math.radians(30.0))))))
+    assert pipeline_default.process(make_frame(0, 10))[0] < -25.0
+
+
+def test_pipeline_largest_target(pipeline_default):
+    frame = make_frame(100, 140)
+    frame[50:60, 10:20] = (60, 240, 60)
+    angle, _ = pipeline_default.process(frame)
+    assert angle > 0.0
+
+
+@pytest.fixture(scope="function")
+def recorded(tmp_path):
+    paths = []
+    for index, left in enumerate([None, 70, 150]):
+        path = str(tmp_path / ("frame%02d.npy" % index))
+        numpy.save(path, make_frame(left, None if left is None else left + 10))
+        paths.append(path)
+    return paths
+
+
+def test_recorded_frames(recorded):
+    source = RecordedFrameSource(recorded)
+    assert len(source) == 3
+    assert source.get_size() == (WIDTH, HEIGHT)
+    first = source.next_frame()
+    source.next_frame()
+    source.next_frame()
+    assert source.next_frame() is first
+
+
+def test_recorded_frames_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        RecordedFrameSource([])
+    path = str(tmp_path / "gray.npy")
+    numpy.save(path, numpy.zeros((HEIGHT, WIDTH), numpy.uint8))
+    with pytest.raises(ValueError):
+        RecordedFrameSource([path])
+
+
+def test_worker_recorded(recorded, config):
+    name = uuid.uuid4().hex[:8]
+    frames = SharedFrameBuffer.create(WIDTH, HEIGHT, "test_frames_" + name)
+    results = SharedVisionResults()
+    results.create("test_vision_" + name)
+    reader = SharedVisionResults()
+    reader.attach("test_vision_" + name)
+    try:
+        worker = VisionWorker(frames, results, TargetPipeline(WIDTH, HEIGHT, config))
+        source = RecordedFrameSource(recorded)
+        assert worker.step() is False
+        found = []
+        for timestamp in range(1, 4):
+            frames.begin_write()[:] = source.next_frame()
+            frames.commit(float(timestamp))
+            assert worker.step() is True
+            result = reader.read()
+            assert (result.sequence, result.timestamp) == (timestamp, float(timestamp))
+            found.append(result.found)
+        assert found == [False, True, True]
+        assert reader.read().angle > 25.0
+        assert worker.get_dropped() == 0
+    finally:
+        reader.close()
+        results.close()
+        frames.close()
@@ -0,0 +1,55 @@
+import uuid
+
+import pytest
+from util.vision_results import SharedVisionResults, VisionResult
+
+
+@pytest.fixture(scope="function")
+def results():
+    results = SharedVisionResults()
+    results.create("test_vision_" + uuid.uuid4().hex[:8], max_age=0.5)
+    yield results
+    results.close()
+
+
+@pytest.fixture(scope="function")
+def reader(results):
+    reader = SharedVisionResults()
+    reader.attach(results._memory.name)
+    yield reader
+    reader.close()
+
+
+def test_results_default():
+    results = SharedVisionResults()
+    assert results.is_open() is False
+    assert results.read() == VisionResult()
+    assert results.get_target() is None
+
+
+def test_results_publish(results, reader):
+    assert reader.read() == VisionResult()
+    results.publish(VisionResult(3, 12.5, True, -4.0, 2.25))
+    assert reader.read() == VisionResult(3, 12.5, True, -4.0, 2.25)
+    results.publish(VisionResult(4, 12.6))
+    assert reader.read() == VisionResult(4, 12.6, False, 0.0, 0.0)
+
+
+def test_results_torn_read(results, reader):
+    results.publish(VisionResult(1, 1.0, True, 2.0, 3.0))
+    reader.read()
+    # A write in progress leaves the lock odd, the last complete result is returned
+    lock = int.from_bytes(bytes(results._memory.buf[:4]), "little")
+    results._memory.buf[:4] = (lock + 1).to_bytes(4, "little")
+    results._memory.buf[4:8] = (2).to_bytes(4, "little")
+    assert reader.read() == VisionResult(1, 1.0, True, 2.0, 3.0)
+
+
+def test_results_get_target(results, clock):
+    clock.now = 10.0
+    results.publish(VisionResult(1, 9.8, True, 5.0, 1.0))
+    assert results.get_target(clock).angle == 5.0
+    clock.now = 10.4
+    assert results.get_target(clock) is None
+    results.publish(VisionResult(2, 10.3))
+    assert results.get_target(clock) is None